@@ -0,0 +1,226 @@
+"""Baseline schema, as previously generated by the API on startup
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('full_name', sa.String(length=50), nullable=True),
+        sa.Column('email', sa.String(length=50), nullable=True),
+        sa.Column('password', sa.String(length=300), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'roles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_index('ix_roles_id', 'roles', ['id'])
+
+    op.create_table(
+        'ministries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('contact_info', sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_ministries_id', 'ministries', ['id'])
+
+    op.create_table(
+        'user_roles',
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('role_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['role_id'], ['roles.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+    )
+
+    op.create_table(
+        'certificates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(length=10), nullable=True),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('date_issued', sa.DateTime(), nullable=True),
+        sa.Column('issuer', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_certificates_id', 'certificates', ['id'])
+
+    op.create_table(
+        'education',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('degree', sa.String(length=50), nullable=True),
+        sa.Column('institution', sa.String(length=50), nullable=True),
+        sa.Column('completion_date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_education_id', 'education', ['id'])
+
+    op.create_table(
+        'experience',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(length=100), nullable=True),
+        sa.Column('organization', sa.String(length=100), nullable=True),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_experience_id', 'experience', ['id'])
+
+    op.create_table(
+        'projects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=True),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.Column('budget', sa.Float(), nullable=True),
+        sa.Column('status', sa.String(length=200), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('ministry_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['ministry_id'], ['ministries.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_projects_id', 'projects', ['id'])
+
+    op.create_table(
+        'comments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('text', sa.String(length=500), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_comments_id', 'comments', ['id'])
+
+    op.create_table(
+        'images',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('image_url', sa.String(length=50), nullable=True),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_images_id', 'images', ['id'])
+
+    op.create_table(
+        'comment_replies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('comment_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('text', sa.String(length=500), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['comment_id'], ['comments.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_comment_replies_id', 'comment_replies', ['id'])
+
+    op.create_table(
+        'project_agreements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_project_agreements_id', 'project_agreements', ['id'])
+
+    op.create_table(
+        'project_payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('payment_method', sa.String(length=50), nullable=True),
+        sa.Column('payment_date', sa.DateTime(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_project_payments_id', 'project_payments', ['id'])
+
+    op.create_table(
+        'project_payment_receipts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('payment_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.ForeignKeyConstraint(['payment_id'], ['project_payments.id']),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_project_payment_receipts_id', 'project_payment_receipts', ['id'])
+
+    op.create_table(
+        'contracts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('details', sa.String(length=500), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_contracts_id', 'contracts', ['id'])
+    op.create_index('ix_contracts_name', 'contracts', ['name'], unique=True)
+
+    op.create_table(
+        'project_contractors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('contractor_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['contractor_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_project_contractors_id', 'project_contractors', ['id'])
+
+    op.create_table(
+        'published',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_published_id', 'published', ['id'])
+
+
+def downgrade():
+    for table in ('published', 'project_contractors', 'contracts', 'project_payment_receipts', 'project_payments',
+                  'project_agreements', 'comment_replies', 'images', 'comments', 'projects', 'experience',
+                  'education', 'certificates', 'user_roles', 'ministries', 'roles', 'users'):
+        op.drop_table(table)
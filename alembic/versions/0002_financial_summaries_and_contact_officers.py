@@ -0,0 +1,79 @@
+"""Project financial summaries and ministry contact officers
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'project_financial_summaries',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('total_agreed', sa.Float(), nullable=False),
+        sa.Column('total_paid', sa.Float(), nullable=False),
+        sa.Column('agreement_count', sa.Integer(), nullable=False),
+        sa.Column('payment_count', sa.Integer(), nullable=False),
+        sa.Column('last_payment_date', sa.DateTime(), nullable=True),
+        sa.Column('payments_outside_agreements', sa.Integer(), nullable=False),
+        sa.Column('overspent', sa.Boolean(), nullable=False),
+        sa.Column('agreements_over_budget', sa.Boolean(), nullable=False),
+        sa.Column('flagged', sa.Boolean(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+    op.create_index('ix_project_financial_summaries_flagged', 'project_financial_summaries',
+                    ['flagged', 'project_id'])
+    # Backfill with the aggregation of rebuild_financial_summaries, so the first incremental write of a project
+    # with existing agreements or payments adds to its real totals. A payment counts once per project however
+    # many receipts link them, and it is outside the agreements when it is dated and no agreement window of
+    # the project (open ends included) contains its date.
+    op.execute(
+        "INSERT INTO project_financial_summaries "
+        "(project_id, total_agreed, total_paid, agreement_count, payment_count, last_payment_date, "
+        "payments_outside_agreements, overspent, agreements_over_budget, flagged, updated_at) "
+        "SELECT p.id, COALESCE(a.total_agreed, 0), COALESCE(pay.total_paid, 0), COALESCE(a.agreement_count, 0), "
+        "COALESCE(pay.payment_count, 0), pay.last_payment_date, COALESCE(pay.outside, 0), "
+        "CASE WHEN p.budget IS NOT NULL AND COALESCE(pay.total_paid, 0) > p.budget THEN TRUE ELSE FALSE END, "
+        "CASE WHEN p.budget IS NOT NULL AND COALESCE(a.total_agreed, 0) > p.budget THEN TRUE ELSE FALSE END, "
+        "CASE WHEN (p.budget IS NOT NULL AND (COALESCE(pay.total_paid, 0) > p.budget "
+        "OR COALESCE(a.total_agreed, 0) > p.budget)) OR COALESCE(pay.outside, 0) > 0 THEN TRUE ELSE FALSE END, "
+        "CURRENT_TIMESTAMP "
+        "FROM projects p "
+        "LEFT JOIN (SELECT project_id, SUM(amount) AS total_agreed, COUNT(*) AS agreement_count "
+        "FROM project_agreements GROUP BY project_id) a ON a.project_id = p.id "
+        "LEFT JOIN (SELECT r.project_id, SUM(pp.amount) AS total_paid, COUNT(*) AS payment_count, "
+        "MAX(pp.payment_date) AS last_payment_date, "
+        "SUM(CASE WHEN pp.payment_date IS NOT NULL AND NOT EXISTS ("
+        "SELECT 1 FROM project_agreements ag WHERE ag.project_id = r.project_id "
+        "AND (ag.start_date IS NULL OR ag.start_date <= pp.payment_date) "
+        "AND (ag.end_date IS NULL OR ag.end_date >= pp.payment_date)) THEN 1 ELSE 0 END) AS outside "
+        "FROM (SELECT DISTINCT project_id, payment_id FROM project_payment_receipts) r "
+        "JOIN project_payments pp ON pp.id = r.payment_id GROUP BY r.project_id) pay ON pay.project_id = p.id"
+    )
+
+    op.create_table(
+        'ministry_contact_officers',
+        sa.Column('ministry_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ministry_id'], ['ministries.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('ministry_id', 'user_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('ministry_contact_officers')
+    op.drop_index('ix_project_financial_summaries_flagged', table_name='project_financial_summaries')
+    op.drop_table('project_financial_summaries')
@@ -0,0 +1,55 @@
+"""Foreign-key and timeline indexes matching the API's access paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    # Per-project timelines, read newest first with keyset pagination on (timestamp, id)
+    ('ix_comments_project_id_timestamp_id', 'comments', ['project_id', 'timestamp', 'id']),
+    ('ix_images_project_id_timestamp_id', 'images', ['project_id', 'timestamp', 'id']),
+    ('ix_comment_replies_comment_id_timestamp_id', 'comment_replies', ['comment_id', 'timestamp', 'id']),
+    ('ix_published_project_id_timestamp', 'published', ['project_id', 'timestamp']),
+    # Financials: agreement window checks and receipt <-> payment lookups in both directions
+    ('ix_project_agreements_project_id_start_date_end_date', 'project_agreements',
+     ['project_id', 'start_date', 'end_date']),
+    ('ix_project_payment_receipts_project_id_payment_id', 'project_payment_receipts', ['project_id', 'payment_id']),
+    ('ix_project_payment_receipts_payment_id', 'project_payment_receipts', ['payment_id']),
+    ('ix_project_payments_payment_date', 'project_payments', ['payment_date']),
+    # Many-to-many links, one index per direction
+    ('ix_project_contractors_project_id_contractor_id', 'project_contractors', ['project_id', 'contractor_id']),
+    ('ix_project_contractors_contractor_id_project_id', 'project_contractors', ['contractor_id', 'project_id']),
+    ('ix_user_roles_user_id_role_id', 'user_roles', ['user_id', 'role_id']),
+    ('ix_user_roles_role_id', 'user_roles', ['role_id']),
+    # Remaining foreign keys
+    ('ix_projects_user_id', 'projects', ['user_id']),
+    ('ix_projects_ministry_id', 'projects', ['ministry_id']),
+    ('ix_comments_user_id', 'comments', ['user_id']),
+    ('ix_images_user_id', 'images', ['user_id']),
+    ('ix_comment_replies_user_id', 'comment_replies', ['user_id']),
+    ('ix_certificates_user_id', 'certificates', ['user_id']),
+    ('ix_contracts_project_id', 'contracts', ['project_id']),
+    ('ix_education_user_id', 'education', ['user_id']),
+    ('ix_experience_user_id', 'experience', ['user_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
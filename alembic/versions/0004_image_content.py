@@ -0,0 +1,35 @@
+"""Uploaded image content columns
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # batch mode rebuilds the table on SQLite, which cannot alter a column type in place
+    with op.batch_alter_table('images') as batch_op:
+        batch_op.alter_column('image_url', existing_type=sa.String(length=50), type_=sa.String(length=500))
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('content_type', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_images_content_hash', ['content_hash'])
+
+
+def downgrade():
+    with op.batch_alter_table('images') as batch_op:
+        batch_op.drop_index('ix_images_content_hash')
+        batch_op.drop_column('size')
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('content_hash')
+        batch_op.alter_column('image_url', existing_type=sa.String(length=500), type_=sa.String(length=50))
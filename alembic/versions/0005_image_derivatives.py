@@ -0,0 +1,42 @@
+"""Image dimensions and thumbnail / medium derivatives
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ('width', sa.Integer()),
+    ('height', sa.Integer()),
+    ('derivatives_status', sa.String(length=20)),
+    ('thumbnail_hash', sa.String(length=64)),
+    ('thumbnail_width', sa.Integer()),
+    ('thumbnail_height', sa.Integer()),
+    ('medium_hash', sa.String(length=64)),
+    ('medium_width', sa.Integer()),
+    ('medium_height', sa.Integer()),
+]
+
+
+def upgrade():
+    with op.batch_alter_table('images') as batch_op:
+        for name, type_ in COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, nullable=True))
+        batch_op.create_index('ix_images_derivatives_status', ['derivatives_status'])
+
+
+def downgrade():
+    with op.batch_alter_table('images') as batch_op:
+        batch_op.drop_index('ix_images_derivatives_status')
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
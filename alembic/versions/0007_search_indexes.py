@@ -0,0 +1,39 @@
+"""Full-text search indexes (PostgreSQL only)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Expression GIN indexes for SEARCH_BACKEND=database; the expressions must match
+# app/api/search_index/database.py exactly. MySQL gets FULLTEXT indexes from 0012.
+SEARCH_INDEXES = {
+    'ix_projects_search': ('projects', "coalesce(name, '') || ' ' || coalesce(status, '') || ' ' || "
+                                       "coalesce(description, '')"),
+    'ix_comments_search': ('comments', "coalesce(text, '')"),
+    'ix_comment_replies_search': ('comment_replies', "coalesce(text, '')"),
+    'ix_contracts_search': ('contracts', "coalesce(name, '') || ' ' || coalesce(details, '')"),
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, (table, document) in SEARCH_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON {table} USING gin (to_tsvector('english'::regconfig, {document}))")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name in SEARCH_INDEXES:
+        op.execute(f"DROP INDEX {name}")
@@ -0,0 +1,44 @@
+"""Composite indexes for the filtered and sorted project listing
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+FILTERS = ['user_id', 'ministry_id', 'status']
+SORTS = ['start_date', 'end_date', 'budget']
+
+# (index name, columns): every equality filter and sort column, alone or combined, followed by id
+INDEXES = [(f'ix_projects_{column}_id', [column, 'id']) for column in FILTERS + SORTS] + [
+    (f'ix_projects_{column}_{sort}_id', [column, sort, 'id']) for column in FILTERS for sort in SORTS
+]
+
+# Single-column foreign key indexes made redundant by the (user_id, id) and (ministry_id, id) indexes
+REPLACED = [
+    ('ix_projects_user_id', ['user_id']),
+    ('ix_projects_ministry_id', ['ministry_id']),
+]
+
+
+def upgrade():
+    # Create before dropping so the foreign keys always have an index (MySQL requires one)
+    for name, columns in INDEXES:
+        op.create_index(name, 'projects', columns)
+    for name, _ in REPLACED:
+        op.drop_index(name, table_name='projects')
+
+
+def downgrade():
+    for name, columns in REPLACED:
+        op.create_index(name, 'projects', columns)
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='projects')
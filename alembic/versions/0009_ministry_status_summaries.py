@@ -0,0 +1,45 @@
+"""Ministry dashboard summaries per project status
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ministry_status_summaries',
+        sa.Column('ministry_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=200), nullable=False),
+        sa.Column('project_count', sa.Integer(), nullable=False),
+        sa.Column('total_budget', sa.Float(), nullable=False),
+        sa.Column('total_agreed', sa.Float(), nullable=False),
+        sa.Column('total_paid', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['ministry_id'], ['ministries.id']),
+        sa.PrimaryKeyConstraint('ministry_id', 'status'),
+    )
+    # Backfill from the projects and their financial summaries
+    op.execute(
+        "INSERT INTO ministry_status_summaries "
+        "(ministry_id, status, project_count, total_budget, total_agreed, total_paid, updated_at) "
+        "SELECT p.ministry_id, COALESCE(p.status, ''), COUNT(*), COALESCE(SUM(p.budget), 0), "
+        "COALESCE(SUM(s.total_agreed), 0), COALESCE(SUM(s.total_paid), 0), CURRENT_TIMESTAMP "
+        "FROM projects p LEFT JOIN project_financial_summaries s ON s.project_id = p.id "
+        "WHERE p.ministry_id IS NOT NULL "
+        "GROUP BY p.ministry_id, COALESCE(p.status, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('ministry_status_summaries')
@@ -0,0 +1,40 @@
+"""Required timestamps on comments, replies and images
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 22:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# The listings page on (timestamp, id), which a NULL timestamp would break
+TABLES = ['comments', 'comment_replies', 'images']
+
+
+def upgrade():
+    bind = op.get_bind()
+    for name in TABLES:
+        table = sa.table(name, sa.column('timestamp', sa.DateTime()))
+        # Rows without a timestamp predate every dated row, so they take the table's earliest timestamp
+        earliest = bind.execute(sa.select(sa.func.min(table.c.timestamp))).scalar()
+        op.execute(
+            table.update().
+            where(table.c.timestamp.is_(None)).
+            values(timestamp=earliest if earliest is not None else sa.func.current_timestamp())
+        )
+        with op.batch_alter_table(name) as batch_op:
+            batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for name in reversed(TABLES):
+        with op.batch_alter_table(name) as batch_op:
+            batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=True)
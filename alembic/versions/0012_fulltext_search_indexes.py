@@ -0,0 +1,38 @@
+"""Full-text search indexes (MySQL only)
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 23:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# FULLTEXT indexes for SEARCH_BACKEND=database; MATCH() in app/api/search_index/database.py must list exactly
+# these columns in this order. PostgreSQL gets its indexes from 0007.
+FULLTEXT_INDEXES = {
+    'ix_projects_fulltext': ('projects', ['name', 'status', 'description']),
+    'ix_comments_fulltext': ('comments', ['text']),
+    'ix_comment_replies_fulltext': ('comment_replies', ['text']),
+    'ix_contracts_fulltext': ('contracts', ['name', 'details']),
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, (table, columns) in FULLTEXT_INDEXES.items():
+        op.create_index(name, table, columns, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, (table, _) in FULLTEXT_INDEXES.items():
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""Activate existing users
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Registration stored every account as inactive and nothing read the flag; inactive users are now rejected,
+    # so the accounts that exist are the active ones
+    users = sa.table('users', sa.column('active', sa.Boolean()))
+    op.execute(users.update().where(sa.or_(users.c.active.is_(None), users.c.active == sa.false())).
+               values(active=True))
+
+
+def downgrade():
+    pass
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from app.api.endpoints import user, certificate, project, community, discrepancy, contact, index, images
+from app.api.endpoints import user, certificate, project, community, discrepancy, contact, index, images, internal, finance, \
+    contract, uploads, search, ministry
 
 router = APIRouter()
 router.include_router(index.router)
@@ -7,8 +8,14 @@ router.include_router(user.router, prefix="/users", tags=["User Management"])
 router.include_router(certificate.router, prefix="/certificates", tags=["Certificate Management"])
 router.include_router(project.router, prefix="/projects", tags=["Project Management"])
 router.include_router(community.router, prefix="/community", tags=["Community Engagement"])
-# router.include_router(discrepancy.router, prefix="/discrepancy", tags=["Discrepancy Detection"])
+router.include_router(discrepancy.router, prefix="/discrepancy", tags=["Discrepancy Detection"])
+router.include_router(ministry.router, prefix="/ministries", tags=["Ministry Dashboards"])
 router.include_router(contact.router, prefix="/contact", tags=["Contact Information"])
 router.include_router(images.router, prefix="/images", tags=["Manage mages"])
+router.include_router(uploads.router, prefix="/uploads", tags=["Resumable Uploads"])
+router.include_router(contract.router, prefix="/contracts", tags=["Contract Management"])
+router.include_router(finance.router, prefix="/finance", tags=["Project Finances"])
+router.include_router(search.router, prefix="/search", tags=["Search"])
+router.include_router(internal.router, prefix="/internal", include_in_schema=False)
 
 # Include other routers here for other entities
\ No newline at end of file
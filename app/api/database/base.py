@@ -1,15 +1,84 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 import dotenv
 
+from app.api.database.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+
 # load the .env file
 dotenv.load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str):
+    """
+    Derive the async driver URL from the synchronous DATABASE_URL.
+
+    Args:
+        - database_url (str): Synchronous database URL, e.g. mysql+pymysql://...
+
+    Returns:
+        - str: The same URL with its driver swapped for an asyncio driver.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(DATABASE_URL)
+
+# Connection pool settings, sized per worker process. Every Procfile worker opens up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine, which has to stay below MySQL's max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections are recycled before MySQL's wait_timeout closes them on the server side, which keeps
+# stale connections out of the pool without paying a ping round-trip on every checkout.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# Synchronous engine, kept for schema management and tooling
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Async engine used by the request handlers
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS)
+
+# expire_on_commit is disabled so committed objects can still be serialized
+# without triggering a lazy load outside of the event loop
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False,
+                                       expire_on_commit=False)
+
+Base = declarative_base()
+
+
+async def create_schema():
+    """
+    Create any missing tables in a single pass over the async engine.
+
+    The schema is normally managed by the Alembic migrations in alembic/; this is the DB_CREATE_SCHEMA
+    shortcut for development databases. The models must have been imported beforehand.
+    """
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
@@ -1,9 +1,15 @@
 # Database Instance Creation Dependency
-from app.api.database.base import SessionLocal
+from app.api.database.base import SessionLocal, AsyncSessionLocal
 
-def get_db():
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
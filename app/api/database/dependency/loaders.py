@@ -0,0 +1,12 @@
+# Request-scoped loader dependency
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.loaders import Loaders
+
+
+def get_loaders(db: AsyncSession = Depends(get_db)):
+    # FastAPI resolves a dependency once per request, so every handler and sub-dependency that asks for the
+    # loaders shares the same instance and the same session
+    return Loaders(db)
@@ -0,0 +1,102 @@
+# app/database/loaders.py
+# Request-scoped batching and memoizing loaders: every lookup of the same entity type made while a request is
+# being handled is coalesced into one IN query, and each id is fetched at most once per request
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.queries import contact, project, user
+
+
+class DataLoader:
+    """
+    Batches `load(key)` calls issued in the same event loop iteration into one call of `batch_load` and
+    memoizes the result per key.
+
+    Args:
+        - batch_load (Callable): Coroutine function taking a list of unique keys and returning a dict of
+          key to value; keys missing from the dict resolve to None.
+        - lock (asyncio.Lock): Serializes batches that share one database session.
+    """
+
+    def __init__(self, batch_load, lock: asyncio.Lock):
+        self._batch_load = batch_load
+        self._lock = lock
+        self._futures = {}
+        self._queue = []
+        self._dispatches = set()
+
+    def load(self, key):
+        """
+        Schedule a key for the next batch, or reuse the earlier lookup of the same key.
+
+        Returns:
+            - Future: Resolves to the value for `key`, or None if it does not exist.
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._schedule_dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys):
+        """
+        Load several keys with a single batch.
+
+        Returns:
+            - list: Values in the order of `keys`, None for keys that do not exist.
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key, value):
+        """
+        Seed the memo with a value obtained elsewhere in the request.
+        """
+        if key not in self._futures:
+            future = self._futures[key] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+
+    def _schedule_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        try:
+            async with self._lock:
+                values = await self._batch_load(keys)
+        except Exception as e:
+            for key in keys:
+                # Failed lookups are not memoized, a later load retries them
+                self._futures.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._futures[key].set_result(values.get(key))
+
+
+class Loaders:
+    """
+    The loaders available to one request, all sharing the request's database session.
+
+    Await a load before using the session directly: the session runs one statement at a time and only the
+    loaders take turns through the shared lock.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        lock = asyncio.Lock()
+        self.users = DataLoader(lambda ids: self._by_id(user.get_users_by_ids, ids), lock)
+        self.projects = DataLoader(lambda ids: self._by_id(project.get_projects_by_ids, ids), lock)
+        self.contractors_by_project = DataLoader(
+            lambda ids: contact.get_contractors_for_projects(db, ids), lock
+        )
+        self.contact_officers_by_ministry = DataLoader(
+            lambda ids: contact.get_contact_officers_for_ministries(db, ids), lock
+        )
+
+    async def _by_id(self, get_by_ids, ids):
+        return {row.id: row for row in await get_by_ids(self.db, ids)}
@@ -1,13 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Table, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, ForeignKey, Table, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.api.database.base import Base
+from app.api.util.datetime import get_current_datetime
 
 # Define a UserRoles association table to manage many-to-many relationship between users and roles
 user_roles = Table(
     'user_roles',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id')),
-    Column('role_id', Integer, ForeignKey('roles.id'))
+    Column('role_id', Integer, ForeignKey('roles.id')),
+    Index('ix_user_roles_user_id_role_id', 'user_id', 'role_id'),
+    Index('ix_user_roles_role_id', 'role_id')
+)
+
+# Define a MinistryContactOfficers association table linking ministries to the users who act as their contacts
+ministry_contact_officers = Table(
+    'ministry_contact_officers',
+    Base.metadata,
+    Column('ministry_id', Integer, ForeignKey('ministries.id'), primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True)
 )
 
 
@@ -27,7 +38,7 @@ class User(Base):
     replies = relationship("CommentReply", back_populates="user")
     education = relationship("Education", back_populates="user")
     experience = relationship("Experience", back_populates="user")
-    project = relationship("Project", back_populates="user")
+    contracted_projects = relationship("Project", secondary="project_contractors", back_populates="contractors")
     # Add other user-related fields as needed
 
 
@@ -52,6 +63,10 @@ class Certificate(Base):
     issuer = Column(String(50))
     user = relationship("User", back_populates="certificates")
 
+    __table_args__ = (
+        Index("ix_certificates_user_id", "user_id"),
+    )
+
 
 # Comment
 class Comment(Base):
@@ -61,11 +76,17 @@ class Comment(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     project_id = Column(Integer, ForeignKey("projects.id"))
     text = Column(String(500))
-    timestamp = Column(DateTime)
+    timestamp = Column(DateTime, nullable=False, default=get_current_datetime)
     user = relationship("User", back_populates="comments")
     replies = relationship("CommentReply", back_populates="comment")
     project = relationship("Project", back_populates="comments")
 
+    # Matches the per-project timeline listing: WHERE project_id = ? ORDER BY timestamp DESC, id DESC
+    __table_args__ = (
+        Index("ix_comments_project_id_timestamp_id", "project_id", "timestamp", "id"),
+        Index("ix_comments_user_id", "user_id"),
+    )
+
 
 # Images
 class Images(Base):
@@ -74,13 +95,48 @@ class Images(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     project_id = Column(Integer, ForeignKey("projects.id"))
-    image_url = Column(String(50))
+    image_url = Column(String(500))
     description = Column(String(200))
-    timestamp = Column(DateTime)
+    timestamp = Column(DateTime, nullable=False, default=get_current_datetime)
+    # Uploaded content, stored once per SHA-256 digest; NULL for images that only reference an external URL
+    content_hash = Column(String(64), index=True)
+    content_type = Column(String(100))
+    size = Column(BigInteger)
+    width = Column(Integer)
+    height = Column(Integer)
+    # Thumbnail and medium renditions made in the background after an upload: pending, ready or failed
+    derivatives_status = Column(String(20), index=True)
+    thumbnail_hash = Column(String(64))
+    thumbnail_width = Column(Integer)
+    thumbnail_height = Column(Integer)
+    medium_hash = Column(String(64))
+    medium_width = Column(Integer)
+    medium_height = Column(Integer)
     user = relationship("User", back_populates="images")
     project = relationship("Project", back_populates="images")
     # details = relationship("Images", back_populates="image")
 
+    __table_args__ = (
+        Index("ix_images_project_id_timestamp_id", "project_id", "timestamp", "id"),
+        Index("ix_images_user_id", "user_id"),
+    )
+
+
+# UploadSession: a resumable upload in progress; the bytes received so far are kept by the storage backend
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    description = Column(String(200))
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=get_current_datetime)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # Set once the upload is complete, so retrying the completion returns the same image
+    image_id = Column(Integer, ForeignKey("images.id"))
+
 
 # CommentReply
 class CommentReply(Base):
@@ -90,10 +146,15 @@ class CommentReply(Base):
     comment_id = Column(Integer, ForeignKey("comments.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     text = Column(String(500))
-    timestamp = Column(DateTime)
+    timestamp = Column(DateTime, nullable=False, default=get_current_datetime)
     comment = relationship("Comment", back_populates="replies")
     user = relationship("User", back_populates="replies")
 
+    __table_args__ = (
+        Index("ix_comment_replies_comment_id_timestamp_id", "comment_id", "timestamp", "id"),
+        Index("ix_comment_replies_user_id", "user_id"),
+    )
+
 
 # Education
 class Education(Base):
@@ -106,6 +167,10 @@ class Education(Base):
     completion_date = Column(DateTime)
     user = relationship("User", back_populates="education")
 
+    __table_args__ = (
+        Index("ix_education_user_id", "user_id"),
+    )
+
 
 # Experience
 class Experience(Base):
@@ -119,6 +184,10 @@ class Experience(Base):
     end_date = Column(DateTime)
     user = relationship("User", back_populates="experience")
 
+    __table_args__ = (
+        Index("ix_experience_user_id", "user_id"),
+    )
+
 
 # ImageDetails
 # class ImageDetails(Base):
@@ -137,6 +206,8 @@ class Ministry(Base):
     name = Column(String(100))
     description = Column(String(200))
     contact_info = Column(String(100))
+    projects = relationship("Project", back_populates="ministry")
+    contact_officers = relationship("User", secondary=ministry_contact_officers)
 
 
 # ProjectAgreement
@@ -150,6 +221,11 @@ class ProjectAgreement(Base):
     amount = Column(Float)
     project = relationship("Project", back_populates="agreements")
 
+    # Covers the agreement window checks: WHERE project_id = ? AND start_date <= ? AND end_date >= ?
+    __table_args__ = (
+        Index("ix_project_agreements_project_id_start_date_end_date", "project_id", "start_date", "end_date"),
+    )
+
 
 # ProjectPaymentReceipts
 class ProjectPaymentReceipts(Base):
@@ -162,6 +238,11 @@ class ProjectPaymentReceipts(Base):
     project = relationship("Project", back_populates="receipts")
     payments = relationship("ProjectPayments", back_populates="receipt")
 
+    __table_args__ = (
+        Index("ix_project_payment_receipts_project_id_payment_id", "project_id", "payment_id"),
+        Index("ix_project_payment_receipts_payment_id", "payment_id"),
+    )
+
 
 # ProjectPayments
 class ProjectPayments(Base):
@@ -173,6 +254,10 @@ class ProjectPayments(Base):
     amount = Column(Float)
     receipt = relationship("ProjectPaymentReceipts", back_populates="payments")
 
+    __table_args__ = (
+        Index("ix_project_payments_payment_date", "payment_date"),
+    )
+
 
 # Projects
 class Project(Base):
@@ -189,7 +274,16 @@ class Project(Base):
     ministry_id = Column(Integer, ForeignKey("ministries.id"))
 
     # Define relationships with various user roles for the project
-    user = relationship("User", secondary="project_contractors", back_populates="project")
+    owner = relationship("User", foreign_keys=[user_id])
+    ministry = relationship("Ministry", back_populates="projects")
+    contractors = relationship("User", secondary="project_contractors", back_populates="contracted_projects")
+    ministry_contact_officers = relationship(
+        "User",
+        secondary=ministry_contact_officers,
+        primaryjoin="Project.ministry_id == ministry_contact_officers.c.ministry_id",
+        secondaryjoin="User.id == ministry_contact_officers.c.user_id",
+        viewonly=True,
+    )
 
     # Other relationships with certificates, comments, images, agreements, receipts, and published
 
@@ -200,6 +294,26 @@ class Project(Base):
     published = relationship("Published", back_populates="project")
     contracts = relationship("Contract", back_populates='project')
 
+    # One index per shape of the project listing (see PROJECT_LIST_SORTS in queries/project.py): an optional
+    # equality filter, then the sort column, then id to make the keyset unique
+    __table_args__ = (
+        Index("ix_projects_user_id_id", "user_id", "id"),
+        Index("ix_projects_ministry_id_id", "ministry_id", "id"),
+        Index("ix_projects_status_id", "status", "id"),
+        Index("ix_projects_start_date_id", "start_date", "id"),
+        Index("ix_projects_end_date_id", "end_date", "id"),
+        Index("ix_projects_budget_id", "budget", "id"),
+        Index("ix_projects_user_id_start_date_id", "user_id", "start_date", "id"),
+        Index("ix_projects_user_id_end_date_id", "user_id", "end_date", "id"),
+        Index("ix_projects_user_id_budget_id", "user_id", "budget", "id"),
+        Index("ix_projects_ministry_id_start_date_id", "ministry_id", "start_date", "id"),
+        Index("ix_projects_ministry_id_end_date_id", "ministry_id", "end_date", "id"),
+        Index("ix_projects_ministry_id_budget_id", "ministry_id", "budget", "id"),
+        Index("ix_projects_status_start_date_id", "status", "start_date", "id"),
+        Index("ix_projects_status_end_date_id", "status", "end_date", "id"),
+        Index("ix_projects_status_budget_id", "status", "budget", "id"),
+    )
+
 
 class Contract(Base):
     __tablename__ = "contracts"
@@ -213,6 +327,10 @@ class Contract(Base):
     project_id = Column(Integer, ForeignKey("projects.id"))
     project = relationship("Project", back_populates="contracts")
 
+    __table_args__ = (
+        Index("ix_contracts_project_id", "project_id"),
+    )
+
 
 class ProjectContractors(Base):
     __tablename__ = "project_contractors"
@@ -221,6 +339,11 @@ class ProjectContractors(Base):
     project_id = Column(Integer, ForeignKey("projects.id"))
     contractor_id = Column(Integer, ForeignKey("users.id"))
 
+    __table_args__ = (
+        Index("ix_project_contractors_project_id_contractor_id", "project_id", "contractor_id"),
+        Index("ix_project_contractors_contractor_id_project_id", "contractor_id", "project_id"),
+    )
+
 
 # Published
 class Published(Base):
@@ -230,3 +353,55 @@ class Published(Base):
     project_id = Column(Integer, ForeignKey("projects.id"))
     timestamp = Column(DateTime)
     project = relationship("Project", back_populates="published")
+
+    __table_args__ = (
+        Index("ix_published_project_id_timestamp", "project_id", "timestamp"),
+    )
+
+
+# ProjectFinancialSummary: running financial aggregates and discrepancy flags per project,
+# maintained by the write functions in app/api/database/queries/finance.py
+class ProjectFinancialSummary(Base):
+    __tablename__ = "project_financial_summaries"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    total_agreed = Column(Float, nullable=False, default=0.0)
+    total_paid = Column(Float, nullable=False, default=0.0)
+    agreement_count = Column(Integer, nullable=False, default=0)
+    payment_count = Column(Integer, nullable=False, default=0)
+    last_payment_date = Column(DateTime)
+    payments_outside_agreements = Column(Integer, nullable=False, default=0)
+    overspent = Column(Boolean, nullable=False, default=False)
+    agreements_over_budget = Column(Boolean, nullable=False, default=False)
+    flagged = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=get_current_datetime, onupdate=get_current_datetime)
+
+    __table_args__ = (
+        Index("ix_project_financial_summaries_flagged", "flagged", "project_id"),
+    )
+
+
+# MinistryStatusSummary: per ministry and project status, running totals for the ministry dashboards,
+# maintained by app/api/database/queries/ministry.py
+class MinistryStatusSummary(Base):
+    __tablename__ = "ministry_status_summaries"
+
+    ministry_id = Column(Integer, ForeignKey("ministries.id"), primary_key=True)
+    # Projects without a status are counted under ""
+    status = Column(String(200), primary_key=True)
+    project_count = Column(Integer, nullable=False, default=0)
+    total_budget = Column(Float, nullable=False, default=0.0)
+    total_agreed = Column(Float, nullable=False, default=0.0)
+    total_paid = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=get_current_datetime, onupdate=get_current_datetime)
+
+
+# TaskLease: when a periodic maintenance job is next due, claimed by one worker of the deployment per run,
+# see app/api/util/periodic.py
+class TaskLease(Base):
+    __tablename__ = "task_leases"
+
+    name = Column(String(100), primary_key=True)
+    next_run_at = Column(DateTime, nullable=False, default=get_current_datetime)
+    # Hostname and pid of the worker that claimed the last run
+    claimed_by = Column(String(100))
@@ -0,0 +1,116 @@
+# app/api/database/pool.py
+# Connection pool classes that record checkout statistics for the internal metrics endpoint
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds (in milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for connection checkouts on a single pool.
+    """
+
+    def __init__(self, buckets=WAIT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.waiters = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def begin_wait(self):
+        with self._lock:
+            self.waiters += 1
+        return time.perf_counter()
+
+    def end_wait(self, started: float, timed_out: bool = False):
+        waited_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.waiters -= 1
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_ms += waited_ms
+            self.max_wait_ms = max(self.max_wait_ms, waited_ms)
+            for index, bound in enumerate(self.buckets):
+                if waited_ms <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+            else:
+                self.bucket_counts[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in self.buckets] + [f"gt_{self.buckets[-1]}ms"]
+            return {
+                "waiters": self.waiters,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+                "wait_histogram": dict(zip(labels, self.bucket_counts)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout from the underlying queue, including the time spent
+    blocked on a full pool and the time spent opening an overflow connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = self.metrics.begin_wait()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.end_wait(started, timed_out=timed_out)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_status(pool):
+    """
+    Collect the live state of a connection pool.
+
+    Args:
+        - pool (Pool): The engine's connection pool.
+
+    Returns:
+        - dict: Pool sizing, current usage and checkout statistics.
+    """
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
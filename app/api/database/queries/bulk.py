@@ -0,0 +1,64 @@
+# app/database/queries/bulk.py
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def bulk_insert(db: AsyncSession, model, rows: list):
+    """
+    Insert many rows of one model in as few statements as the database allows. The caller commits.
+
+    Dialects that can return generated keys in parameter order from a batched INSERT ... RETURNING get one
+    (PostgreSQL, MariaDB; SQLite accepts the statement but runs it row by row). Elsewhere, i.e. MySQL, the rows
+    are flushed together by the unit of work, one INSERT each but without the per-row commit and refresh.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - model: Mapped class to insert.
+        - rows (List[dict]): Column values, one dict per row.
+
+    Returns:
+        - list: Inserted objects with their primary keys, in the order of `rows`.
+    """
+    if not rows:
+        return []
+    if db.bind.dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = await db.scalars(insert(model).returning(model, sort_by_parameter_order=True), rows)
+        return result.all()
+    objects = [model(**row) for row in rows]
+    db.add_all(objects)
+    await db.flush()
+    return objects
+
+
+async def insert_missing(db: AsyncSession, model, row: dict):
+    """
+    Insert a row unless one with the same primary key exists, also when a concurrent transaction inserts it
+    first. The caller commits.
+
+    Uses INSERT ... ON DUPLICATE KEY UPDATE on MySQL and INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and
+    SQLite, which wait for a concurrent insert of the key instead of failing; other databases insert in a
+    savepoint and ignore the duplicate key error.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - model: Mapped class to insert.
+        - row (dict): Column values, including the primary key.
+    """
+    dialect = db.bind.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        key = model.__table__.primary_key.columns.values()[0].name
+        stmt = mysql.insert(model).values(**row)
+        await db.execute(stmt.on_duplicate_key_update({key: stmt.inserted[key]}))
+    elif dialect in ON_CONFLICT_INSERTS:
+        await db.execute(ON_CONFLICT_INSERTS[dialect](model).values(**row).on_conflict_do_nothing())
+    else:
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(model).values(**row))
+        except IntegrityError:
+            pass
@@ -1,38 +1,49 @@
 # app/queries/certificates.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.database.models import Certificate
 from app.api.schemas.certificate import CertificateCreate
+from app.api.util.multiget import in_request_order
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.api.util.response_cache import response_cache
 
 
-async def get_certificate_by_id(db: Session, certificate_id: int):
-    return db.query(Certificate).filter(Certificate.id == certificate_id).first()
+async def get_certificate_by_id(db: AsyncSession, certificate_id: int):
+    result = await db.execute(select(Certificate).filter(Certificate.id == certificate_id))
+    return result.scalars().first()
 
 
-async def get_certificates(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(Certificate).offset(skip).limit(limit).all()
+async def get_certificates_by_ids(db: AsyncSession, certificate_ids: list):
+    result = await db.execute(select(Certificate).filter(Certificate.id.in_(certificate_ids)))
+    return in_request_order(result.scalars().all(), certificate_ids)
 
 
-async def create_certificate(db: Session, certificate: CertificateCreate):
-    db_certificate = Certificate(**certificate.model_dump())
+async def get_certificates(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate(db, select(Certificate), [Certificate.id], cursor, limit, descending=False)
+
+
+async def create_certificate(db: AsyncSession, certificate: CertificateCreate, user_id: int):
+    db_certificate = Certificate(**certificate.model_dump(), user_id=user_id)
     db.add(db_certificate)
-    db.commit()
-    db.refresh(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
     return db_certificate
 
 
-# async def update_certificate(db: Session, certificate_id: int, certificate: CertificateUpdate):
-#     db_certificate = get_certificate_by_id(db, certificate_id)
+# async def update_certificate(db: AsyncSession, certificate_id: int, certificate: CertificateUpdate):
+#     db_certificate = await get_certificate_by_id(db, certificate_id)
 #     if db_certificate:
 #         for key, value in certificate.dict().items():
 #             setattr(db_certificate, key, value)
-#         db.commit()
-#         db.refresh(db_certificate)
+#         await db.commit()
+#         await db.refresh(db_certificate)
 #     return db_certificate
 
 
-async def delete_certificate(db: Session, certificate_id: int):
-    db_certificate = get_certificate_by_id(db, certificate_id)
+async def delete_certificate(db: AsyncSession, certificate_id: int):
+    db_certificate = await get_certificate_by_id(db, certificate_id)
     if db_certificate:
-        db.delete(db_certificate)
-        db.commit()
+        await db.delete(db_certificate)
+        await db.commit()
+        await response_cache.invalidate("certificate", certificate_id)
     return db_certificate
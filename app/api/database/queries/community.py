@@ -1,28 +1,43 @@
 # app/queries/community.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.database.models import Comment, Images
-from app.api.database.models import User
+from app.api.search_index import index_comment
+from app.api.util.events import publish_comment, publish_image
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.api.util.response_cache import response_cache
 
 
-def get_comments_by_project_id(db: Session, project_id: int):
-    return db.query(Comment).filter(Comment.project_id == project_id).all()
+async def get_comments_by_project_id(db: AsyncSession, project_id: int, cursor: str = None,
+                                     limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate(db, select(Comment).filter(Comment.project_id == project_id),
+                          [Comment.timestamp, Comment.id], cursor, limit)
 
 
-def create_comment(db: Session, comment_text: str, project_id: int, user_id: int):
+async def create_comment(db: AsyncSession, comment_text: str, project_id: int, user_id: int):
     db_comment = Comment(text=comment_text, project_id=project_id, user_id=user_id)
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    await response_cache.invalidate("project_comments", project_id)
+    await response_cache.invalidate("project", project_id)
+    await db.refresh(db_comment)
+    index_comment(db_comment)
+    await publish_comment(db_comment)
     return db_comment
 
 
-def get_images_by_project_id(db: Session, project_id: int):
-    return db.query(Images).filter(Images.project_id == project_id).all()
+async def get_images_by_project_id(db: AsyncSession, project_id: int, cursor: str = None,
+                                   limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate(db, select(Images).filter(Images.project_id == project_id),
+                          [Images.timestamp, Images.id], cursor, limit)
 
 
-def create_image(db: Session, image_url: str, description: str, project_id: int, user_id: int):
+async def create_image(db: AsyncSession, image_url: str, description: str, project_id: int, user_id: int):
     db_image = Images(image_url=image_url, description=description, project_id=project_id, user_id=user_id)
     db.add(db_image)
-    db.commit()
-    db.refresh(db_image)
+    await db.commit()
+    await response_cache.invalidate("project_images", project_id)
+    await response_cache.invalidate("project", project_id)
+    await db.refresh(db_image)
+    await publish_image(db_image)
     return db_image
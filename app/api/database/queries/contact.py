@@ -1,37 +1,92 @@
 # app/queries/contact.py
-from sqlalchemy.orm import Session
-from app.api.database.models import Project, User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.api.database.models import Project, User, ProjectContractors, ministry_contact_officers
 
 
-def get_contractors_for_project(db: Session, project_id: int):
+async def get_contractors_for_project(db: AsyncSession, project_id: int):
     """
     Retrieve contractors associated with a specific project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
 
     Returns:
         - List[User]: List of contractor users associated with the project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if project:
-        return project.contractors
-    return []
+    result = await db.execute(
+        select(User).
+        join(ProjectContractors, ProjectContractors.contractor_id == User.id).
+        filter(ProjectContractors.project_id == project_id).
+        options(selectinload(User.roles))
+    )
+    return result.scalars().all()
 
 
-def get_ministry_contact_officers_for_project(db: Session, project_id: int):
+async def get_ministry_contact_officers_for_project(db: AsyncSession, project_id: int):
     """
     Retrieve ministry contact officers associated with a specific project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
 
     Returns:
         - List[User]: List of ministry contact officer users associated with the project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if project:
-        return project.ministry_contact_officers
-    return []
+    result = await db.execute(
+        select(User).
+        join(ministry_contact_officers, ministry_contact_officers.c.user_id == User.id).
+        join(Project, Project.ministry_id == ministry_contact_officers.c.ministry_id).
+        filter(Project.id == project_id).
+        options(selectinload(User.roles))
+    )
+    return result.scalars().all()
+
+
+async def get_contractors_for_projects(db: AsyncSession, project_ids: list):
+    """
+    Retrieve the contractors of several projects with one query (plus one for their roles).
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_ids (List[int]): Projects' unique identifiers.
+
+    Returns:
+        - dict: Project id to the list of its contractor users; every requested project has an entry.
+    """
+    result = await db.execute(
+        select(ProjectContractors.project_id, User).
+        join(ProjectContractors, ProjectContractors.contractor_id == User.id).
+        filter(ProjectContractors.project_id.in_(project_ids)).
+        options(selectinload(User.roles))
+    )
+    contractors = {project_id: [] for project_id in project_ids}
+    for project_id, user in result.all():
+        contractors[project_id].append(user)
+    return contractors
+
+
+async def get_contact_officers_for_ministries(db: AsyncSession, ministry_ids: list):
+    """
+    Retrieve the contact officers of several ministries with one query (plus one for their roles).
+
+    Args:
+        - db (AsyncSession): Database session.
+        - ministry_ids (List[int]): Ministries' unique identifiers.
+
+    Returns:
+        - dict: Ministry id to the list of its contact officer users; every requested ministry has an entry.
+    """
+    result = await db.execute(
+        select(ministry_contact_officers.c.ministry_id, User).
+        join(ministry_contact_officers, ministry_contact_officers.c.user_id == User.id).
+        filter(ministry_contact_officers.c.ministry_id.in_(ministry_ids)).
+        options(selectinload(User.roles))
+    )
+    officers = {ministry_id: [] for ministry_id in ministry_ids}
+    for ministry_id, user in result.all():
+        officers[ministry_id].append(user)
+    return officers
@@ -1,15 +1,58 @@
 # app/database/queries/contract.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.database.models import Contract
+from app.api.database.queries.bulk import bulk_insert
+from app.api.search_index import index_contract
+from app.api.util.response_cache import response_cache
 
 
-def create_contract(db: Session, contract_data: dict):
+async def create_contract(db: AsyncSession, contract_data: dict):
     contract = Contract(**contract_data)
     db.add(contract)
-    db.commit()
-    db.refresh(contract)
+    await db.commit()
+    # Embedded in the project's `include=contracts`
+    await response_cache.invalidate("project", contract.project_id)
+    await db.refresh(contract)
+    index_contract(contract)
     return contract
 
 
-def get_contract_by_id(db: Session, contract_id: int):
-    return db.query(Contract).filter(Contract.id == contract_id).first()
+async def get_contract_by_id(db: AsyncSession, contract_id: int):
+    result = await db.execute(select(Contract).filter(Contract.id == contract_id))
+    return result.scalars().first()
+
+
+async def create_contracts(db: AsyncSession, contracts_data: list):
+    """
+    Create many contracts in one transaction.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - contracts_data (List[dict]): Contract information, one dict per contract.
+
+    Returns:
+        - List[Contract]: Created contracts, in the order given.
+    """
+    contracts = await bulk_insert(db, Contract, contracts_data)
+    await db.commit()
+    for project_id in {contract.project_id for contract in contracts}:
+        await response_cache.invalidate("project", project_id)
+    for contract in contracts:
+        index_contract(contract)
+    return contracts
+
+
+async def get_existing_contract_names(db: AsyncSession, names):
+    """
+    Check which of the given contract names are already taken, in a single query.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - names (Iterable[str]): Contract names to check.
+
+    Returns:
+        - set: The names already used by a contract.
+    """
+    result = await db.execute(select(Contract.name).filter(Contract.name.in_(set(names))))
+    return set(result.scalars().all())
@@ -0,0 +1,120 @@
+# app/database/queries/discrepancy.py
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.models import Project, ProjectAgreement, ProjectPaymentReceipts, ProjectPayments
+from app.api.database.queries.finance import get_flagged_summaries
+from app.api.util.discrepancy import detect_discrepancies
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+
+# Rows fetched per round-trip while loading columns
+COLUMN_BATCH_SIZE = 10000
+
+
+async def _load_columns(db: AsyncSession, stmt, dtypes: dict):
+    """
+    Read a select() of plain columns into one NumPy array per column, a batch at a time.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - stmt (Select): Statement whose leading columns match the keys of `dtypes`, in order; trailing columns
+          are ignored.
+        - dtypes (dict): Column label to NumPy dtype.
+
+    Returns:
+        - dict: Column label to array.
+    """
+    chunks = {name: [] for name in dtypes}
+    result = await db.stream(stmt.execution_options(yield_per=COLUMN_BATCH_SIZE))
+    async for partition in result.partitions():
+        columns = list(zip(*partition))
+        for name, values in zip(dtypes, columns):
+            chunks[name].append(np.array(values, dtype=dtypes[name]))
+    return {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[name])
+        for name, parts in chunks.items()
+    }
+
+
+async def load_financial_columns(db: AsyncSession, project_ids: list = None):
+    """
+    Load budgets, agreements and payments as columnar arrays.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_ids (list): Restrict the load to these projects; all projects when None.
+
+    Returns:
+        - tuple: (projects, agreements, payments) dicts of NumPy arrays.
+    """
+    projects_stmt = select(Project.id, Project.budget)
+    # Rows without a project belong to no summary, and NULL cannot be loaded into an int64 column
+    agreements_stmt = select(ProjectAgreement.project_id, ProjectAgreement.start_date, ProjectAgreement.end_date,
+                             ProjectAgreement.amount). \
+        filter(ProjectAgreement.project_id.is_not(None))
+    # A payment counts once per project even if several receipts point at it
+    payments_stmt = select(ProjectPaymentReceipts.project_id, ProjectPayments.payment_date,
+                           ProjectPayments.amount, ProjectPayments.id). \
+        join(ProjectPayments, ProjectPayments.id == ProjectPaymentReceipts.payment_id). \
+        filter(ProjectPaymentReceipts.project_id.is_not(None)). \
+        distinct()
+    if project_ids is not None:
+        projects_stmt = projects_stmt.filter(Project.id.in_(project_ids))
+        agreements_stmt = agreements_stmt.filter(ProjectAgreement.project_id.in_(project_ids))
+        payments_stmt = payments_stmt.filter(ProjectPaymentReceipts.project_id.in_(project_ids))
+
+    projects = await _load_columns(db, projects_stmt, {"id": np.int64, "budget": np.float64})
+    agreements = await _load_columns(db, agreements_stmt, {
+        "project_id": np.int64,
+        "start_date": "datetime64[s]",
+        "end_date": "datetime64[s]",
+        "amount": np.float64,
+    })
+    payments = await _load_columns(db, payments_stmt, {
+        "project_id": np.int64,
+        "payment_date": "datetime64[s]",
+        "amount": np.float64,
+    })
+    return projects, agreements, payments
+
+
+async def scan_discrepancies(db: AsyncSession, project_ids: list = None):
+    """
+    Run the discrepancy checks over all projects, or over the given ones.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_ids (list): Restrict the scan to these projects; all projects when None.
+
+    Returns:
+        - dict: Per-project result arrays, see app.api.util.discrepancy.detect_discrepancies.
+    """
+    projects, agreements, payments = await load_financial_columns(db, project_ids)
+    return detect_discrepancies(projects, agreements, payments)
+
+
+async def scan_discrepancies_page(db: AsyncSession, flagged_only: bool = True, cursor: str = None,
+                                  limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Run the discrepancy checks over one page of projects, by ascending id.
+
+    Pages of flagged projects are selected through the (flagged, project_id) index of the running summaries,
+    as in get_flagged_summaries; other pages through the projects' primary key.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - flagged_only (bool): Only page through projects whose running summary is flagged.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
+
+    Returns:
+        - tuple: (per-project result arrays of the page, next cursor or None).
+    """
+    if flagged_only:
+        summaries, next_cursor = await get_flagged_summaries(db, cursor, limit)
+        project_ids = [summary.project_id for summary in summaries]
+    else:
+        projects, next_cursor = await paginate(db, select(Project), [Project.id], cursor, limit, descending=False)
+        project_ids = [project.id for project in projects]
+    return await scan_discrepancies(db, project_ids), next_cursor
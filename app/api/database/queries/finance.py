@@ -0,0 +1,426 @@
+# app/database/queries/finance.py
+# Agreements, payments and receipts. Every write here keeps project_financial_summaries and the ministry
+# summaries up to date, so discrepancy lookups and dashboards never have to rescan a project's history.
+from sqlalchemy import select, func, or_, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.models import (
+    Project,
+    ProjectAgreement,
+    ProjectPayments,
+    ProjectPaymentReceipts,
+    ProjectFinancialSummary,
+)
+from app.api.database.queries.bulk import bulk_insert, insert_missing
+from app.api.database.queries.ministry import add_project_financials_to_ministry_summary, rebuild_ministry_summaries
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.api.util.response_cache import response_cache
+
+# Projects whose summaries are recomputed, and locked, per transaction by rebuild_financial_summaries
+REBUILD_BATCH_SIZE = 500
+
+
+async def get_financial_summary(db: AsyncSession, project_id: int):
+    """
+    Retrieve the running financial summary of a project.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+
+    Returns:
+        - ProjectFinancialSummary: Summary row, or None if the project has no financial activity yet.
+    """
+    result = await db.execute(select(ProjectFinancialSummary).filter(ProjectFinancialSummary.project_id == project_id))
+    return result.scalars().first()
+
+
+async def get_flagged_summaries(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Retrieve a page of projects with at least one discrepancy, using the (flagged, project_id) index.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
+
+    Returns:
+        - tuple: (List[ProjectFinancialSummary], next cursor or None).
+    """
+    return await paginate(db, select(ProjectFinancialSummary).filter(ProjectFinancialSummary.flagged.is_(True)),
+                          [ProjectFinancialSummary.project_id], cursor, limit, descending=False)
+
+
+async def _lock_summary(db: AsyncSession, project_id: int):
+    """
+    Load (or create) a project's summary row, locked for the rest of the transaction so concurrent writers
+    apply their deltas one after the other.
+
+    A missing row is inserted with an upsert first, since SELECT ... FOR UPDATE has nothing to lock until the
+    row exists and two first writes would otherwise both try to insert it.
+    """
+    await insert_missing(db, ProjectFinancialSummary, {"project_id": project_id})
+    # Pending changes are flushed so the reload below cannot discard them
+    await db.flush()
+    result = await db.execute(
+        select(ProjectFinancialSummary).
+        filter(ProjectFinancialSummary.project_id == project_id).
+        with_for_update().
+        execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+def _covering_agreement(project_id, payment_date):
+    return exists().where(
+        ProjectAgreement.project_id == project_id,
+        or_(ProjectAgreement.start_date.is_(None), ProjectAgreement.start_date <= payment_date),
+        or_(ProjectAgreement.end_date.is_(None), ProjectAgreement.end_date >= payment_date),
+    )
+
+
+async def _count_payments_outside_agreements(db: AsyncSession, project_id: int):
+    result = await db.execute(
+        select(func.count(func.distinct(ProjectPayments.id))).
+        select_from(ProjectPaymentReceipts).
+        join(ProjectPayments, ProjectPayments.id == ProjectPaymentReceipts.payment_id).
+        filter(
+            ProjectPaymentReceipts.project_id == project_id,
+            ProjectPayments.payment_date.is_not(None),
+            ~_covering_agreement(project_id, ProjectPayments.payment_date),
+        )
+    )
+    return result.scalar_one()
+
+
+async def _payment_is_outside_agreements(db: AsyncSession, project_id: int, payment_date):
+    if payment_date is None:
+        return False
+    result = await db.execute(select(~_covering_agreement(project_id, payment_date)))
+    return bool(result.scalar_one())
+
+
+async def _project_is_linked_to_payment(db: AsyncSession, project_id: int, payment_id: int):
+    result = await db.execute(
+        select(ProjectPaymentReceipts.id).
+        filter(ProjectPaymentReceipts.project_id == project_id, ProjectPaymentReceipts.payment_id == payment_id).
+        limit(1)
+    )
+    return result.first() is not None
+
+
+async def _refresh_flags(db: AsyncSession, summary: ProjectFinancialSummary, budget: float = None):
+    if budget is None:
+        result = await db.execute(select(Project.budget).filter(Project.id == summary.project_id))
+        budget = result.scalar_one_or_none()
+    summary.overspent = budget is not None and summary.total_paid > budget
+    summary.agreements_over_budget = budget is not None and summary.total_agreed > budget
+    summary.flagged = summary.overspent or summary.agreements_over_budget or summary.payments_outside_agreements > 0
+
+
+async def refresh_project_flags(db: AsyncSession, project_id: int, budget: float):
+    """
+    Re-evaluate a project's budget flags after its budget changed. The caller commits.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - budget (float): The project's new budget.
+    """
+    summary = await get_financial_summary(db, project_id)
+    if summary is not None:
+        await _refresh_flags(db, summary, budget)
+
+
+async def create_agreement(db: AsyncSession, agreement_data: dict):
+    """
+    Create an agreement and add it to the project's running totals.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - agreement_data (dict): Agreement information, including project_id.
+
+    Returns:
+        - ProjectAgreement: Created agreement.
+    """
+    agreement = ProjectAgreement(**agreement_data)
+    db.add(agreement)
+    summary = await _lock_summary(db, agreement.project_id)
+    await db.flush()
+    summary.total_agreed += agreement.amount or 0.0
+    summary.agreement_count += 1
+    await add_project_financials_to_ministry_summary(db, agreement.project_id, agreed=agreement.amount or 0.0)
+    # A new window can only cover payments that were outside before
+    if summary.payments_outside_agreements:
+        summary.payments_outside_agreements = await _count_payments_outside_agreements(db, agreement.project_id)
+    await _refresh_flags(db, summary)
+    await db.commit()
+    # Agreements and receipts are embedded in the project's `include=agreements,receipts`
+    await response_cache.invalidate("project", agreement.project_id)
+    await db.refresh(agreement)
+    return agreement
+
+
+async def update_agreement(db: AsyncSession, agreement_id: int, agreement_data: dict):
+    """
+    Update an agreement and adjust the project's running totals by the difference.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - agreement_id (int): Agreement's unique identifier.
+        - agreement_data (dict): Updated agreement information.
+
+    Returns:
+        - ProjectAgreement: Updated agreement, or None if it does not exist.
+    """
+    result = await db.execute(select(ProjectAgreement).filter(ProjectAgreement.id == agreement_id))
+    agreement = result.scalars().first()
+    if agreement is None:
+        return None
+    old_project_id, old_amount = agreement.project_id, agreement.amount or 0.0
+    for key, value in agreement_data.items():
+        setattr(agreement, key, value)
+    await db.flush()
+
+    old_summary = await _lock_summary(db, old_project_id)
+    old_summary.total_agreed -= old_amount
+    if agreement.project_id != old_project_id:
+        old_summary.agreement_count -= 1
+        old_summary.payments_outside_agreements = await _count_payments_outside_agreements(db, old_project_id)
+        await _refresh_flags(db, old_summary)
+        summary = await _lock_summary(db, agreement.project_id)
+        summary.agreement_count += 1
+    else:
+        summary = old_summary
+    summary.total_agreed += agreement.amount or 0.0
+    summary.payments_outside_agreements = await _count_payments_outside_agreements(db, agreement.project_id)
+    await add_project_financials_to_ministry_summary(db, old_project_id, agreed=-old_amount)
+    await add_project_financials_to_ministry_summary(db, agreement.project_id, agreed=agreement.amount or 0.0)
+    await _refresh_flags(db, summary)
+    await db.commit()
+    for project_id in {old_project_id, agreement.project_id}:
+        await response_cache.invalidate("project", project_id)
+    await db.refresh(agreement)
+    return agreement
+
+
+async def _add_payment_to_summary(db: AsyncSession, project_id: int, payment: ProjectPayments):
+    summary = await _lock_summary(db, project_id)
+    summary.total_paid += payment.amount or 0.0
+    summary.payment_count += 1
+    await add_project_financials_to_ministry_summary(db, project_id, paid=payment.amount or 0.0)
+    if payment.payment_date is not None and (summary.last_payment_date is None
+                                             or payment.payment_date > summary.last_payment_date):
+        summary.last_payment_date = payment.payment_date
+    if await _payment_is_outside_agreements(db, project_id, payment.payment_date):
+        summary.payments_outside_agreements += 1
+    await _refresh_flags(db, summary)
+
+
+async def create_payment(db: AsyncSession, project_id: int, payment_data: dict, description: str = None):
+    """
+    Record a payment for a project together with the receipt linking it to the project.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - payment_data (dict): Payment information (payment_method, payment_date, amount).
+        - description (str): Receipt description.
+
+    Returns:
+        - ProjectPaymentReceipts: Created receipt, with its payment loaded.
+    """
+    payment = ProjectPayments(**payment_data)
+    db.add(payment)
+    await db.flush()
+    receipt = ProjectPaymentReceipts(project_id=project_id, payment_id=payment.id, description=description)
+    db.add(receipt)
+    await _add_payment_to_summary(db, project_id, payment)
+    await db.commit()
+    await response_cache.invalidate("project", project_id)
+    await db.refresh(receipt, ["payments"])
+    return receipt
+
+
+async def create_payments(db: AsyncSession, project_id: int, payments_data: list):
+    """
+    Record many payments for a project, with their receipts, in one transaction.
+
+    The payments and the receipts are each inserted in one batch, and the project's summary is updated once
+    for the whole batch.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - payments_data (List[dict]): Payment information (payment_method, payment_date, amount and the
+          receipt description), one dict per payment.
+
+    Returns:
+        - List[ProjectPaymentReceipts]: Created receipts, in the order given.
+    """
+    descriptions = [data.get("description") for data in payments_data]
+    payments = await bulk_insert(db, ProjectPayments, [
+        {key: value for key, value in data.items() if key != "description"} for data in payments_data
+    ])
+    receipts = await bulk_insert(db, ProjectPaymentReceipts, [
+        dict(project_id=project_id, payment_id=payment.id, description=description)
+        for payment, description in zip(payments, descriptions)
+    ])
+    if payments:
+        summary = await _lock_summary(db, project_id)
+        total_paid = sum(payment.amount or 0.0 for payment in payments)
+        summary.total_paid += total_paid
+        await add_project_financials_to_ministry_summary(db, project_id, paid=total_paid)
+        summary.payment_count += len(payments)
+        dates = [payment.payment_date for payment in payments if payment.payment_date is not None]
+        if summary.last_payment_date is not None:
+            dates.append(summary.last_payment_date)
+        summary.last_payment_date = max(dates, default=None)
+        summary.payments_outside_agreements = await _count_payments_outside_agreements(db, project_id)
+        await _refresh_flags(db, summary)
+    await db.commit()
+    await response_cache.invalidate("project", project_id)
+    return receipts
+
+
+async def create_receipt(db: AsyncSession, receipt_data: dict):
+    """
+    Link an existing payment to a project through a receipt.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - receipt_data (dict): Receipt information (project_id, payment_id, description).
+
+    Returns:
+        - ProjectPaymentReceipts: Created receipt, with its payment loaded.
+    """
+    receipt = ProjectPaymentReceipts(**receipt_data)
+    already_linked = await _project_is_linked_to_payment(db, receipt.project_id, receipt.payment_id)
+    db.add(receipt)
+    await db.flush()
+    if not already_linked:
+        result = await db.execute(select(ProjectPayments).filter(ProjectPayments.id == receipt.payment_id))
+        payment = result.scalars().first()
+        if payment is not None:
+            await _add_payment_to_summary(db, receipt.project_id, payment)
+    await db.commit()
+    await response_cache.invalidate("project", receipt.project_id)
+    await db.refresh(receipt, ["payments"])
+    return receipt
+
+
+async def update_payment(db: AsyncSession, payment_id: int, payment_data: dict):
+    """
+    Update a payment and adjust the totals of every project it is receipted against.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - payment_id (int): Payment's unique identifier.
+        - payment_data (dict): Updated payment information.
+
+    Returns:
+        - ProjectPayments: Updated payment, or None if it does not exist.
+    """
+    result = await db.execute(select(ProjectPayments).filter(ProjectPayments.id == payment_id))
+    payment = result.scalars().first()
+    if payment is None:
+        return None
+    old_amount = payment.amount or 0.0
+    for key, value in payment_data.items():
+        setattr(payment, key, value)
+    await db.flush()
+
+    result = await db.execute(
+        select(ProjectPaymentReceipts.project_id).filter(ProjectPaymentReceipts.payment_id == payment_id).distinct()
+    )
+    project_ids = result.scalars().all()
+    for project_id in project_ids:
+        summary = await _lock_summary(db, project_id)
+        summary.total_paid += (payment.amount or 0.0) - old_amount
+        await add_project_financials_to_ministry_summary(db, project_id, paid=(payment.amount or 0.0) - old_amount)
+        last_payment = await db.execute(
+            select(func.max(ProjectPayments.payment_date)).
+            join(ProjectPaymentReceipts, ProjectPaymentReceipts.payment_id == ProjectPayments.id).
+            filter(ProjectPaymentReceipts.project_id == project_id)
+        )
+        summary.last_payment_date = last_payment.scalar_one()
+        summary.payments_outside_agreements = await _count_payments_outside_agreements(db, project_id)
+        await _refresh_flags(db, summary)
+    await db.commit()
+    for project_id in project_ids:
+        await response_cache.invalidate("project", project_id)
+    await db.refresh(payment)
+    return payment
+
+
+async def _rebuild_summary_batch(db: AsyncSession, project_ids: list):
+    """
+    Recompute the summaries of a batch of projects in their own transaction.
+
+    The rows are created if missing and locked, in project order, before the projects are scanned, with the
+    same upsert and lock the incremental writers use. A writer that already holds one of them commits first
+    and is included in the scan; one that comes later waits and applies its delta on top of the rebuilt
+    totals. Rows of projects that no longer exist are zeroed.
+    """
+    # NumPy is only needed by the batch engine; importing it here keeps it off the worker's startup path
+    from app.api.database.queries.discrepancy import scan_discrepancies
+
+    for project_id in project_ids:
+        await insert_missing(db, ProjectFinancialSummary, {"project_id": project_id})
+    result = await db.execute(
+        select(ProjectFinancialSummary).
+        filter(ProjectFinancialSummary.project_id.in_(project_ids)).
+        order_by(ProjectFinancialSummary.project_id).
+        with_for_update().
+        execution_options(populate_existing=True)
+    )
+    summaries = {summary.project_id: summary for summary in result.scalars()}
+
+    results = await scan_discrepancies(db, project_ids)
+    last_payment = await db.execute(
+        select(ProjectPaymentReceipts.project_id, func.max(ProjectPayments.payment_date)).
+        join(ProjectPayments, ProjectPayments.id == ProjectPaymentReceipts.payment_id).
+        filter(ProjectPaymentReceipts.project_id.in_(project_ids)).
+        group_by(ProjectPaymentReceipts.project_id)
+    )
+    last_payment_dates = dict(last_payment.all())
+    columns = ("total_agreed", "total_paid", "agreement_count", "payment_count", "payments_outside_agreements",
+               "overspent", "agreements_over_budget", "flagged")
+    for project_id, *values in zip(*(results[name].tolist() for name in ("project_id",) + columns)):
+        summary = summaries.pop(project_id)
+        for column, value in zip(columns, values):
+            setattr(summary, column, value)
+        summary.last_payment_date = last_payment_dates.get(project_id)
+    for summary in summaries.values():
+        summary.total_agreed, summary.total_paid, summary.agreement_count, summary.payment_count = 0.0, 0.0, 0, 0
+        summary.payments_outside_agreements, summary.last_payment_date = 0, None
+        summary.overspent = summary.agreements_over_budget = summary.flagged = False
+    await db.commit()
+    return len(project_ids) - len(summaries)
+
+
+async def rebuild_financial_summaries(db: AsyncSession):
+    """
+    Recompute every project's summary from scratch with the batch discrepancy engine, REBUILD_BATCH_SIZE
+    projects per transaction, alongside the incremental writes.
+
+    Used to repair drift after writes that bypassed this module.
+
+    Args:
+        - db (AsyncSession): Database session.
+
+    Returns:
+        - int: Number of projects summarised.
+    """
+    result = await db.execute(
+        select(Project.id).union(select(ProjectFinancialSummary.project_id)).order_by("id")
+    )
+    project_ids = result.scalars().all()
+    # Ends the read, so each batch below is scanned from a snapshot taken after its rows are locked
+    await db.commit()
+    count = 0
+    for start in range(0, len(project_ids), REBUILD_BATCH_SIZE):
+        count += await _rebuild_summary_batch(db, project_ids[start:start + REBUILD_BATCH_SIZE])
+    # The ministry totals are sums of these
+    await rebuild_ministry_summaries(db)
+    return count
@@ -1,18 +1,110 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.database.models import Images
+from app.api.util.events import publish_image
+from app.api.util.multiget import in_request_order
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.api.util.response_cache import response_cache
 
 
-def create_image(db: Session, image_data: dict):
+async def create_image(db: AsyncSession, image_data: dict):
     new_image = Images(**image_data)
     db.add(new_image)
-    db.commit()
-    db.refresh(new_image)
+    await db.commit()
+    await response_cache.invalidate("project_images", new_image.project_id)
+    await response_cache.invalidate("project", new_image.project_id)
+    await db.refresh(new_image)
+    await publish_image(new_image)
     return new_image
 
 
-def get_image_by_id(db: Session, image_id: int):
-    return db.query(Images).filter(Images.id == image_id).first()
+async def create_uploaded_image(db: AsyncSession, image_data: dict, url_for):
+    """
+    Record an image whose bytes were uploaded to storage.
 
+    Args:
+        - db (AsyncSession): Database session.
+        - image_data (dict): Image information, including content_hash, content_type and size.
+        - url_for (Callable[[int], str]): Builds the URL the content is served at from the new image's id.
 
-def get_images_for_project(db: Session, project_id: int):
-    return db.query(Images).filter(Images.project_id == project_id).all()
+    Returns:
+        - Images: Created image.
+    """
+    image = Images(**image_data)
+    db.add(image)
+    await db.flush()
+    image.image_url = url_for(image.id)
+    await db.commit()
+    await response_cache.invalidate("project_images", image.project_id)
+    await response_cache.invalidate("project", image.project_id)
+    await publish_image(image)
+    return image
+
+
+async def get_image_ids_pending_derivatives(db: AsyncSession):
+    """
+    Uploaded images whose thumbnail and medium derivatives have not been generated yet.
+
+    Args:
+        - db (AsyncSession): Database session.
+
+    Returns:
+        - list: Image ids, oldest first.
+    """
+    result = await db.execute(select(Images.id).filter(Images.derivatives_status == "pending").order_by(Images.id))
+    return result.scalars().all()
+
+
+async def get_ready_derivatives_for_content(db: AsyncSession, content_hash: str):
+    """
+    Find an image with the same content whose derivatives are already generated, so they can be reused.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - content_hash (str): SHA-256 of the original.
+
+    Returns:
+        - Images: An image with ready derivatives, or None.
+    """
+    result = await db.execute(
+        select(Images).filter(Images.content_hash == content_hash, Images.derivatives_status == "ready").limit(1)
+    )
+    return result.scalars().first()
+
+
+async def set_image_derivatives(db: AsyncSession, image: Images, derivatives: dict):
+    """
+    Record the outcome of generating an image's derivatives.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - image (Images): Image the derivatives belong to.
+        - derivatives (dict): Column values: derivatives_status and, when ready, the original's dimensions and
+          each derivative's hash and dimensions.
+
+    Returns:
+        - Images: Updated image.
+    """
+    for key, value in derivatives.items():
+        setattr(image, key, value)
+    await db.commit()
+    await response_cache.invalidate("image", image.id)
+    await response_cache.invalidate("project_images", image.project_id)
+    await response_cache.invalidate("project", image.project_id)
+    return image
+
+
+async def get_image_by_id(db: AsyncSession, image_id: int):
+    result = await db.execute(select(Images).filter(Images.id == image_id))
+    return result.scalars().first()
+
+
+async def get_images_by_ids(db: AsyncSession, image_ids: list):
+    result = await db.execute(select(Images).filter(Images.id.in_(image_ids)))
+    return in_request_order(result.scalars().all(), image_ids)
+
+
+async def get_images_for_project(db: AsyncSession, project_id: int, cursor: str = None,
+                                 limit: int = DEFAULT_PAGE_SIZE):
+    return await paginate(db, select(Images).filter(Images.project_id == project_id),
+                          [Images.timestamp, Images.id], cursor, limit)
@@ -0,0 +1,44 @@
+# app/database/queries/leases.py
+import os
+import socket
+from datetime import timedelta
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.models import TaskLease
+from app.api.database.queries.bulk import insert_missing
+
+
+def worker_id():
+    """
+    Identify this worker process in task_leases.claimed_by.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+async def claim_task_run(db: AsyncSession, name: str, interval: float, now, claimed_by: str):
+    """
+    Claim the current run of a periodic job for this worker, if it is due and no other worker claimed it.
+
+    The claim is a single conditional UPDATE that moves the lease `interval` seconds ahead, so of the workers
+    that find the job due at the same moment exactly one sees its row updated.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - name (str): Job name.
+        - interval (float): Seconds until the job is due again.
+        - now (datetime): Current time.
+        - claimed_by (str): Identifies the claiming worker.
+
+    Returns:
+        - bool: Whether this worker should run the job now.
+    """
+    await insert_missing(db, TaskLease, {"name": name, "next_run_at": now})
+    result = await db.execute(
+        update(TaskLease).
+        where(TaskLease.name == name, TaskLease.next_run_at <= now).
+        values(next_run_at=now + timedelta(seconds=interval), claimed_by=claimed_by)
+    )
+    await db.commit()
+    return result.rowcount == 1
@@ -0,0 +1,160 @@
+# app/database/queries/ministry.py
+# Ministry dashboard aggregates. The project and finance write queries apply their deltas here in the same
+# transaction, and rebuild_ministry_summaries recomputes everything periodically, in one worker, to repair
+# any drift.
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.models import Ministry, MinistryStatusSummary, Project, ProjectFinancialSummary
+from app.api.database.queries.bulk import insert_missing
+
+
+async def get_ministry_summaries(db: AsyncSession, ministry_id: int):
+    """
+    Retrieve a ministry's per-status summary rows, a single read of the primary key.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - ministry_id (int): Ministry's unique identifier.
+
+    Returns:
+        - List[MinistryStatusSummary]: One row per project status, by status.
+    """
+    result = await db.execute(
+        select(MinistryStatusSummary).
+        filter(MinistryStatusSummary.ministry_id == ministry_id).
+        order_by(MinistryStatusSummary.status)
+    )
+    return result.scalars().all()
+
+
+async def ministry_exists(db: AsyncSession, ministry_id: int):
+    result = await db.execute(select(Ministry.id).filter(Ministry.id == ministry_id))
+    return result.first() is not None
+
+
+async def _lock_ministry_summary(db: AsyncSession, ministry_id: int, status: str):
+    """
+    Load (or create) a summary row, locked for the rest of the transaction so concurrent writers apply their
+    deltas one after the other. A missing row is inserted with an upsert first, as in finance._lock_summary.
+    """
+    await insert_missing(db, MinistryStatusSummary, {"ministry_id": ministry_id, "status": status})
+    # Pending changes, e.g. an earlier delta to the same row, are flushed so the reload below keeps them
+    await db.flush()
+    result = await db.execute(
+        select(MinistryStatusSummary).
+        filter(MinistryStatusSummary.ministry_id == ministry_id, MinistryStatusSummary.status == status).
+        with_for_update().
+        execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def add_to_ministry_summary(db: AsyncSession, ministry_id: int, status: str, projects: int = 0,
+                                  budget: float = 0.0, agreed: float = 0.0, paid: float = 0.0):
+    """
+    Apply a delta to the summary of a ministry and status. The caller commits.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - ministry_id (int): Ministry's unique identifier; projects without a ministry are not summarised.
+        - status (str): Project status.
+        - projects (int): Change in the number of projects.
+        - budget (float): Change in the total budget.
+        - agreed (float): Change in the total agreed.
+        - paid (float): Change in the total paid.
+    """
+    if ministry_id is None or not (projects or budget or agreed or paid):
+        return
+    summary = await _lock_ministry_summary(db, ministry_id, status or "")
+    summary.project_count += projects
+    summary.total_budget += budget
+    summary.total_agreed += agreed
+    summary.total_paid += paid
+
+
+async def add_project_financials_to_ministry_summary(db: AsyncSession, project_id: int, agreed: float = 0.0,
+                                                     paid: float = 0.0):
+    """
+    Apply a change in a project's agreed or paid total to its ministry's summary. The caller commits.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - agreed (float): Change in the project's total agreed.
+        - paid (float): Change in the project's total paid.
+    """
+    if not (agreed or paid):
+        return
+    result = await db.execute(select(Project.ministry_id, Project.status).filter(Project.id == project_id))
+    row = result.first()
+    if row is not None:
+        await add_to_ministry_summary(db, row.ministry_id, row.status, agreed=agreed, paid=paid)
+
+
+async def _rebuild_ministry_summary(db: AsyncSession, ministry_id: int):
+    """
+    Recompute one ministry's summary rows in their own transaction.
+
+    The ministry's rows are locked before the projects are aggregated. A writer that already holds one of them
+    commits first and is included in the totals; one that comes later waits and applies its delta on top of
+    them. Statuses left without projects are zeroed rather than deleted, so a concurrent upsert of the same
+    row never collides with a delete.
+    """
+    result = await db.execute(
+        select(MinistryStatusSummary).
+        filter(MinistryStatusSummary.ministry_id == ministry_id).
+        order_by(MinistryStatusSummary.status).
+        with_for_update().
+        execution_options(populate_existing=True)
+    )
+    summaries = {summary.status: summary for summary in result.scalars()}
+    status = func.coalesce(Project.status, "")
+    totals = await db.execute(
+        select(
+            status.label("status"),
+            func.count().label("project_count"),
+            func.coalesce(func.sum(Project.budget), 0.0).label("total_budget"),
+            func.coalesce(func.sum(ProjectFinancialSummary.total_agreed), 0.0).label("total_agreed"),
+            func.coalesce(func.sum(ProjectFinancialSummary.total_paid), 0.0).label("total_paid"),
+        ).
+        outerjoin(ProjectFinancialSummary, ProjectFinancialSummary.project_id == Project.id).
+        filter(Project.ministry_id == ministry_id).
+        group_by(status)
+    )
+    rows = 0
+    for row in totals.mappings().all():
+        summary = summaries.pop(row["status"], None)
+        if summary is None:
+            summary = await _lock_ministry_summary(db, ministry_id, row["status"])
+        for column, value in row.items():
+            setattr(summary, column, value)
+        rows += 1
+    for summary in summaries.values():
+        summary.project_count, summary.total_budget, summary.total_agreed, summary.total_paid = 0, 0.0, 0.0, 0.0
+    await db.commit()
+    return rows
+
+
+async def rebuild_ministry_summaries(db: AsyncSession):
+    """
+    Recompute every ministry's summary from the projects and their financial summaries, one ministry per
+    transaction, alongside the incremental writes.
+
+    Args:
+        - db (AsyncSession): Database session.
+
+    Returns:
+        - int: Number of summary rows with projects.
+    """
+    result = await db.execute(
+        select(Project.ministry_id).filter(Project.ministry_id.is_not(None)).
+        union(select(MinistryStatusSummary.ministry_id))
+    )
+    ministry_ids = result.scalars().all()
+    # Ends the read, so each ministry below is aggregated from a snapshot taken after its rows are locked
+    await db.commit()
+    rows = 0
+    for ministry_id in ministry_ids:
+        rows += await _rebuild_ministry_summary(db, ministry_id)
+    return rows
@@ -1,14 +1,44 @@
 # app/queries/project.py
-from sqlalchemy.orm import Session, joinedload
-from app.api.database.models import Project, Comment, Images
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
+from app.api.database.base import AsyncSessionLocal
+from app.api.database.models import Project, Comment, CommentReply, Images, ProjectAgreement, ProjectPaymentReceipts, \
+    ProjectPayments, ProjectFinancialSummary, User
+from app.api.database.queries.bulk import bulk_insert
+from app.api.database.queries.finance import get_financial_summary, refresh_project_flags
+from app.api.database.queries.ministry import add_to_ministry_summary
+from app.api.search_index import index_comment, index_project, index_reply, search_backend
+from app.api.util.events import publish_comment, publish_image, publish_reply
+from app.api.util.multiget import in_request_order
+from app.api.util.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.api.util.response_cache import response_cache
 
+# Projects fetched per server-side cursor round-trip by the export
+EXPORT_BATCH_SIZE = 500
 
-def create_project(db: Session, project_data: dict):
+# Loader strategy for each relationship a client can ask for with `include=`: joinedload for scalars,
+# selectinload for collections, so a project with all its children costs one query per included relationship
+PROJECT_LOADERS = {
+    "owner": joinedload(Project.owner).selectinload(User.roles),
+    "ministry": joinedload(Project.ministry),
+    "contractors": selectinload(Project.contractors).selectinload(User.roles),
+    "ministry_contact_officers": selectinload(Project.ministry_contact_officers).selectinload(User.roles),
+    "comments": selectinload(Project.comments),
+    "images": selectinload(Project.images),
+    "agreements": selectinload(Project.agreements),
+    "receipts": selectinload(Project.receipts).joinedload(ProjectPaymentReceipts.payments),
+    "contracts": selectinload(Project.contracts),
+    "published": selectinload(Project.published),
+}
+
+
+async def create_project(db: AsyncSession, project_data: dict):
     """
     Create a new project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_data (dict): Project information to create.
 
     Returns:
@@ -16,72 +46,201 @@ def create_project(db: Session, project_data: dict):
     """
     project = Project(**project_data)
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await add_to_ministry_summary(db, project.ministry_id, project.status, projects=1, budget=project.budget or 0.0)
+    await db.commit()
+    await db.refresh(project)
+    index_project(project)
     return project
 
 
-def get_project_by_id(db: Session, project_id: int):
+async def create_projects(db: AsyncSession, projects_data: list):
+    """
+    Create many projects in one transaction.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - projects_data (List[dict]): Project information, one dict per project.
+
+    Returns:
+        - List[Project]: Created projects, in the order given.
+    """
+    projects = await bulk_insert(db, Project, projects_data)
+    deltas = {}
+    for project in projects:
+        count, budget = deltas.get((project.ministry_id, project.status), (0, 0.0))
+        deltas[(project.ministry_id, project.status)] = (count + 1, budget + (project.budget or 0.0))
+    for (ministry_id, status), (count, budget) in deltas.items():
+        await add_to_ministry_summary(db, ministry_id, status, projects=count, budget=budget)
+    await db.commit()
+    for project in projects:
+        index_project(project)
+    return projects
+
+
+async def get_existing_project_ids(db: AsyncSession, project_ids):
+    """
+    Check which of the given project ids exist, in a single query.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_ids (Iterable[int]): Project ids to check.
+
+    Returns:
+        - set: The ids that belong to an existing project.
     """
-    Retrieve a project by ID with associated users and other related entities.
+    result = await db.execute(select(Project.id).filter(Project.id.in_(set(project_ids))))
+    return set(result.scalars().all())
+
+
+async def get_project_by_id(db: AsyncSession, project_id: int, include=()):
+    """
+    Retrieve a project by ID, optionally with related entities.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
+        - include (Iterable[str]): Relationships to load, keys of PROJECT_LOADERS.
+
+    Returns:
+        - Project: Retrieved project with the requested relationships loaded.
+    """
+    result = await db.execute(
+        select(Project).
+        filter(Project.id == project_id).
+        options(*(PROJECT_LOADERS[name] for name in include))
+    )
+    return result.scalars().first()
+
+async def get_projects_by_ids(db: AsyncSession, project_ids: list):
+    """
+    Retrieve several projects with one IN query.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_ids (List[int]): Projects' unique identifiers, without repeats.
+
+    Returns:
+        - List[Project]: The projects that exist, in the order of `project_ids`.
+    """
+    result = await db.execute(select(Project).filter(Project.id.in_(project_ids)))
+    return in_request_order(result.scalars().all(), project_ids)
+
+
+# Whitelist of the project listing's shapes. Each combination of at most one equality filter with one sort
+# column is backed by an index on (filter column, sort column, id) in models.Project, and a range filter is
+# only accepted on the sort column, so every listing is a single index range scan read in index order.
+PROJECT_LIST_FILTERS = {
+    "status": Project.status,
+    "ministry_id": Project.ministry_id,
+    "user_id": Project.user_id,
+}
+PROJECT_LIST_SORTS = {
+    "id": Project.id,
+    "start_date": Project.start_date,
+    "end_date": Project.end_date,
+    "budget": Project.budget,
+}
+
+
+async def list_projects(db: AsyncSession, sort: str = "id", filters: dict = None, lower=None, upper=None,
+                        descending: bool = True, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Retrieve a page of projects, filtered and sorted along one of the indexed shapes.
+
+    Projects without a value for the sort column are left out, as NULLs cannot be paged through by key.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - sort (str): Sort column, a key of PROJECT_LIST_SORTS.
+        - filters (dict): At most one key of PROJECT_LIST_FILTERS, with the value to match.
+        - lower: Inclusive lower bound on the sort column, or None.
+        - upper: Inclusive upper bound on the sort column, or None.
+        - descending (bool): Sort direction.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
 
     Returns:
-        - Project: Retrieved project with associated users and related entities.
+        - tuple: (List[Project], next cursor or None).
     """
-    return db.query(Project). \
-        filter(Project.id == project_id). \
-        options(
-            joinedload(Project.contractors),  # Eager load contractors
-            joinedload(Project.ministry_contact_officers),  # Eager load ministry contact officers
-            # Add eager loads for other related entities as needed
-        ). \
-        first()
+    sort_column = PROJECT_LIST_SORTS[sort]
+    stmt = select(Project)
+    for name, value in (filters or {}).items():
+        stmt = stmt.filter(PROJECT_LIST_FILTERS[name] == value)
+    if sort != "id":
+        stmt = stmt.filter(sort_column.isnot(None))
+    if lower is not None:
+        stmt = stmt.filter(sort_column >= lower)
+    if upper is not None:
+        stmt = stmt.filter(sort_column <= upper)
+    key_columns = [Project.id] if sort == "id" else [sort_column, Project.id]
+    return await paginate(db, stmt, key_columns, cursor, limit, descending)
 
-def update_project(db: Session, project_id: int, project_data: dict):
+
+async def update_project(db: AsyncSession, project_id: int, project_data: dict):
     """
     Update a project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
         - project_data (dict): Updated project information.
 
     Returns:
         - Project: Updated project.
     """
-    project = get_project_by_id(db, project_id)
+    project = await get_project_by_id(db, project_id)
     if project:
+        old_ministry_id, old_status, old_budget = project.ministry_id, project.status, project.budget or 0.0
         for key, value in project_data.items():
             setattr(project, key, value)
-        db.commit()
-        db.refresh(project)
+        if "budget" in project_data:
+            await refresh_project_flags(db, project_id, project.budget)
+        if (project.ministry_id, project.status) != (old_ministry_id, old_status):
+            # Move the whole project, financials included, to the summary it now belongs to
+            financials = await get_financial_summary(db, project_id)
+            agreed, paid = (financials.total_agreed, financials.total_paid) if financials else (0.0, 0.0)
+            await add_to_ministry_summary(db, old_ministry_id, old_status, projects=-1, budget=-old_budget,
+                                          agreed=-agreed, paid=-paid)
+            await add_to_ministry_summary(db, project.ministry_id, project.status, projects=1,
+                                          budget=project.budget or 0.0, agreed=agreed, paid=paid)
+        else:
+            await add_to_ministry_summary(db, project.ministry_id, project.status,
+                                          budget=(project.budget or 0.0) - old_budget)
+        await db.commit()
+        await response_cache.invalidate("project", project_id)
+        await db.refresh(project)
+        index_project(project)
     return project
 
 
-def delete_project(db: Session, project_id: int):
+async def delete_project(db: AsyncSession, project_id: int):
     """
     Delete a project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
     """
-    project = get_project_by_id(db, project_id)
+    project = await get_project_by_id(db, project_id)
     if project:
-        db.delete(project)
-        db.commit()
+        financials = await get_financial_summary(db, project_id)
+        agreed, paid = (financials.total_agreed, financials.total_paid) if financials else (0.0, 0.0)
+        await add_to_ministry_summary(db, project.ministry_id, project.status, projects=-1,
+                                      budget=-(project.budget or 0.0), agreed=-agreed, paid=-paid)
+        await db.execute(delete(ProjectFinancialSummary).filter(ProjectFinancialSummary.project_id == project_id))
+        await db.delete(project)
+        await db.commit()
+        for entity in ("project", "project_comments", "project_images"):
+            await response_cache.invalidate(entity, project_id)
+        search_backend.remove_project(project_id)
 
 
-def create_comment_for_project(db: Session, comment_data: dict):
+async def create_comment_for_project(db: AsyncSession, comment_data: dict):
     """
     Create a comment for a project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - comment_data (dict): Comment information to create.
 
     Returns:
@@ -89,31 +248,145 @@ def create_comment_for_project(db: Session, comment_data: dict):
     """
     comment = Comment(**comment_data)
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await response_cache.invalidate("project_comments", comment.project_id)
+    await response_cache.invalidate("project", comment.project_id)
+    await db.refresh(comment)
+    index_comment(comment)
+    await publish_comment(comment)
     return comment
 
 
-def get_comments_for_project(db: Session, project_id: int):
+async def create_comments_for_project(db: AsyncSession, project_id: int, comments_data: list):
+    """
+    Create many comments for a project in one transaction.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - comments_data (List[dict]): Comment information, one dict per comment, including user_id.
+
+    Returns:
+        - List[Comment]: Created comments, in the order given.
+    """
+    comments = await bulk_insert(db, Comment, [dict(data, project_id=project_id) for data in comments_data])
+    await db.commit()
+    await response_cache.invalidate("project_comments", project_id)
+    await response_cache.invalidate("project", project_id)
+    for comment in comments:
+        index_comment(comment)
+        await publish_comment(comment)
+    return comments
+
+
+async def get_comments_for_project(db: AsyncSession, project_id: int, cursor: str = None,
+                                   limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Retrieve a page of comments for a project, newest first.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
+
+    Returns:
+        - tuple: (List[Comment], next cursor or None).
+    """
+    return await paginate(db, select(Comment).filter(Comment.project_id == project_id),
+                          [Comment.timestamp, Comment.id], cursor, limit)
+
+
+async def get_comment_threads_for_project(db: AsyncSession, project_id: int, cursor: str = None,
+                                          limit: int = DEFAULT_PAGE_SIZE):
     """
-    Retrieve comments for a project.
+    Retrieve a page of comments for a project, newest first, each with all of its replies and with the
+    author of every comment and reply.
+
+    The page costs three queries whatever the number of replies: the comments, their replies with one IN
+    query (read in index order, oldest first within a comment) and the referenced users with another.
+    Replies and authors are read as plain columns, so a thread with thousands of replies builds no ORM
+    objects.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
+
+    Returns:
+        - tuple: (List[dict] of comments with a `replies` list and an `author` on each entry, next cursor or
+          None).
+    """
+    comments, next_cursor = await get_comments_for_project(db, project_id, cursor, limit)
+    threads = {
+        comment.id: {
+            "id": comment.id,
+            "user_id": comment.user_id,
+            "project_id": comment.project_id,
+            "text": comment.text,
+            "timestamp": comment.timestamp,
+            "replies": [],
+        }
+        for comment in comments
+    }
+    if not threads:
+        return [], next_cursor
+
+    replies = await db.execute(
+        select(CommentReply.id, CommentReply.comment_id, CommentReply.user_id, CommentReply.text,
+               CommentReply.timestamp).
+        filter(CommentReply.comment_id.in_(list(threads))).
+        order_by(CommentReply.comment_id, CommentReply.timestamp, CommentReply.id)
+    )
+    for reply in replies.mappings():
+        threads[reply["comment_id"]]["replies"].append(dict(reply))
+
+    user_ids = {thread["user_id"] for thread in threads.values()}
+    user_ids.update(reply["user_id"] for thread in threads.values() for reply in thread["replies"])
+    user_ids.discard(None)
+    authors = {}
+    if user_ids:
+        result = await db.execute(select(User.id, User.full_name).filter(User.id.in_(user_ids)))
+        authors = {row.id: {"id": row.id, "full_name": row.full_name} for row in result}
+
+    for thread in threads.values():
+        thread["author"] = authors.get(thread["user_id"])
+        for reply in thread["replies"]:
+            reply["author"] = authors.get(reply["user_id"])
+    return list(threads.values()), next_cursor
+
+
+async def create_reply_for_comment(db: AsyncSession, project_id: int, reply_data: dict):
+    """
+    Create a reply to a comment of a project.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project the comment must belong to.
+        - reply_data (dict): Reply information to create, including comment_id and user_id.
 
     Returns:
-        - List[Comment]: List of comments for the project.
+        - CommentReply: Created reply, or None if the comment does not exist on the project.
     """
-    return db.query(Comment).filter(Comment.project_id == project_id).all()
+    comment = await db.get(Comment, reply_data["comment_id"])
+    if comment is None or comment.project_id != project_id:
+        return None
+    reply = CommentReply(**reply_data)
+    db.add(reply)
+    await db.commit()
+    await db.refresh(reply)
+    index_reply(reply, project_id)
+    await publish_reply(reply, project_id)
+    return reply
 
 
-def create_image_for_project(db: Session, image_data: dict):
+async def create_image_for_project(db: AsyncSession, image_data: dict):
     """
     Create an image for a project.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - image_data (dict): Image information to create.
 
     Returns:
@@ -121,20 +394,102 @@ def create_image_for_project(db: Session, image_data: dict):
     """
     image = Images(**image_data)
     db.add(image)
-    db.commit()
-    db.refresh(image)
+    await db.commit()
+    await response_cache.invalidate("project_images", image.project_id)
+    await response_cache.invalidate("project", image.project_id)
+    await db.refresh(image)
+    await publish_image(image)
     return image
 
 
-def get_images_for_project(db: Session, project_id: int):
+async def create_images_for_project(db: AsyncSession, project_id: int, images_data: list):
     """
-    Retrieve images for a project.
+    Create many images for a project in one transaction.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - project_id (int): Project's unique identifier.
+        - images_data (List[dict]): Image information, one dict per image, including user_id.
 
     Returns:
-        - List[Image]: List of images for the project.
+        - List[Image]: Created images, in the order given.
+    """
+    images = await bulk_insert(db, Images, [dict(data, project_id=project_id) for data in images_data])
+    await db.commit()
+    await response_cache.invalidate("project_images", project_id)
+    await response_cache.invalidate("project", project_id)
+    for image in images:
+        await publish_image(image)
+    return images
+
+
+async def get_images_for_project(db: AsyncSession, project_id: int, cursor: str = None,
+                                 limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Retrieve a page of images for a project, newest first.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - project_id (int): Project's unique identifier.
+        - cursor (str): Cursor returned with the previous page.
+        - limit (int): Page size.
+
+    Returns:
+        - tuple: (List[Image], next cursor or None).
+    """
+    return await paginate(db, select(Images).filter(Images.project_id == project_id),
+                          [Images.timestamp, Images.id], cursor, limit)
+
+
+async def stream_projects_with_financials(batch_size: int = EXPORT_BATCH_SIZE):
     """
-    return db.query(Images).filter(Images.project_id == project_id).all()
+    Stream every project together with its agreements and payment receipts.
+
+    Projects are read through a server-side cursor in batches of `batch_size`; for each batch the agreements
+    and the receipts with their payments are fetched with one IN query each, on a second connection since
+    MySQL cannot run a query while a streamed result is still open. Rows are plain dicts, so memory use does
+    not grow with the size of the table.
+
+    The sessions are opened here rather than taken from the request, because the request's session is closed
+    before a streaming response body is sent.
+
+    Args:
+        - batch_size (int): Number of projects fetched per round-trip.
+
+    Yields:
+        - dict: Project columns plus "agreements" and "receipts" lists.
+    """
+    async with AsyncSessionLocal() as stream_db, AsyncSessionLocal() as db:
+        result = await stream_db.stream(
+            select(*Project.__table__.columns).order_by(Project.id).execution_options(yield_per=batch_size)
+        )
+        async for partition in result.mappings().partitions():
+            projects = {row["id"]: dict(row, agreements=[], receipts=[]) for row in partition}
+
+            agreements = await db.execute(
+                select(*ProjectAgreement.__table__.columns).
+                filter(ProjectAgreement.project_id.in_(projects)).
+                order_by(ProjectAgreement.id)
+            )
+            for row in agreements.mappings():
+                projects[row["project_id"]]["agreements"].append(dict(row))
+
+            receipts = await db.execute(
+                select(
+                    ProjectPaymentReceipts.id,
+                    ProjectPaymentReceipts.project_id,
+                    ProjectPaymentReceipts.payment_id,
+                    ProjectPaymentReceipts.description,
+                    ProjectPayments.payment_method,
+                    ProjectPayments.payment_date,
+                    ProjectPayments.amount,
+                ).
+                outerjoin(ProjectPayments, ProjectPayments.id == ProjectPaymentReceipts.payment_id).
+                filter(ProjectPaymentReceipts.project_id.in_(projects)).
+                order_by(ProjectPaymentReceipts.id)
+            )
+            for row in receipts.mappings():
+                projects[row["project_id"]]["receipts"].append(dict(row))
+
+            for project in projects.values():
+                yield project
@@ -0,0 +1,91 @@
+# app/queries/role.py
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.database.models import Role, user_roles
+from app.api.security.permissions import permission_cache
+from app.api.security.token_cache import token_cache
+
+
+async def get_role_by_name(db: AsyncSession, name: str):
+    """
+    Retrieve a role by name.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - name (str): Role name.
+
+    Returns:
+        - Role: Role if found, or None.
+    """
+    result = await db.execute(select(Role).filter(Role.name == name))
+    return result.scalars().first()
+
+
+async def create_role(db: AsyncSession, name: str):
+    """
+    Create a new role.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - name (str): Role name.
+
+    Returns:
+        - Role: Created role.
+    """
+    role = Role(name=name)
+    db.add(role)
+    await db.commit()
+    await db.refresh(role)
+    permission_cache.invalidate()
+    return role
+
+
+async def delete_role(db: AsyncSession, role_id: int):
+    """
+    Delete a role and its assignments.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - role_id (int): Role's unique identifier.
+    """
+    result = await db.execute(select(user_roles.c.user_id).filter(user_roles.c.role_id == role_id))
+    user_ids = result.scalars().all()
+    await db.execute(delete(user_roles).filter(user_roles.c.role_id == role_id))
+    await db.execute(delete(Role).filter(Role.id == role_id))
+    await db.commit()
+    permission_cache.invalidate()
+    for user_id in user_ids:
+        token_cache.invalidate_user(user_id)
+
+
+async def assign_role_to_user(db: AsyncSession, user_id: int, role_id: int):
+    """
+    Grant a role to a user.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - user_id (int): User's unique identifier.
+        - role_id (int): Role's unique identifier.
+    """
+    result = await db.execute(
+        select(user_roles.c.user_id).filter(user_roles.c.user_id == user_id, user_roles.c.role_id == role_id)
+    )
+    if result.first() is None:
+        await db.execute(user_roles.insert().values(user_id=user_id, role_id=role_id))
+        await db.commit()
+    # Cached principals carry the user's role ids
+    token_cache.invalidate_user(user_id)
+
+
+async def remove_role_from_user(db: AsyncSession, user_id: int, role_id: int):
+    """
+    Revoke a role from a user.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - user_id (int): User's unique identifier.
+        - role_id (int): Role's unique identifier.
+    """
+    await db.execute(delete(user_roles).filter(user_roles.c.user_id == user_id, user_roles.c.role_id == role_id))
+    await db.commit()
+    token_cache.invalidate_user(user_id)
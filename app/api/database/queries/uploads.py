@@ -0,0 +1,89 @@
+# app/database/queries/uploads.py
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.models import Images, UploadSession
+from app.api.util.events import publish_image
+from app.api.util.response_cache import response_cache
+
+
+async def create_upload_session(db: AsyncSession, session_data: dict):
+    upload = UploadSession(**session_data)
+    db.add(upload)
+    await db.commit()
+    return upload
+
+
+async def get_upload_session(db: AsyncSession, upload_id: str):
+    result = await db.execute(select(UploadSession).filter(UploadSession.id == upload_id))
+    return result.scalars().first()
+
+
+async def lock_upload_session(db: AsyncSession, upload_id: str):
+    """
+    Re-read an upload session, locked for the rest of the transaction, so concurrent completions of the same
+    upload run one after the other.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - upload_id (str): Upload's unique identifier.
+
+    Returns:
+        - UploadSession: The session with its current state, or None if it was deleted.
+    """
+    result = await db.execute(
+        select(UploadSession).
+        filter(UploadSession.id == upload_id).
+        with_for_update().
+        execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def complete_upload_session(db: AsyncSession, upload: UploadSession, image_data: dict, url_for):
+    """
+    Create the image for a finished upload and link it to the session, in one transaction.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - upload (UploadSession): The finished upload.
+        - image_data (dict): Image information, including content_hash, content_type and size.
+        - url_for (Callable[[int], str]): Builds the URL the content is served at from the new image's id.
+
+    Returns:
+        - Images: Created image.
+    """
+    image = Images(**image_data)
+    db.add(image)
+    await db.flush()
+    image.image_url = url_for(image.id)
+    upload.image_id = image.id
+    await db.commit()
+    await response_cache.invalidate("project_images", image.project_id)
+    await response_cache.invalidate("project", image.project_id)
+    await publish_image(image)
+    return image
+
+
+async def delete_upload_session(db: AsyncSession, upload: UploadSession):
+    await db.delete(upload)
+    await db.commit()
+
+
+async def delete_expired_upload_sessions(db: AsyncSession, now):
+    """
+    Delete the upload sessions that expired before `now`, finished or not.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - now (datetime): Current time.
+
+    Returns:
+        - list: Ids of the deleted sessions, whose partial files can be discarded.
+    """
+    result = await db.execute(select(UploadSession.id).filter(UploadSession.expires_at < now))
+    upload_ids = result.scalars().all()
+    if upload_ids:
+        await db.execute(delete(UploadSession).filter(UploadSession.id.in_(upload_ids)))
+        await db.commit()
+    return upload_ids
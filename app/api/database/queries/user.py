@@ -1,108 +1,132 @@
 # app/queries/user.py
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.api.database.models import User
-from app.api.security.auth import get_password_hash
+from app.api.security.hashing import get_password_hash_async, verify_password_async
+from app.api.security.token_cache import token_cache
+from app.api.util.multiget import in_request_order
 
 
-def create_user(db: Session, em: str, passw: str, fullname: str, act: bool):
+async def create_user(db: AsyncSession, em: str, passw: str, fullname: str, act: bool):
     """
     Create a new user.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - user_data (dict): User data to create.
 
     Returns:
         - User: Created user.
     """
-    encryptedPass = get_password_hash(passw)
-    user_data = User(email=em, password=encryptedPass[:6], full_name=fullname, active=act)
+    encryptedPass = await get_password_hash_async(passw)
+    user_data = User(email=em, password=encryptedPass, full_name=fullname, active=act)
 
     db.add(user_data)
-    db.commit()
-    db.refresh(user_data)
+    await db.commit()
+    await db.refresh(user_data, ["roles"])
     return user_data
 
 
-def get_user_by_username(db: Session, email: str):
+async def get_user_by_username(db: AsyncSession, email: str):
     """
     Retrieve a user by username.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - username (str): Username of the user to retrieve.
 
     Returns:
         - User: User details if found, or None if the user does not exist.
     """
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).filter(User.email == email).options(selectinload(User.roles)))
+    return result.scalars().first()
 
 
-def login_user(db: Session, username: str, password: str):
+async def login_user(db: AsyncSession, username: str, password: str):
     """
     Authenticate a user.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - username (str): User's username.
         - password (str): User's password.
 
     Returns:
         - User: Authenticated user.
     """
-    user = db.query(User).filter(User.email == username).first()
+    result = await db.execute(select(User).filter(User.email == username).options(selectinload(User.roles)))
+    user = result.scalars().first()
 
-    encryptedPass = get_password_hash(password)
-
-    if user and user.password == encryptedPass:
+    if user and await verify_password_async(password, user.password):
         return user
     return None
 
 
-def get_user_by_id(db: Session, user_id: int):
+async def get_user_by_id(db: AsyncSession, user_id: int):
     """
     Retrieve a user by ID.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - user_id (int): User's unique identifier.
 
     Returns:
         - User: Retrieved user.
     """
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).filter(User.id == user_id).options(selectinload(User.roles)))
+    return result.scalars().first()
+
+
+async def get_users_by_ids(db: AsyncSession, user_ids: list):
+    """
+    Retrieve several users with one IN query (plus one for their roles).
+
+    Args:
+        - db (AsyncSession): Database session.
+        - user_ids (List[int]): Users' unique identifiers, without repeats.
+
+    Returns:
+        - List[User]: The users that exist, in the order of `user_ids`.
+    """
+    result = await db.execute(select(User).filter(User.id.in_(user_ids)).options(selectinload(User.roles)))
+    return in_request_order(result.scalars().all(), user_ids)
 
 
-def update_user(db: Session, user_id: int, user_data: dict):
+async def update_user(db: AsyncSession, user_id: int, user_data: dict):
     """
     Update user information.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - user_id (int): User's unique identifier.
         - user_data (dict): Updated user data.
 
     Returns:
         - User: Updated user.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_user_by_id(db, user_id)
     if user:
+        if user_data.get("password"):
+            user_data = dict(user_data, password=await get_password_hash_async(user_data["password"]))
         for key, value in user_data.items():
             setattr(user, key, value)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user, ["roles"])
+        token_cache.invalidate_user(user_id)
         return user
 
 
-def delete_user(db: Session, user_id: int):
+async def delete_user(db: AsyncSession, user_id: int):
     """
     Delete user account.
 
     Args:
-        - db (Session): Database session.
+        - db (AsyncSession): Database session.
         - user_id (int): User's unique identifier.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await get_user_by_id(db, user_id)
     if user:
-        db.delete(user)
-        db.commit()
+        await db.delete(user)
+        await db.commit()
+        token_cache.invalidate_user(user_id)
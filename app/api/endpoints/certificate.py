@@ -1,27 +1,31 @@
 # app/api/certificate.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.database.base import Base, engine
 from app.api.database.models import User
-from app.api.database.dependency.db_instance import get_db  # Import an asynchronous database session
+from app.api.database.dependency.db_instance import get_db  # Asynchronous database session dependency
 from app.api.security.auth import get_current_user
 from app.api.database.queries.certificate import (
     get_certificate_by_id,
+    get_certificates,
+    get_certificates_by_ids,
     create_certificate,
     # update_certificate,
     delete_certificate,
 )
 from app.api.schemas.certificate import CertificateCreate, Certificate
-Base.metadata.create_all(bind=engine)
+from app.api.schemas.pagination import Page
+from app.api.util.multiget import optional_ids
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.util.response_cache import cached_json_response
 router = APIRouter()
 
 
 @router.post("/certificates", response_model=Certificate, summary="Create a new certificate")
-async def create_certificate(
+async def create_certificate_endpoint(
         certificate: CertificateCreate,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)  # Use an asynchronous database session
+        db: AsyncSession = Depends(get_db)  # Use an asynchronous database session
 ):
     """
     Create a new certificate.
@@ -41,15 +45,41 @@ async def create_certificate(
         raise HTTPException(status_code=401, detail="User is not logged in")  # You can check if the user is logged in
 
     # Create the certificate in the database
-    created_certificate = await create_certificate(db, certificate)
+    created_certificate = await create_certificate(db, certificate, current_user.id)
 
     return created_certificate
 
 
+@router.get("/certificates", response_model=Page[Certificate], summary="List certificates")
+async def list_certificates(
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        ids: list = Depends(optional_ids),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    List certificates one page at a time, in creation order, or retrieve several certificates by ID.
+
+    Args:
+        - cursor (str): `next_cursor` from the previous page; omit for the first page.
+        - limit (int): Page size.
+        - ids (str): Comma separated certificate ids; when given, returns those certificates in the requested
+          order in a single page, and cursor and limit are ignored.
+
+    Returns:
+        - Page[Certificate]: Certificates on this page and the cursor of the next page.
+    """
+    if ids is not None:
+        return Page(items=await get_certificates_by_ids(db, ids), next_cursor=None)
+    certificates, next_cursor = await get_certificates(db, cursor, limit)
+    return Page(items=certificates, next_cursor=next_cursor)
+
+
 @router.get("/certificates/{certificate_id}", response_model=Certificate, summary="Retrieve a certificate")
 async def read_certificate(
         certificate_id: int,
-        db: Session = Depends(get_db)  # Use an asynchronous database session
+        request: Request,
+        db: AsyncSession = Depends(get_db)  # Use an asynchronous database session
 ):
     """
     Retrieve a certificate by its ID.
@@ -60,10 +90,13 @@ async def read_certificate(
     Returns:
         - Certificate: Retrieved certificate information.
     """
-    certificate = await get_certificate_by_id(db, certificate_id)
-    if not certificate:
-        raise HTTPException(status_code=404, detail="Certificate not found")
-    return certificate
+    async def load():
+        certificate = await get_certificate_by_id(db, certificate_id)
+        if not certificate:
+            raise HTTPException(status_code=404, detail="Certificate not found")
+        return Certificate.model_validate(certificate)
+
+    return await cached_json_response(request, "certificate", certificate_id, "", load)
 
 
 # @router.put("/certificates/{certificate_id}", response_model=Certificate, summary="Update a certificate")
@@ -71,7 +104,7 @@ async def read_certificate(
 #         certificate_id: int,
 #         certificate_update: CertificateUpdate,
 #         current_user: User = Depends(get_current_user),  # Authorization check
-#         db: Session = Depends(get_db)  # Use an asynchronous database session
+#         db: AsyncSession = Depends(get_db)  # Use an asynchronous database session
 # ):
 #     """
 #     Update a certificate by its ID.
@@ -100,7 +133,7 @@ async def read_certificate(
 async def delete_certificate_endpoint(
         certificate_id: int,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)  # Use an asynchronous database session
+        db: AsyncSession = Depends(get_db)  # Use an asynchronous database session
 ):
     """
     Delete a certificate by its ID.
@@ -1,8 +1,7 @@
 # app/api/community.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.database.base import Base, engine
 from app.api.database.models import User
 from app.api.database.dependency.db_instance import get_db
 from app.api.security.auth import get_current_user
@@ -13,18 +12,28 @@ from app.api.database.queries.community import (
     create_image,
 )
 from app.api.schemas.community import CommentCreate, Comment, ImageCreate, Image
-Base.metadata.create_all(bind=engine)
+from app.api.schemas.pagination import Page
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.util.response_cache import cached_json_response
 router = APIRouter()
 
 
-@router.get("/projects/{project_id}/comments", response_model=list[Comment], summary="Retrieve comments for a project")
+@router.get("/projects/{project_id}/comments", response_model=Page[Comment], summary="Retrieve comments for a project")
 async def retrieve_comments_for_project(
         project_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_db)
 ):
+    async def load():
+        comments, next_cursor = await get_comments_by_project_id(db, project_id, cursor, limit)
+        return Page[Comment].model_validate({"items": comments, "next_cursor": next_cursor}, from_attributes=True)
+
     try:
-        comments = await get_comments_by_project_id(db, project_id)
-        return comments
+        return await cached_json_response(request, "project_comments", project_id, f"{cursor}:{limit}", load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -34,7 +43,7 @@ async def create_comment_for_project(
         project_id: int,
         comment_create: CommentCreate,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     try:
         created_comment = await create_comment(db, comment_create.text, project_id, current_user.id)
@@ -43,14 +52,22 @@ async def create_comment_for_project(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-@router.get("/projects/{project_id}/images", response_model=list[Image], summary="Retrieve images for a project")
+@router.get("/projects/{project_id}/images", response_model=Page[Image], summary="Retrieve images for a project")
 async def retrieve_images_for_project(
         project_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_db)
 ):
+    async def load():
+        images, next_cursor = await get_images_by_project_id(db, project_id, cursor, limit)
+        return Page[Image].model_validate({"items": images, "next_cursor": next_cursor}, from_attributes=True)
+
     try:
-        images = await get_images_by_project_id(db, project_id)
-        return images
+        return await cached_json_response(request, "project_images", project_id, f"{cursor}:{limit}", load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -60,7 +77,7 @@ async def upload_image_for_project(
         project_id: int,
         image_create: ImageCreate,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     try:
         created_image = await create_image(db, image_create.image_url, image_create.description, project_id,
@@ -1,16 +1,12 @@
 # app/api/contact.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 
-from app.api.database.base import Base, engine
-from app.api.database.dependency.db_instance import get_db
+from app.api.database.dependency.loaders import get_loaders
+from app.api.database.loaders import Loaders
 from app.api.security.auth import get_current_user
-from app.api.database.queries.contact import get_contractors_for_project, get_ministry_contact_officers_for_project
 from app.api.schemas.user import User
-from app.api.schemas.project import Project
 
 from typing import List
-Base.metadata.create_all(bind=engine)
 router = APIRouter()
 
 
@@ -19,7 +15,7 @@ router = APIRouter()
 async def retrieve_contractors_for_project(
         project_id: int,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        loaders: Loaders = Depends(get_loaders)
 ):
     """
     Retrieve contractors associated with a specific project.
@@ -29,14 +25,14 @@ async def retrieve_contractors_for_project(
     Returns:
     - List of contractor users associated with the project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await loaders.projects.load(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Check if the current user has permission to access the project information
     # (You may implement authorization logic here)
 
-    contractors = get_contractors_for_project(db, project_id)
+    contractors = await loaders.contractors_by_project.load(project_id)
     return contractors
 
 
@@ -45,7 +41,7 @@ async def retrieve_contractors_for_project(
 async def retrieve_ministry_contact_officers_for_project(
         project_id: int,
         current_user: User = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        loaders: Loaders = Depends(get_loaders)
 ):
     """
     Retrieve ministry contact officers associated with a specific project.
@@ -55,12 +51,14 @@ async def retrieve_ministry_contact_officers_for_project(
     Returns:
     - List of ministry contact officer users associated with the project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await loaders.projects.load(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Check if the current user has permission to access the project information
     # (You may implement authorization logic here)
 
-    ministry_contact_officers = get_ministry_contact_officers_for_project(db, project_id)
-    return ministry_contact_officers
+    # The project is already loaded, so the officers are looked up by its ministry without joining it again
+    if project.ministry_id is None:
+        return []
+    return await loaders.contact_officers_by_ministry.load(project.ministry_id)
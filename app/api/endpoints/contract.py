@@ -1,19 +1,27 @@
 # app/api/endpoints/contract.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.database.base import Base, engine
 from app.api.database.dependency.db_instance import get_db
+from app.api.database.models import User
 from app.api.schemas.contract import ContractCreate, Contract
-from app.api.database.queries.contract import create_contract, get_contract_by_id
-Base.metadata.create_all(bind=engine)
+from app.api.database.queries.contract import create_contract, create_contracts, get_contract_by_id, \
+    get_existing_contract_names
+from app.api.database.queries.project import get_existing_project_ids
+from app.api.schemas.bulk import BulkResult
+from app.api.security.permissions import require_permission, Permission
+from app.api.util.bulk import BulkBatch
+from app.api.util.response_cache import cached_json_response
 router = APIRouter()
 
 
 @router.post("/contracts", response_model=Contract, summary="Create a new contract")
-def create_contract_endpoint(
+async def create_contract_endpoint(
         contract: ContractCreate,
-        db: Session = Depends(get_db)
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new contract.
@@ -25,14 +33,53 @@ def create_contract_endpoint(
     Returns:
     - Created contract information.
     """
-    created_contract = create_contract(db, contract.dict())
+    created_contract = await create_contract(db, contract.dict())
     return created_contract
 
 
+@router.post("/contracts/bulk", response_model=BulkResult, summary="Create many contracts")
+async def create_contracts_endpoint(
+        contracts: List[Dict[str, Any]] = Body(
+            ..., description="Contracts to create, each with the fields of a single contract"
+        ),
+        atomic: bool = False,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many contracts in one transaction.
+
+    Besides the schema, every contract must name an existing project and a contract name that is neither
+    taken nor repeated earlier in the array; both are checked with one query for the whole batch.
+
+    - **contracts**: Array of contracts, each validated on its own.
+    - **atomic**: Create nothing if any contract is invalid.
+
+    Returns:
+    - Number of contracts created and failed, and the outcome of every item in submission order.
+    """
+    batch = BulkBatch(ContractCreate, contracts)
+    valid = batch.valid
+    project_ids = await get_existing_project_ids(db, [contract.project_id for _, contract in valid])
+    taken_names = await get_existing_contract_names(db, [contract.name for _, contract in valid])
+    for index, contract in valid:
+        if contract.project_id not in project_ids:
+            batch.reject(index, f"project_id: Project {contract.project_id} not found")
+        elif contract.name in taken_names:
+            batch.reject(index, f"name: A contract named '{contract.name}' already exists")
+        else:
+            taken_names.add(contract.name)
+    if batch.valid and not (atomic and batch.failed):
+        created = await create_contracts(db, [contract.model_dump() for _, contract in batch.valid])
+        batch.created(contract.id for contract in created)
+    return batch.report()
+
+
 @router.get("/contracts/{contract_id}", response_model=Contract, summary="Retrieve a contract")
-def retrieve_contract_endpoint(
+async def retrieve_contract_endpoint(
         contract_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a contract by ID.
@@ -42,7 +89,10 @@ def retrieve_contract_endpoint(
     Returns:
     - Retrieved contract information.
     """
-    contract = get_contract_by_id(db, contract_id)
-    if not contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-    return contract
+    async def load():
+        contract = await get_contract_by_id(db, contract_id)
+        if not contract:
+            raise HTTPException(status_code=404, detail="Contract not found")
+        return Contract.model_validate(contract)
+
+    return await cached_json_response(request, "contract", contract_id, "", load)
@@ -0,0 +1,145 @@
+# app/api/discrepancy.py
+import math
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.models import User
+from app.api.database.queries.finance import get_financial_summary, get_flagged_summaries, rebuild_financial_summaries
+from app.api.schemas.discrepancy import DiscrepancyReport, ProjectDiscrepancy, FinancialSummary
+from app.api.schemas.pagination import Page
+from app.api.security.auth import get_current_user
+from app.api.security.permissions import require_role
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter()
+
+# NumPy and the batch engine are imported inside the scan handlers so workers that never run a scan do not pay
+# for them at startup
+
+
+def _rows(results, positions):
+    """
+    Turn the selected positions of the columnar results into response models.
+    """
+    columns = {name: values[positions].tolist() for name, values in results.items()}
+    return [
+        ProjectDiscrepancy(**dict(row, budget=None if math.isnan(row["budget"]) else row["budget"]))
+        for row in (dict(zip(columns, values)) for values in zip(*columns.values()))
+    ]
+
+
+@router.get("/projects", response_model=DiscrepancyReport, summary="Scan projects for discrepancies")
+async def scan_all_projects(
+        flagged_only: bool = True,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Compare budgets, agreements and payments of the projects, one page at a time by ascending id.
+
+    A project is flagged when its payments exceed the budget, its agreements exceed the budget, or it has
+    payments dated outside every agreement window.
+
+    - **flagged_only**: Only return projects whose running financial summary is flagged.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Scan statistics of the page, its per-project results and the cursor of the next page.
+    """
+    import numpy as np
+    from app.api.database.queries.discrepancy import scan_discrepancies_page
+
+    started = time.perf_counter()
+    results, next_cursor = await scan_discrepancies_page(db, flagged_only, cursor, limit)
+    positions = np.argsort(results["project_id"], kind="stable")
+    return DiscrepancyReport(
+        projects_scanned=len(results["project_id"]),
+        projects_flagged=int(results["flagged"].sum()),
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        discrepancies=_rows(results, positions),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/projects/{project_id}", response_model=ProjectDiscrepancy, summary="Check one project for discrepancies")
+async def scan_project(
+        project_id: int,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Compare budget, agreements and payments of a single project.
+
+    - **project_id**: Project's unique identifier.
+
+    Returns:
+    - Totals and discrepancy flags of the project.
+    """
+    import numpy as np
+    from app.api.database.queries.discrepancy import scan_discrepancies
+
+    results = await scan_discrepancies(db, [project_id])
+    if len(results["project_id"]) == 0:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return _rows(results, np.arange(1))[0]
+
+
+@router.get("/summaries/{project_id}", response_model=FinancialSummary, summary="Running financial summary of a project")
+async def retrieve_financial_summary(
+        project_id: int,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve the incrementally maintained totals and discrepancy flags of a project.
+
+    - **project_id**: Project's unique identifier.
+
+    Returns:
+    - Financial summary of the project.
+    """
+    summary = await get_financial_summary(db, project_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="No financial activity recorded for this project")
+    return summary
+
+
+@router.get("/flagged", response_model=Page[FinancialSummary], summary="List projects with discrepancies")
+async def list_flagged_projects(
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    List the financial summaries of flagged projects, one page at a time.
+
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of flagged project summaries.
+    """
+    summaries, next_cursor = await get_flagged_summaries(db, cursor, limit)
+    return Page(items=summaries, next_cursor=next_cursor)
+
+
+@router.post("/summaries/rebuild", summary="Rebuild all financial summaries")
+async def rebuild_summaries(
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Recompute every project's financial summary with a full scan.
+
+    Returns:
+    - Number of projects summarised.
+    """
+    count = await rebuild_financial_summaries(db)
+    return {"message": "Financial summaries rebuilt", "projects": count}
@@ -0,0 +1,139 @@
+# app/api/endpoints/finance.py
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.models import User
+from app.api.database.queries.finance import create_agreement, update_agreement, create_payment, create_payments, \
+    update_payment
+from app.api.database.queries.project import get_existing_project_ids
+from app.api.schemas.bulk import BulkResult
+from app.api.schemas.finance import AgreementCreate, Agreement, PaymentCreate, Payment, Receipt
+from app.api.security.permissions import require_permission, Permission
+from app.api.util.bulk import BulkBatch
+
+router = APIRouter()
+
+
+@router.post("/projects/{project_id}/agreements", response_model=Agreement, summary="Create an agreement for a project")
+async def create_project_agreement(
+        project_id: int,
+        agreement: AgreementCreate,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Create an agreement for a project.
+
+    - **project_id**: Project's unique identifier.
+    - **agreement**: Agreement window and amount.
+
+    Returns:
+    - Created agreement information.
+    """
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    agreement_data = agreement.model_dump()
+    agreement_data["project_id"] = project_id
+    return await create_agreement(db, agreement_data)
+
+
+@router.put("/agreements/{agreement_id}", response_model=Agreement, summary="Update an agreement")
+async def update_project_agreement(
+        agreement_id: int,
+        agreement: AgreementCreate,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Update an agreement.
+
+    - **agreement_id**: Agreement's unique identifier.
+    - **agreement**: Updated agreement window and amount.
+
+    Returns:
+    - Updated agreement information.
+    """
+    updated_agreement = await update_agreement(db, agreement_id, agreement.model_dump())
+    if not updated_agreement:
+        raise HTTPException(status_code=404, detail="Agreement not found")
+    return updated_agreement
+
+
+@router.post("/projects/{project_id}/payments", response_model=Receipt, summary="Record a payment for a project")
+async def create_project_payment(
+        project_id: int,
+        payment: PaymentCreate,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Record a payment for a project and the receipt linking the two.
+
+    - **project_id**: Project's unique identifier.
+    - **payment**: Payment method, date, amount and receipt description.
+
+    Returns:
+    - Created receipt with its payment.
+    """
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    payment_data = payment.model_dump()
+    description = payment_data.pop("description")
+    return await create_payment(db, project_id, payment_data, description)
+
+
+@router.post("/projects/{project_id}/payments/bulk", response_model=BulkResult,
+             summary="Record many payments for a project")
+async def create_project_payments(
+        project_id: int,
+        payments: List[Dict[str, Any]] = Body(
+            ..., description="Payments to record, each with the fields of a single payment"
+        ),
+        atomic: bool = False,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Record many payments for a project, with their receipts, in one transaction.
+
+    - **project_id**: Project's unique identifier.
+    - **payments**: Array of payments, each validated on its own.
+    - **atomic**: Record nothing if any payment is invalid.
+
+    Returns:
+    - Number of payments recorded and failed, and for every item in submission order its outcome and the
+      id of its receipt.
+    """
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    batch = BulkBatch(PaymentCreate, payments)
+    if batch.valid and not (atomic and batch.failed):
+        receipts = await create_payments(db, project_id, [payment.model_dump() for _, payment in batch.valid])
+        batch.created(receipt.id for receipt in receipts)
+    return batch.report()
+
+
+@router.put("/payments/{payment_id}", response_model=Payment, summary="Update a payment")
+async def update_project_payment(
+        payment_id: int,
+        payment: PaymentCreate,
+        current_user: User = Depends(require_permission(Permission.MANAGE_CONTRACTS)),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Update a payment.
+
+    - **payment_id**: Payment's unique identifier.
+    - **payment**: Updated payment information.
+
+    Returns:
+    - Updated payment information.
+    """
+    payment_data = payment.model_dump(exclude={"description"})
+    updated_payment = await update_payment(db, payment_id, payment_data)
+    if not updated_payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return updated_payment
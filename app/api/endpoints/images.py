@@ -1,21 +1,31 @@
-from typing import List
+from typing import List, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.database.dependency.db_instance import get_db
 from app.api.schemas.user import User
 from app.api.security.auth import get_current_user
 from app.api.schemas.images import Image, ImageCreate
-from app.api.database.queries.images import create_image, get_image_by_id, get_images_for_project
+from app.api.schemas.pagination import Page
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.util.response_cache import cached_json_response, etag_matches
+from app.api.database.queries.images import create_image, create_uploaded_image, get_image_by_id, get_images_by_ids, \
+    get_images_for_project
+from app.api.database.queries.project import get_existing_project_ids
+from app.api.storage import get_storage, MAX_IMAGE_UPLOAD_BYTES, UploadTooLarge
+from app.api.storage.derivatives import derivative_pipeline
+from app.api.util.imaging import DERIVATIVE_CONTENT_TYPE
+from app.api.util.multiget import required_ids
 
 router = APIRouter()
 
 
 @router.post("/images", response_model=Image, summary="Upload an image")
-def upload_image(
+async def upload_image(
         image: ImageCreate,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Upload an image.
@@ -29,14 +39,32 @@ def upload_image(
     """
     image_data = image.dict()
     image_data["user_id"] = current_user.id
-    uploaded_image = create_image(db, image_data)
+    uploaded_image = await create_image(db, image_data)
     return uploaded_image
 
 
+@router.get("/images", response_model=Page[Image], summary="Retrieve several images")
+async def retrieve_images(
+        ids: List[int] = Depends(required_ids),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve several images by ID in one request.
+
+    - **ids**: Comma separated image ids; repeated ids are returned once.
+
+    Returns:
+    - The images that exist, in the requested order.
+    """
+    images = await get_images_by_ids(db, ids)
+    return Page[Image].model_validate({"items": images, "next_cursor": None}, from_attributes=True)
+
+
 @router.get("/images/{image_id}", response_model=Image, summary="Retrieve an image")
-def retrieve_image(
+async def retrieve_image(
         image_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve an image by ID.
@@ -46,24 +74,124 @@ def retrieve_image(
     Returns:
     - Retrieved image information.
     """
-    image = get_image_by_id(db, image_id)
-    if not image:
-        raise HTTPException(status_code=404, detail="Image not found")
-    return image
+    async def load():
+        image = await get_image_by_id(db, image_id)
+        if not image:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return Image.model_validate(image, from_attributes=True)
+
+    return await cached_json_response(request, "image", image_id, "", load)
+
+
+@router.get("/projects/{project_id}/images", response_model=Page[Image], summary="Retrieve images for a project")
+async def retrieve_images_for_project(
+        project_id: int,
+        request: Request,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a page of images for a project, newest first.
+
+    - **project_id**: Project's unique identifier.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of images for the project and the cursor of the next page.
+    """
+    async def load():
+        images, next_cursor = await get_images_for_project(db, project_id, cursor, limit)
+        return Page[Image].model_validate({"items": images, "next_cursor": next_cursor}, from_attributes=True)
+
+    return await cached_json_response(request, "project_images", project_id, f"{cursor}:{limit}", load)
 
 
-@router.get("/projects/{project_id}/images", response_model=List[Image], summary="Retrieve images for a project")
-def retrieve_images_for_project(
+@router.post("/projects/{project_id}/images/upload", response_model=Image, summary="Upload image content for a project")
+async def upload_image_content(
         project_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        description: str = Query("", max_length=200),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve images for a project.
+    Upload the bytes of an image, sent as the raw request body with an image/* Content-Type.
+
+    The body is streamed to storage in chunks and never held in memory. Identical content uploaded again,
+    by anyone and for any project, is stored only once. A thumbnail and a medium-size rendition are generated
+    in the background; until `derivatives_status` is "ready" the image has no `thumbnail_url` or `medium_url`.
 
     - **project_id**: Project's unique identifier.
+    - **description**: Image description.
 
     Returns:
-    - List of images for the project.
+    - Created image, with the URL its content is served at.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("image/"):
+        raise HTTPException(status_code=415, detail="Content-Type must be an image type")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_IMAGE_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Images are limited to {MAX_IMAGE_UPLOAD_BYTES} bytes")
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # The read transaction ends here, so no connection is held while the body is streamed to storage; the
+    # image row is inserted in a new one
+    await db.commit()
+
+    try:
+        stored = await get_storage().save(request.stream(), MAX_IMAGE_UPLOAD_BYTES)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=f"Images are limited to {MAX_IMAGE_UPLOAD_BYTES} bytes")
+    if stored.size == 0:
+        raise HTTPException(status_code=400, detail="Empty upload")
+
+    image_data = dict(project_id=project_id, user_id=current_user.id, description=description,
+                      content_hash=stored.digest, content_type=content_type, size=stored.size,
+                      derivatives_status="pending")
+    image = await create_uploaded_image(
+        db, image_data, lambda image_id: request.app.url_path_for("download_image_content", image_id=image_id)
+    )
+    derivative_pipeline.schedule(image.id)
+    return image
+
+
+@router.get("/images/{image_id}/content", summary="Download image content")
+async def download_image_content(
+        image_id: int,
+        request: Request,
+        variant: Literal["original", "thumbnail", "medium"] = "original",
+        db: AsyncSession = Depends(get_db)
+):
     """
-    images = get_images_for_project(db, project_id)
-    return images
+    Serve the bytes of an uploaded image, or of one of its derivatives.
+
+    Local files are sent as a file response (zero-copy where the server supports it) with Range support for
+    partial and resumed downloads. Content never changes for a given image, so the digest is used as a
+    strong ETag and clients may cache it indefinitely.
+
+    - **image_id**: Image's unique identifier.
+    - **variant**: "thumbnail" or "medium" for the JPEG derivatives, once generated.
+    """
+    image = await get_image_by_id(db, image_id)
+    if not image or not image.content_hash:
+        raise HTTPException(status_code=404, detail="Image content not found")
+    if variant == "original":
+        digest, content_type = image.content_hash, image.content_type
+    else:
+        digest, content_type = getattr(image, f"{variant}_hash"), DERIVATIVE_CONTENT_TYPE
+        if not digest:
+            raise HTTPException(status_code=404, detail=f"No {variant} has been generated for this image")
+    headers = {"ETag": f'"{digest}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    storage = get_storage()
+    path = storage.local_path(digest)
+    if path is not None:
+        return FileResponse(path, media_type=content_type, headers=headers)
+    if variant == "original":
+        headers["Content-Length"] = str(image.size)
+    return StreamingResponse(storage.open(digest), media_type=content_type, headers=headers)
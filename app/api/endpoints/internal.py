@@ -0,0 +1,44 @@
+# app/api/endpoints/internal.py
+import os
+
+from fastapi import APIRouter, Depends
+
+from app.api.database.base import engine, async_engine, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from app.api.database.models import User
+from app.api.database.pool import get_pool_status
+from app.api.security.permissions import require_role
+from app.api.util.startup import startup_report
+
+router = APIRouter()
+
+
+@router.get("/pool", summary="Connection pool statistics for this worker")
+async def pool_statistics(
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+):
+    """
+    Report live connection pool statistics for the worker that serves the request.
+
+    Returns:
+    - Pool configuration, checked out / overflow connections, waiters and the checkout wait-time histogram
+      for the async engine (request handlers) and the sync engine (tooling).
+    """
+    return {
+        "pid": os.getpid(),
+        "max_connections_per_engine": DB_POOL_SIZE + DB_MAX_OVERFLOW,
+        "async_engine": get_pool_status(async_engine.sync_engine.pool),
+        "sync_engine": get_pool_status(engine.pool),
+    }
+
+
+@router.get("/startup", summary="Boot-time report for this worker")
+async def startup_statistics(
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+):
+    """
+    Report how long the worker that serves the request took to boot, phase by phase.
+
+    Returns:
+    - Process id, total time to ready and the duration of each startup phase in milliseconds.
+    """
+    return startup_report.as_dict()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.queries.ministry import get_ministry_summaries, ministry_exists
+from app.api.schemas.ministry import MinistryStatusSummary, MinistrySummary
+from app.api.schemas.user import User
+from app.api.security.auth import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/{ministry_id}/summary", response_model=MinistrySummary, summary="Dashboard totals for a ministry")
+async def retrieve_ministry_summary(
+        ministry_id: int,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a ministry's project counts and budget, agreed and paid totals, overall and per project status.
+
+    The totals are kept up to date by every project and finance write and recomputed in full periodically,
+    so this is a single indexed read however many projects the ministry has.
+
+    - **ministry_id**: Ministry's unique identifier.
+
+    Returns:
+    - Totals for the ministry and one entry per project status.
+    """
+    rows = await get_ministry_summaries(db, ministry_id)
+    if not rows and not await ministry_exists(db, ministry_id):
+        raise HTTPException(status_code=404, detail="Ministry not found")
+    by_status = [MinistryStatusSummary.model_validate(row) for row in rows if row.project_count]
+    return MinistrySummary(
+        ministry_id=ministry_id,
+        project_count=sum(row.project_count for row in by_status),
+        total_budget=sum(row.total_budget for row in by_status),
+        total_agreed=sum(row.total_agreed for row in by_status),
+        total_paid=sum(row.total_paid for row in by_status),
+        by_status=by_status,
+        updated_at=max((row.updated_at for row in rows if row.updated_at), default=None),
+    )
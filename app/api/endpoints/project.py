@@ -1,34 +1,57 @@
 # app/api/project.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.database.base import engine, Base
 from app.api.database.dependency.db_instance import get_db
-from app.api.security.auth import get_current_user, get_current_admin_user
+from app.api.database.dependency.loaders import get_loaders
+from app.api.database.loaders import Loaders
+from app.api.security.auth import get_current_user
+from app.api.security.permissions import require_role
 from app.api.database.models import User
-from app.api.schemas.project import ProjectCreate, Project
-from app.api.schemas.community import CommentCreate, Image, ImageCreate, Comment
-from app.api.database.models import Images
+from app.api.schemas.project import ProjectCreate, Project, ProjectDetail
+from app.api.schemas.community import CommentCreate, CommentThread, Image, ImageCreate, Comment, Reply, ReplyCreate
+from app.api.schemas.bulk import BulkResult
+from app.api.schemas.pagination import Page
+from app.api.util.bulk import BulkBatch
+from app.api.util.events import project_events, EVENTS_KEEPALIVE_SECONDS, EVENTS_RETRY_MS
+from app.api.util.multiget import optional_ids
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.util.response_cache import cached_json_response
 from app.api.database.queries.project import (
     create_project,
+    create_projects,
+    get_existing_project_ids,
     get_project_by_id,
     update_project,
     delete_project,
     create_comment_for_project,
+    create_comments_for_project,
     get_comments_for_project,
+    get_comment_threads_for_project,
+    create_reply_for_comment,
     create_image_for_project,
+    create_images_for_project,
     get_images_for_project,
+    stream_projects_with_financials,
+    list_projects,
+    PROJECT_LOADERS,
 )
-from typing import List
-Base.metadata.create_all(bind=engine)
+from typing import Any, Dict, List
 router = APIRouter()
 
 
 @router.post("/projects", response_model=Project, summary="Create a new project")
-def create_new_project(
+async def create_new_project(
         project: ProjectCreate,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new project.
@@ -40,36 +63,212 @@ def create_new_project(
     Returns:
     - Created project information.
     """
-    created_project = create_project(db, project.dict())
+    created_project = await create_project(db, project.dict())
     return created_project
 
 
-@router.get("/projects/{project_id}", response_model=Project, summary="Retrieve a project")
-def retrieve_project(
+@router.get("/projects", response_model=Page[Project], summary="List projects")
+async def retrieve_projects(
+        ids: List[int] = Depends(optional_ids),
+        status: str = None,
+        ministry_id: int = None,
+        user_id: int = None,
+        start_date_from: datetime = None,
+        start_date_to: datetime = None,
+        end_date_from: datetime = None,
+        end_date_to: datetime = None,
+        budget_min: float = None,
+        budget_max: float = None,
+        sort: Literal["id", "start_date", "end_date", "budget"] = None,
+        order: Literal["asc", "desc"] = "desc",
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db),
+        loaders: Loaders = Depends(get_loaders)
+):
+    """
+    List projects one page at a time, or retrieve several projects by ID.
+
+    A listing takes at most one of the `status`, `ministry_id` and `user_id` filters and at most one range,
+    which must be on the sort column; each such combination is served from its own index, so every page
+    costs the same however many projects there are. Projects without a value for the sort column are not
+    listed.
+
+    - **ids**: Comma separated project ids; when given, returns those projects in the requested order in a
+      single page, and no other parameter may be used.
+    - **status**, **ministry_id**, **user_id**: Only list projects with this value.
+    - **start_date_from**, **start_date_to**, **end_date_from**, **end_date_to**, **budget_min**,
+      **budget_max**: Inclusive range on the sort column.
+    - **sort**: Sort column; defaults to the column of the range, or id.
+    - **order**: Sort direction.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of projects and the cursor of the next page.
+    """
+    filters = {name: value for name, value in
+               (("status", status), ("ministry_id", ministry_id), ("user_id", user_id)) if value is not None}
+    ranges = {column: bounds for column, bounds in (("start_date", (start_date_from, start_date_to)),
+                                                    ("end_date", (end_date_from, end_date_to)),
+                                                    ("budget", (budget_min, budget_max)))
+              if bounds != (None, None)}
+    if ids is not None:
+        if filters or ranges or sort or cursor:
+            raise HTTPException(status_code=400, detail="ids cannot be combined with filters, sort or cursor")
+        projects = await loaders.projects.load_many(ids)
+        return Page(items=[project for project in projects if project is not None], next_cursor=None)
+
+    if len(filters) > 1:
+        raise HTTPException(status_code=400, detail="Filter on at most one of status, ministry_id and user_id")
+    if len(ranges) > 1:
+        raise HTTPException(status_code=400, detail="Only one of the date and budget ranges can be used at once")
+    if ranges:
+        range_column, (lower, upper) = next(iter(ranges.items()))
+        if sort is not None and sort != range_column:
+            raise HTTPException(status_code=400, detail=f"A {range_column} range requires sort={range_column}")
+        sort = range_column
+    else:
+        lower = upper = None
+    projects, next_cursor = await list_projects(db, sort or "id", filters, lower, upper, order == "desc",
+                                                cursor, limit)
+    return Page(items=projects, next_cursor=next_cursor)
+
+
+@router.post("/projects/bulk", response_model=BulkResult, summary="Create many projects")
+async def create_many_projects(
+        projects: List[Dict[str, Any]] = Body(
+            ..., description="Projects to create, each with the fields of a single project"
+        ),
+        atomic: bool = False,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many projects in one transaction.
+
+    - **projects**: Array of projects, each validated on its own.
+    - **atomic**: Create nothing if any project is invalid.
+
+    Returns:
+    - Number of projects created and failed, and the outcome of every item in submission order.
+    """
+    batch = BulkBatch(ProjectCreate, projects)
+    if batch.valid and not (atomic and batch.failed):
+        created = await create_projects(db, [project.model_dump() for _, project in batch.valid])
+        batch.created(project.id for project in created)
+    return batch.report()
+
+
+# Flat columns of the CSV export; the financials are summarised per project
+EXPORT_CSV_COLUMNS = [
+    "id", "name", "description", "start_date", "end_date", "budget", "status", "user_id", "ministry_id",
+    "agreement_count", "total_agreed", "payment_count", "total_paid",
+]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _export_ndjson():
+    async for project in stream_projects_with_financials():
+        yield json.dumps(project, default=_json_default) + "\n"
+
+
+async def _export_csv():
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    async for project in stream_projects_with_financials():
+        payments = [receipt for receipt in project["receipts"] if receipt["amount"] is not None]
+        writer.writerow(dict(
+            project,
+            agreement_count=len(project["agreements"]),
+            total_agreed=sum(agreement["amount"] or 0 for agreement in project["agreements"]),
+            payment_count=len(payments),
+            total_paid=sum(payment["amount"] for payment in payments),
+        ))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@router.get("/projects/export", summary="Export all projects with their financials")
+async def export_projects(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+):
+    """
+    Stream every project with its agreements, payment receipts and payments.
+
+    - **format**: `ndjson` (one nested JSON object per line) or `csv` (one row per project with agreement
+      and payment totals).
+
+    Returns:
+    - A streamed response; rows are written as they are read, so memory stays flat for any table size.
+    """
+    if format == "csv":
+        return StreamingResponse(_export_csv(), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="projects.csv"'})
+    return StreamingResponse(_export_ndjson(), media_type="application/x-ndjson")
+
+
+def parse_include(include: str = Query(None, description="Comma separated related collections to embed: "
+                                                           + ", ".join(PROJECT_LOADERS))):
+    """
+    Validate the `include=` query parameter against the declared project loaders.
+    """
+    if not include:
+        return []
+    names = list(dict.fromkeys(name.strip() for name in include.split(",") if name.strip()))
+    unknown = [name for name in names if name not in PROJECT_LOADERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
+    return names
+
+
+@router.get("/projects/{project_id}", response_model=ProjectDetail, response_model_exclude_none=True,
+            summary="Retrieve a project")
+async def retrieve_project(
         project_id: int,
+        request: Request,
+        include: list = Depends(parse_include),
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a project by ID.
 
     - **project_id**: Project's unique identifier.
+    - **include**: Related entities to embed, e.g. `comments,images,contractors`. Each one costs a single
+      extra query regardless of its size.
 
     Returns:
-    - Retrieved project information.
+    - Retrieved project information with the requested related entities. The response carries an ETag; send
+      it back in If-None-Match to get an empty 304 while the project is unchanged.
     """
-    project = get_project_by_id(db, project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    async def load():
+        project = await get_project_by_id(db, project_id, include)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        detail = Project.model_validate(project).model_dump()
+        for name in include:
+            detail[name] = getattr(project, name)
+        return ProjectDetail.model_validate(detail, from_attributes=True)
+
+    return await cached_json_response(request, "project", project_id, ",".join(sorted(include)), load, exclude_none=True)
 
 
 @router.put("/projects/{project_id}", response_model=Project, summary="Update a project")
-def update_existing_project(
+async def update_existing_project(
         project_id: int,
         project: ProjectCreate,
-        current_user: User = Depends(get_current_admin_user),  # Authorization check (admin)
-        db: Session = Depends(get_db)
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Update a project.
@@ -80,33 +279,33 @@ def update_existing_project(
     Returns:
     - Updated project information.
     """
-    updated_project = update_project(db, project_id, project.dict())
+    updated_project = await update_project(db, project_id, project.dict())
     if not updated_project:
         raise HTTPException(status_code=404, detail="Project not found")
     return updated_project
 
 
 @router.delete("/projects/{project_id}", summary="Delete a project")
-def delete_existing_project(
+async def delete_existing_project(
         project_id: int,
-        current_user: User = Depends(get_current_admin_user),  # Authorization check (admin)
-        db: Session = Depends(get_db)
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a project.
 
     - **project_id**: Project's unique identifier.
     """
-    delete_project(db, project_id)
+    await delete_project(db, project_id)
     return {"message": "Project deleted successfully"}
 
 
 @router.post("/projects/{project_id}/comments", response_model=Comment, summary="Create a comment for a project")
-def create_comment_for_project(
+async def create_project_comment(
         project_id: int,
         comment: CommentCreate,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Create a comment for a project.
@@ -119,34 +318,175 @@ def create_comment_for_project(
     """
     comment_data = comment.dict()
     comment_data["project_id"] = project_id
-    created_comment = create_comment_for_project(db, comment_data)
+    comment_data["user_id"] = current_user.id
+    created_comment = await create_comment_for_project(db, comment_data)
     return created_comment
 
 
-@router.get("/projects/{project_id}/comments", response_model=List[Comment], summary="Retrieve comments for a project")
-def retrieve_comments_for_project(
+@router.post("/projects/{project_id}/comments/bulk", response_model=BulkResult,
+             summary="Create many comments for a project")
+async def create_project_comments(
+        project_id: int,
+        comments: List[Dict[str, Any]] = Body(
+            ..., description="Comments to create, each with the fields of a single comment"
+        ),
+        atomic: bool = False,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many comments for a project in one transaction, e.g. when a field team syncs.
+
+    - **project_id**: Project's unique identifier.
+    - **comments**: Array of comments, each validated on its own.
+    - **atomic**: Create nothing if any comment is invalid.
+
+    Returns:
+    - Number of comments created and failed, and the outcome of every item in submission order.
+    """
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    batch = BulkBatch(CommentCreate, comments)
+    if batch.valid and not (atomic and batch.failed):
+        created = await create_comments_for_project(
+            db, project_id, [dict(comment.model_dump(), user_id=current_user.id) for _, comment in batch.valid]
+        )
+        batch.created(comment.id for comment in created)
+    return batch.report()
+
+
+@router.get("/projects/{project_id}/comments", response_model=Page[Comment], summary="Retrieve comments for a project")
+async def retrieve_comments_for_project(
+        project_id: int,
+        request: Request,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a page of comments for a project, newest first.
+
+    - **project_id**: Project's unique identifier.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of comments for the project and the cursor of the next page.
+    """
+    async def load():
+        comments, next_cursor = await get_comments_for_project(db, project_id, cursor, limit)
+        return Page[Comment].model_validate({"items": comments, "next_cursor": next_cursor}, from_attributes=True)
+
+    return await cached_json_response(request, "project_comments", project_id, f"{cursor}:{limit}", load)
+
+
+async def _stream_threads(threads: list, next_cursor: str):
+    yield '{"items":['
+    for position, thread in enumerate(threads):
+        yield ("," if position else "") + json.dumps(thread, default=_json_default)
+    yield '],"next_cursor":' + json.dumps(next_cursor) + "}"
+
+
+@router.get("/projects/{project_id}/comments/threads", response_model=Page[CommentThread],
+            summary="Retrieve comment threads for a project")
+async def retrieve_comment_threads_for_project(
         project_id: int,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve comments for a project.
+    Retrieve a page of comments for a project, newest first, each with its replies and the author of every
+    comment and reply.
 
     - **project_id**: Project's unique identifier.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Number of comments per page; every reply of those comments is included.
 
     Returns:
-    - List of comments for the project.
+    - Page of comment threads, replies oldest first, and the cursor of the next page. The page is read with
+      three queries and streamed one thread at a time.
+    """
+    threads, next_cursor = await get_comment_threads_for_project(db, project_id, cursor, limit)
+    return StreamingResponse(_stream_threads(threads, next_cursor), media_type="application/json")
+
+
+@router.post("/projects/{project_id}/comments/{comment_id}/replies", response_model=Reply,
+             summary="Reply to a comment on a project")
+async def create_comment_reply(
+        project_id: int,
+        comment_id: int,
+        reply: ReplyCreate,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
     """
-    comments = get_comments_for_project(db, project_id)
-    return comments
+    Reply to a comment on a project.
+
+    - **project_id**: Project's unique identifier.
+    - **comment_id**: Comment's unique identifier.
+    - **reply**: Reply information to create.
+
+    Returns:
+    - Created reply information.
+    """
+    created_reply = await create_reply_for_comment(
+        db, project_id, dict(reply.model_dump(), comment_id=comment_id, user_id=current_user.id)
+    )
+    if created_reply is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return created_reply
+
+
+async def _stream_events(project_id: int):
+    # Subscribed only once the response is being sent, so a client that leaves earlier leaves nothing behind
+    subscription = project_events.subscribe(project_id)
+    try:
+        yield f"retry: {EVENTS_RETRY_MS}\n\n"
+        while True:
+            frame = await subscription.next(EVENTS_KEEPALIVE_SECONDS)
+            if frame is None:
+                return
+            yield frame or ": keep-alive\n\n"
+    finally:
+        project_events.unsubscribe(subscription)
+
+
+@router.get("/projects/{project_id}/events", summary="Stream new comments, replies and images of a project")
+async def stream_project_events(
+        project_id: int,
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of a project's new activity, replacing polling of the comment and image
+    listings.
+
+    - **project_id**: Project's unique identifier.
+
+    Returns:
+    - A `text/event-stream` response. Each event has type `comment`, `reply` or `image`, an id of the form
+      `<type>:<entity id>` and the created entity as JSON data, in the shape the matching create endpoint
+      returns. Comment lines are sent as keep-alives while the project is idle. Events are not replayed: a
+      client that (re)connects reads the first page of the listings once, then relies on the stream. A client
+      that falls too far behind is disconnected.
+    """
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Give the connection back to the pool now, it would otherwise stay checked out while the client listens
+    await db.close()
+    return StreamingResponse(_stream_events(project_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.post("/projects/{project_id}/images", response_model=Image, summary="Upload an image for a project")
-def upload_image_for_project(
+async def upload_image_for_project(
         project_id: int,
         image: ImageCreate,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Upload an image for a project.
@@ -159,23 +499,64 @@ def upload_image_for_project(
     """
     image_data = image.model_dump()
     image_data["project_id"] = project_id
-    uploaded_image = create_image_for_project(db, image_data)
+    image_data["user_id"] = current_user.id
+    uploaded_image = await create_image_for_project(db, image_data)
     return uploaded_image
 
 
-@router.get("/projects/{project_id}/images", response_model=List[Image], summary="Retrieve images for a project")
-def retrieve_images_for_project(
+@router.post("/projects/{project_id}/images/bulk", response_model=BulkResult,
+             summary="Upload many images for a project")
+async def upload_images_for_project(
         project_id: int,
+        images: List[Dict[str, Any]] = Body(
+            ..., description="Images to create, each with the fields of a single image"
+        ),
+        atomic: bool = False,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve images for a project.
+    Record many images for a project in one transaction.
 
     - **project_id**: Project's unique identifier.
+    - **images**: Array of images, each validated on its own.
+    - **atomic**: Create nothing if any image is invalid.
 
     Returns:
-    - List of images for the project.
+    - Number of images created and failed, and the outcome of every item in submission order.
     """
-    images = get_images_for_project(db, project_id)
-    return images
+    if not await get_existing_project_ids(db, [project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    batch = BulkBatch(ImageCreate, images)
+    if batch.valid and not (atomic and batch.failed):
+        created = await create_images_for_project(
+            db, project_id, [dict(image.model_dump(), user_id=current_user.id) for _, image in batch.valid]
+        )
+        batch.created(image.id for image in created)
+    return batch.report()
+
+
+@router.get("/projects/{project_id}/images", response_model=Page[Image], summary="Retrieve images for a project")
+async def retrieve_images_for_project(
+        project_id: int,
+        request: Request,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve a page of images for a project, newest first.
+
+    - **project_id**: Project's unique identifier.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of images for the project and the cursor of the next page.
+    """
+    async def load():
+        images, next_cursor = await get_images_for_project(db, project_id, cursor, limit)
+        return Page[Image].model_validate({"items": images, "next_cursor": next_cursor}, from_attributes=True)
+
+    return await cached_json_response(request, "project_images", project_id, f"{cursor}:{limit}", load)
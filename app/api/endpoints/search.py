@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.schemas.pagination import Page
+from app.api.schemas.search import SearchResult
+from app.api.schemas.user import User
+from app.api.search_index import SEARCH_FIELDS, search_backend
+from app.api.security.auth import get_current_user
+from app.api.util.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_offset_cursor, encode_offset_cursor
+
+router = APIRouter()
+
+
+def parse_kinds(kinds: str = Query(None, description="Comma separated kinds to search: "
+                                                      + ", ".join(SEARCH_FIELDS) + "; all when omitted")):
+    if kinds is None:
+        return None
+    selected = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+    unknown = [kind for kind in selected if kind not in SEARCH_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"kinds must be among {', '.join(SEARCH_FIELDS)}")
+    return selected
+
+
+@router.get("/search", response_model=Page[SearchResult], summary="Search projects, comments and contracts")
+async def search(
+        q: str = Query(..., min_length=1, max_length=200),
+        kinds: Optional[List[str]] = Depends(parse_kinds),
+        project_id: int = None,
+        cursor: str = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Search project names, statuses and descriptions, comments, comment replies and contract names and
+    details by keyword. Records must contain every keyword and come best match first.
+
+    - **q**: Keywords.
+    - **kinds**: Comma separated kinds of records to search; all when omitted.
+    - **project_id**: Only search records of this project.
+    - **cursor**: `next_cursor` from the previous page; omit for the first page.
+    - **limit**: Page size.
+
+    Returns:
+    - Page of matches, each identifying a record by kind and id, and the cursor of the next page.
+    """
+    offset = decode_offset_cursor(cursor)
+    hits = await search_backend.search(db, q, kinds, project_id, offset, limit + 1)
+    next_cursor = encode_offset_cursor(offset + limit) if len(hits) > limit else None
+    return Page[SearchResult](items=[hit._asdict() for hit in hits[:limit]], next_cursor=next_cursor)
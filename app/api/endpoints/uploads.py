@@ -0,0 +1,222 @@
+import re
+import uuid
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.queries.images import get_image_by_id
+from app.api.database.queries.project import get_existing_project_ids
+from app.api.database.queries.uploads import complete_upload_session, create_upload_session, \
+    delete_upload_session, get_upload_session, lock_upload_session
+from app.api.schemas.images import Image
+from app.api.schemas.uploads import UploadSession, UploadSessionCreate
+from app.api.schemas.user import User
+from app.api.security.auth import get_current_user
+from app.api.storage import get_storage, MAX_RESUMABLE_UPLOAD_BYTES, UPLOAD_SESSION_TTL_HOURS, UploadBusy, \
+    UploadOffsetMismatch, UploadTooLarge
+from app.api.storage.derivatives import derivative_pipeline
+from app.api.util.datetime import get_current_datetime
+
+router = APIRouter()
+
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+async def get_owned_upload(upload_id: str, current_user: User, db: AsyncSession):
+    upload = await get_upload_session(db, upload_id)
+    if not upload or upload.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.image_id is None and upload.expires_at <= get_current_datetime():
+        raise HTTPException(status_code=404, detail="Upload has expired")
+    return upload
+
+
+def upload_state(upload, offset: int):
+    state = UploadSession.model_validate(upload, from_attributes=True)
+    state.offset = offset
+    return state
+
+
+def offset_conflict(detail: str, offset: int):
+    return HTTPException(status_code=409, detail=detail, headers={"Upload-Offset": str(offset)})
+
+
+@router.post("/uploads", response_model=UploadSession, status_code=201, summary="Start a resumable upload")
+async def start_upload(
+        upload: UploadSessionCreate,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Start a resumable upload of an image for a project.
+
+    The file is then sent in one or more chunks with `PUT /uploads/uploads/{upload_id}`, in order, and
+    the upload is completed with `POST /uploads/uploads/{upload_id}/complete`. Unfinished uploads expire
+    after a day.
+
+    - **upload**: Project, content type, total size in bytes and description of the file.
+
+    Returns:
+    - Upload session, whose id addresses the upload.
+    """
+    if upload.size > MAX_RESUMABLE_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Uploads are limited to {MAX_RESUMABLE_UPLOAD_BYTES} bytes")
+    if not await get_existing_project_ids(db, [upload.project_id]):
+        raise HTTPException(status_code=404, detail="Project not found")
+    session_data = upload.model_dump()
+    session_data.update(id=uuid.uuid4().hex, user_id=current_user.id,
+                        expires_at=get_current_datetime() + timedelta(hours=UPLOAD_SESSION_TTL_HOURS))
+    return upload_state(await create_upload_session(db, session_data), 0)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSession, summary="Retrieve the state of an upload")
+async def retrieve_upload(
+        upload_id: str,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve how much of an upload has been received, to resume it after a failure.
+
+    - **upload_id**: Upload's unique identifier.
+
+    Returns:
+    - Upload session; `offset`, also sent as the Upload-Offset header, is where the next chunk starts.
+    """
+    upload = await get_owned_upload(upload_id, current_user, db)
+    offset = upload.size if upload.image_id else await get_storage().part_size(upload_id)
+    response.headers["Upload-Offset"] = str(offset)
+    return upload_state(upload, offset)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSession, summary="Send a chunk of an upload")
+async def upload_chunk(
+        upload_id: str,
+        request: Request,
+        response: Response,
+        content_range: str = Header(..., description="bytes <first>-<last>/<total size>"),
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Append a chunk, sent as the raw request body, to an upload.
+
+    The chunk is streamed to disk as it arrives. It must start at the current offset; a chunk that does not
+    is rejected with 409 and the Upload-Offset header. If the connection drops, the bytes received up to
+    that point are kept and the client resumes from the offset reported by `GET /uploads/uploads/{upload_id}`.
+
+    - **upload_id**: Upload's unique identifier.
+    - **Content-Range**: Position of the chunk, e.g. `bytes 0-1048575/5242880`.
+
+    Returns:
+    - Upload session with the new offset.
+    """
+    match = CONTENT_RANGE.match(content_range)
+    if not match:
+        raise HTTPException(status_code=400, detail="Content-Range must look like 'bytes <first>-<last>/<size>'")
+    first, last, total = (int(value) for value in match.groups())
+    upload = await get_owned_upload(upload_id, current_user, db)
+    if upload.image_id:
+        raise offset_conflict("Upload is already complete", upload.size)
+    if total != upload.size or first > last or last >= upload.size:
+        raise HTTPException(status_code=416, detail=f"Chunk must fall within the {upload.size} bytes of the upload")
+    # The read transaction ends here, so no connection is held while the chunk arrives over a slow link
+    await db.commit()
+
+    try:
+        offset = await get_storage().append_part(upload_id, first, request.stream(), last - first + 1)
+    except UploadOffsetMismatch as exc:
+        raise offset_conflict(f"Upload continues at byte {exc.offset}", exc.offset)
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Another chunk of this upload is being received")
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Chunk is larger than its Content-Range")
+    except ClientDisconnect:
+        # The client is gone; what was received is kept for it to resume from
+        return Response(status_code=400)
+    response.headers["Upload-Offset"] = str(offset)
+    return upload_state(upload, offset)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=Image, summary="Complete an upload")
+async def complete_upload(
+        upload_id: str,
+        request: Request,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Complete an upload once all its bytes have been received, creating the image.
+
+    Completing an upload that was already completed returns the same image, so the request can be retried
+    safely.
+
+    - **upload_id**: Upload's unique identifier.
+
+    Returns:
+    - Created image, with the URL its content is served at.
+    """
+    upload = await get_owned_upload(upload_id, current_user, db)
+    storage = get_storage()
+    if upload.image_id:
+        await storage.delete_part(upload_id)
+        return await get_image_by_id(db, upload.image_id)
+    offset = await storage.part_size(upload_id)
+    if offset != upload.size:
+        raise offset_conflict(f"Only {offset} of {upload.size} bytes have been received", offset)
+    # The read transaction ends here, so no connection is held while the part is hashed and the locking read
+    # below sees the latest committed state
+    await db.commit()
+    try:
+        digest, size = await storage.digest_part(upload_id)
+    except FileNotFoundError:
+        # A concurrent completion already recorded the upload and removed the part
+        digest = size = None
+
+    upload = await lock_upload_session(db, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.image_id:
+        await db.commit()
+        return await get_image_by_id(db, upload.image_id)
+    if digest is None:
+        raise offset_conflict(f"Only 0 of {upload.size} bytes have been received", 0)
+
+    stored = await storage.commit_part(upload_id, digest, size)
+    image_data = dict(project_id=upload.project_id, user_id=current_user.id, description=upload.description,
+                      content_hash=stored.digest, content_type=upload.content_type, size=stored.size,
+                      derivatives_status="pending")
+    try:
+        image = await complete_upload_session(
+            db, upload, image_data,
+            lambda image_id: request.app.url_path_for("download_image_content", image_id=image_id)
+        )
+    except BaseException:
+        # Nothing refers to a file this request added to the store; the part is kept for a retry
+        if stored.created:
+            await storage.delete(stored.digest)
+        raise
+    await storage.delete_part(upload_id)
+    derivative_pipeline.schedule(image.id)
+    return image
+
+
+@router.delete("/uploads/{upload_id}", status_code=204, summary="Cancel an upload")
+async def cancel_upload(
+        upload_id: str,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Cancel an upload and discard the bytes received so far. The image of a completed upload is kept.
+
+    - **upload_id**: Upload's unique identifier.
+    """
+    upload = await get_owned_upload(upload_id, current_user, db)
+    await delete_upload_session(db, upload)
+    await get_storage().delete_part(upload_id)
@@ -1,10 +1,14 @@
 # app/api/user.py
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.database.base import engine, Base
 from app.api.database.dependency.db_instance import get_db
-from app.api.security.auth import get_current_user, get_current_admin_user
+from app.api.database.dependency.loaders import get_loaders
+from app.api.database.loaders import Loaders
+from app.api.security.auth import get_current_user
+from app.api.security.permissions import require_role
 from app.api.schemas.user import UserCreate, User as u
 from app.api.database.models import User
 from app.api.database.queries.user import (
@@ -14,15 +18,17 @@ from app.api.database.queries.user import (
     update_user,
     delete_user, get_user_by_username,
 )
+from app.api.schemas.pagination import Page
+from app.api.util.multiget import required_ids
+from app.api.database.queries.role import get_role_by_name, assign_role_to_user, remove_role_from_user
 
-Base.metadata.create_all(bind=engine)
 router = APIRouter()
 
 
 @router.post("/register", response_model=u, summary="Create a new user")
 async def create_new_user(
         user: UserCreate,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
       Create a new user.
@@ -35,11 +41,11 @@ async def create_new_user(
       - Created user information if registration is successful.
       - An appropriate error message if the user already exists.
       """
-    existing_user = get_user_by_username(db, user.email)
+    existing_user = await get_user_by_username(db, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="User with this username already exists")
 
-    created_user = create_user(db, user.email, user.password, user.full_name, 0)
+    created_user = await create_user(db, user.email, user.password, user.full_name, True)
     return created_user
 
 
@@ -47,7 +53,7 @@ async def create_new_user(
 async def login_existing_user(
         username: str,
         password: str,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     User authentication.
@@ -60,17 +66,35 @@ async def login_existing_user(
     Returns:
     - Authenticated user information.
     """
-    user = login_user(db, username, password)
+    user = await login_user(db, username, password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return user
 
 
+@router.get("/users", response_model=Page[u], summary="Retrieve several users")
+async def retrieve_users(
+        ids: List[int] = Depends(required_ids),
+        current_user: User = Depends(get_current_user),  # Authorization check
+        loaders: Loaders = Depends(get_loaders)
+):
+    """
+    Retrieve several users by ID in one request, e.g. the authors of a page of comments.
+
+    - **ids**: Comma separated user ids; repeated ids are returned once.
+
+    Returns:
+    - The users that exist, in the requested order.
+    """
+    users = await loaders.users.load_many(ids)
+    return Page(items=[user for user in users if user is not None], next_cursor=None)
+
+
 @router.get("/users/{user_id}", response_model=u, summary="Retrieve user information")
 async def retrieve_user_info(
         user_id: int,
         current_user: User = Depends(get_current_user),  # Authorization check
-        db: Session = Depends(get_db)
+        loaders: Loaders = Depends(get_loaders)
 ):
     """
     Retrieve user information by ID.
@@ -80,7 +104,7 @@ async def retrieve_user_info(
     Returns:
     - Retrieved user information.
     """
-    user = await get_user_by_id(db, user_id)
+    user = await loaders.users.load(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -90,8 +114,8 @@ async def retrieve_user_info(
 async def update_user_info(
         user_id: int,
         user: UserCreate,
-        current_user: User = Depends(get_current_admin_user),  # Authorization check (admin)
-        db: Session = Depends(get_db)
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Update user information.
@@ -111,8 +135,8 @@ async def update_user_info(
 @router.delete("/users/{user_id}", summary="Delete user account")
 async def delete_user_account(
         user_id: int,
-        current_user: User = Depends(get_current_admin_user),  # Authorization check (admin)
-        db: Session = Depends(get_db)
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
 ):
     """
     Delete user account.
@@ -121,3 +145,56 @@ async def delete_user_account(
     """
     delet = await delete_user(db, user_id)
     return dict(message="User account deleted successfully", data=delet)
+
+
+@router.put("/users/{user_id}/roles/{role_name}", response_model=u, summary="Grant a role to a user")
+async def grant_user_role(
+        user_id: int,
+        role_name: str,
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Grant a role to a user.
+
+    - **user_id**: User's unique identifier.
+    - **role_name**: Name of the role to grant.
+
+    Returns:
+    - Updated user information.
+    """
+    role = await get_role_by_name(db, role_name)
+    if not role:
+        raise HTTPException(status_code=404, detail="Role not found")
+    if not await get_user_by_id(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    await assign_role_to_user(db, user_id, role.id)
+    db.expire_all()
+    return await get_user_by_id(db, user_id)
+
+
+@router.delete("/users/{user_id}/roles/{role_name}", response_model=u, summary="Revoke a role from a user")
+async def revoke_user_role(
+        user_id: int,
+        role_name: str,
+        current_user: User = Depends(require_role("admin")),  # Authorization check (admin)
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Revoke a role from a user.
+
+    - **user_id**: User's unique identifier.
+    - **role_name**: Name of the role to revoke.
+
+    Returns:
+    - Updated user information.
+    """
+    role = await get_role_by_name(db, role_name)
+    if not role:
+        raise HTTPException(status_code=404, detail="Role not found")
+    await remove_role_from_user(db, user_id, role.id)
+    db.expire_all()
+    user = await get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,17 @@
+# app/schemas/bulk.py
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the submitted array")
+    status: str = Field(..., description="created, invalid or skipped")
+    id: Optional[int] = Field(None, description="Identifier of the created record")
+    errors: Optional[List[str]] = Field(None, description="Why the item was not created")
+
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
@@ -1,7 +1,11 @@
 # app/models/community.py
 from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
+from app.api.schemas.images import ImageContent
+
 
 class CommentBase(BaseModel):
     text: str
@@ -22,6 +26,39 @@ class Comment(CommentBase):
         arbitrary_types_allowed = True
 
 
+class ReplyBase(BaseModel):
+    text: str
+    timestamp: datetime
+
+
+class ReplyCreate(ReplyBase):
+    pass
+
+
+class Reply(ReplyBase):
+    id: int
+    comment_id: int
+    user_id: int
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class Author(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+
+
+class ThreadReply(Reply):
+    author: Optional[Author] = None
+
+
+class CommentThread(Comment):
+    author: Optional[Author] = None
+    replies: List[ThreadReply] = []
+
+
 class ImageBase(BaseModel):
     image_url: str
     description: str
@@ -32,7 +69,7 @@ class ImageCreate(ImageBase):
     pass
 
 
-class Image(ImageBase):
+class Image(ImageBase, ImageContent):
     id: int
     user_id: int
     project_id: int
@@ -1,4 +1,45 @@
 # app/models/discrepancy.py
-from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
 
-# Define Pydantic models for discrepancies if needed
+from pydantic import BaseModel, Field
+
+
+class ProjectDiscrepancy(BaseModel):
+    project_id: int
+    budget: Optional[float] = Field(None, description="Project budget, null if not set")
+    total_agreed: float = Field(..., description="Sum of all agreement amounts")
+    total_paid: float = Field(..., description="Sum of all payments recorded through receipts")
+    agreement_count: int
+    payment_count: int
+    overspend_amount: float = Field(..., description="Amount paid beyond the budget")
+    overspent: bool = Field(..., description="Payments exceed the budget")
+    agreements_over_budget: bool = Field(..., description="Agreements exceed the budget")
+    payments_outside_agreements: int = Field(..., description="Payments dated outside every agreement window")
+    flagged: bool = Field(..., description="At least one discrepancy was found")
+
+
+class DiscrepancyReport(BaseModel):
+    projects_scanned: int
+    projects_flagged: int
+    elapsed_ms: float
+    discrepancies: List[ProjectDiscrepancy]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class FinancialSummary(BaseModel):
+    project_id: int
+    total_agreed: float
+    total_paid: float
+    agreement_count: int
+    payment_count: int
+    last_payment_date: Optional[datetime] = None
+    payments_outside_agreements: int
+    overspent: bool
+    agreements_over_budget: bool
+    flagged: bool
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
@@ -0,0 +1,54 @@
+# app/schemas/finance.py
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AgreementBase(BaseModel):
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    amount: float
+
+
+class AgreementCreate(AgreementBase):
+    pass
+
+
+class Agreement(AgreementBase):
+    id: int
+    project_id: int
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class PaymentBase(BaseModel):
+    payment_method: str
+    payment_date: datetime
+    amount: float
+
+
+class PaymentCreate(PaymentBase):
+    description: Optional[str] = None
+
+
+class Payment(PaymentBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class Receipt(BaseModel):
+    id: int
+    project_id: int
+    payment_id: int
+    description: Optional[str] = None
+    payments: Payment
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
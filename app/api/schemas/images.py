@@ -1,5 +1,35 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from datetime import datetime
+from typing import Optional
+
+
+class ImageContent(BaseModel):
+    """
+    Uploaded content and generated derivatives; empty for images that only reference an external URL.
+    """
+    image_url: str
+    content_hash: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    # pending, ready or failed
+    derivatives_status: Optional[str] = None
+    thumbnail_width: Optional[int] = None
+    thumbnail_height: Optional[int] = None
+    medium_width: Optional[int] = None
+    medium_height: Optional[int] = None
+
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        return f"{self.image_url}?variant=thumbnail" if self.thumbnail_width else None
+
+    @computed_field
+    @property
+    def medium_url(self) -> Optional[str]:
+        return f"{self.image_url}?variant=medium" if self.medium_width else None
+
 
 class ImageBase(BaseModel):
     image_url: str
@@ -8,7 +38,7 @@ class ImageBase(BaseModel):
 class ImageCreate(ImageBase):
     pass
 
-class Image(ImageBase):
+class Image(ImageBase, ImageContent):
     id: int
     user_id: int
     project_id: int
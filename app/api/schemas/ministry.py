@@ -0,0 +1,26 @@
+# app/schemas/ministry.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class MinistryTotals(BaseModel):
+    project_count: int = 0
+    total_budget: float = 0.0
+    total_agreed: float = 0.0
+    total_paid: float = 0.0
+
+
+class MinistryStatusSummary(MinistryTotals):
+    status: str
+
+    class Config:
+        from_attributes = True
+
+
+class MinistrySummary(MinistryTotals):
+    ministry_id: int
+    by_status: List[MinistryStatusSummary]
+    # Most recent change to any of the ministry's totals
+    updated_at: Optional[datetime] = None
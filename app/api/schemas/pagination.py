@@ -0,0 +1,11 @@
+# app/schemas/pagination.py
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T] = Field(..., description="Items on this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
@@ -1,7 +1,12 @@
 # app/schemas/project.py
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+
+from app.api.schemas.community import Comment, Image
+from app.api.schemas.contract import Contract
+from app.api.schemas.finance import Agreement, Receipt
+from app.api.schemas.user import User
 
 
 class ProjectBase(BaseModel):
@@ -12,6 +17,7 @@ class ProjectBase(BaseModel):
     budget: float
     status: str
     user_id: int
+    ministry_id: Optional[int] = None
 
 
 class ProjectCreate(ProjectBase):
@@ -24,3 +30,38 @@ class Project(ProjectBase):
     class Config:
         from_attributes = True
         arbitrary_types_allowed = True
+
+
+class Ministry(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    contact_info: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class Published(BaseModel):
+    id: int
+    project_id: int
+    timestamp: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class ProjectDetail(Project):
+    # Only the relationships requested with `include=` are filled in; the others stay null
+    owner: Optional[User] = None
+    ministry: Optional[Ministry] = None
+    contractors: Optional[List[User]] = None
+    ministry_contact_officers: Optional[List[User]] = None
+    comments: Optional[List[Comment]] = None
+    images: Optional[List[Image]] = None
+    agreements: Optional[List[Agreement]] = None
+    receipts: Optional[List[Receipt]] = None
+    contracts: Optional[List[Contract]] = None
+    published: Optional[List[Published]] = None
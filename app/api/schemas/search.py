@@ -0,0 +1,11 @@
+# app/schemas/search.py
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchResult(BaseModel):
+    kind: str = Field(..., description="project, comment, reply or contract")
+    id: int
+    project_id: Optional[int] = Field(None, description="Project the record belongs to")
+    score: float = Field(..., description="Relevance; higher is better")
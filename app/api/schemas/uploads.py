@@ -0,0 +1,27 @@
+# app/schemas/uploads.py
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    project_id: int
+    content_type: str = Field(..., pattern=r"^image/[\w.+-]+$", max_length=100)
+    size: int = Field(..., gt=0, description="Total size of the file in bytes")
+    description: str = Field("", max_length=200)
+
+
+class UploadSession(BaseModel):
+    id: str
+    project_id: int
+    content_type: str
+    size: int
+    description: Optional[str] = None
+    offset: int = Field(0, description="Bytes received so far; the next chunk starts here")
+    created_at: datetime
+    expires_at: datetime
+    image_id: Optional[int] = Field(None, description="Image created when the upload was completed")
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,16 @@
+from typing import List
+
 from pydantic import BaseModel, EmailStr, Field
 
 
+class Role(BaseModel):
+    id: int = Field(..., description="Role's unique identifier")
+    name: str = Field(..., description="Role name (e.g., admin, contractor)")
+
+    class Config:
+        from_attributes = True
+
+
 class UserBase(BaseModel):
     email: EmailStr = Field(..., description="Email address")
     full_name: str = Field(..., description="Full name")
@@ -19,7 +29,7 @@ class UserUpdate(BaseModel):
 
 class User(UserBase):
     id: int = Field(..., description="User's unique identifier")
-    roles: list = Field([], description="List of roles (e.g., Admin, Contractor, Community Member, etc.)")
+    roles: List[Role] = Field([], description="List of roles (e.g., Admin, Contractor, Community Member, etc.)")
 
     class Config:
         from_attributes = True
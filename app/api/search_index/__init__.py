@@ -0,0 +1,83 @@
+# app/search_index/__init__.py
+# Keyword search over projects, comments, replies and contracts; the backend is chosen with SEARCH_BACKEND
+import asyncio
+import logging
+import os
+
+import dotenv
+
+from app.api.database.base import AsyncSessionLocal
+from app.api.search_index.base import SEARCH_FIELDS, SearchBackend, SearchHit
+from app.api.search_index.database import DatabaseSearchBackend
+from app.api.search_index.memory import MemorySearchBackend
+
+logger = logging.getLogger(__name__)
+
+# load the .env file
+dotenv.load_dotenv()
+# database (PostgreSQL or MySQL full-text search, shared by every worker) or memory (in-process inverted index,
+# for a single worker)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "database")
+
+# Backend name to factory; register other backends (external search services, ...) here
+SEARCH_BACKENDS = {
+    "memory": MemorySearchBackend,
+    "database": DatabaseSearchBackend,
+}
+
+if SEARCH_BACKEND not in SEARCH_BACKENDS:
+    raise ValueError(f"Unknown SEARCH_BACKEND '{SEARCH_BACKEND}'")
+search_backend = SEARCH_BACKENDS[SEARCH_BACKEND]()
+
+
+def index_project(project):
+    search_backend.index("project", project.id, project.id,
+                         {"name": project.name, "status": project.status, "description": project.description})
+
+
+def index_comment(comment):
+    search_backend.index("comment", comment.id, comment.project_id, {"text": comment.text})
+
+
+def index_reply(reply, project_id: int):
+    search_backend.index("reply", reply.id, project_id, {"text": reply.text})
+
+
+def index_contract(contract):
+    search_backend.index("contract", contract.id, contract.project_id,
+                         {"name": contract.name, "details": contract.details})
+
+
+async def rebuild_search_index():
+    """
+    Fill the index from the database, for backends that keep their own.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await search_backend.rebuild(db)
+    except Exception:
+        logger.exception("Could not build the search index")
+
+
+_index_build = None
+
+
+def start_search_index_build():
+    """
+    Build the index in the background, for backends that keep their own, so the worker serves requests
+    meanwhile; searches made before the build finishes only see part of the records.
+    """
+    global _index_build
+    if search_backend.keeps_index and _index_build is None:
+        _index_build = asyncio.get_running_loop().create_task(rebuild_search_index())
+
+
+async def stop_search_index_build():
+    global _index_build
+    if _index_build is not None:
+        _index_build.cancel()
+        try:
+            await _index_build
+        except asyncio.CancelledError:
+            pass
+        _index_build = None
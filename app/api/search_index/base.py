@@ -0,0 +1,70 @@
+# app/search_index/base.py
+# Interface every search backend implements, and the documents they index
+from typing import NamedTuple, Optional
+
+# Searchable kinds of records, each with its indexed fields and their weight in the ranking
+SEARCH_FIELDS = {
+    "project": {"name": 3.0, "status": 2.0, "description": 1.0},
+    "comment": {"text": 1.0},
+    "reply": {"text": 1.0},
+    "contract": {"name": 3.0, "details": 1.0},
+}
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    id: int
+    # Project the record belongs to; the project itself for kind "project"
+    project_id: Optional[int]
+    score: float
+
+
+class SearchBackend:
+    """
+    Keyword search over projects, comments, comment replies and contracts.
+
+    Backends that keep their own index are told about every created, updated and deleted record by the
+    write queries; backends that search the database directly ignore those calls.
+    """
+
+    # Whether the backend keeps an index of its own, which has to be built with `rebuild` at startup
+    keeps_index = False
+
+    async def search(self, db, query: str, kinds=None, project_id: int = None, offset: int = 0,
+                     limit: int = 20):
+        """
+        Find the records matching every keyword of a query, best match first.
+
+        Args:
+            - db (AsyncSession): Database session, for backends that search the database.
+            - query (str): Keywords.
+            - kinds (Iterable[str]): Restrict the search to these kinds; all kinds when None.
+            - project_id (int): Restrict the search to records of this project.
+            - offset (int): Number of hits to skip.
+            - limit (int): Number of hits to return.
+
+        Returns:
+            - List[SearchHit]: Up to `limit` hits. No total is computed: counting every match of a common
+              keyword would cost more than ranking the page.
+        """
+        raise NotImplementedError
+
+    def index(self, kind: str, doc_id: int, project_id: Optional[int], fields: dict):
+        """
+        Add a record to the index, replacing its previous version.
+        """
+
+    def remove(self, kind: str, doc_id: int):
+        """
+        Remove a record from the index.
+        """
+
+    def remove_project(self, project_id: int):
+        """
+        Remove a project and every record belonging to it from the index.
+        """
+
+    async def rebuild(self, db):
+        """
+        Index every searchable record from scratch.
+        """
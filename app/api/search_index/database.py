@@ -0,0 +1,117 @@
+# app/search_index/database.py
+# Search backend running full-text search in the database over the tables themselves
+from sqlalchemy import and_, func, literal, literal_column, or_, select, union_all
+from sqlalchemy.dialects.mysql import match
+
+from app.api.database.models import Comment, CommentReply, Contract, Project
+from app.api.search_index.base import SearchBackend, SearchHit
+from app.api.search_index.memory import tokenize
+
+# Documents must be built exactly like the expressions of the GIN indexes created by migration 0007, or the
+# planner cannot use the indexes; constants are therefore inlined rather than sent as bound parameters
+TEXT_SEARCH_CONFIG = literal_column("'english'::regconfig")
+EMPTY = literal_column("''")
+SPACE = literal_column("' '")
+
+# Searched columns of each kind, in the order of the FULLTEXT indexes created by migration 0012 on MySQL
+SEARCH_COLUMNS = {
+    "project": (Project.name, Project.status, Project.description),
+    "comment": (Comment.text,),
+    "reply": (CommentReply.text,),
+    "contract": (Contract.name, Contract.details),
+}
+
+
+def document(*columns):
+    text = func.coalesce(columns[0], EMPTY)
+    for column in columns[1:]:
+        text = text.op("||")(SPACE).op("||")(func.coalesce(column, EMPTY))
+    return func.to_tsvector(TEXT_SEARCH_CONFIG, text)
+
+
+def postgresql_matcher(query: str):
+    tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+
+    def matcher(columns):
+        vector = document(*columns)
+        return vector.op("@@")(tsquery), func.ts_rank_cd(vector, tsquery)
+
+    return matcher
+
+
+def mysql_matcher(query: str):
+    # Boolean mode with every keyword required, like the other backends
+    keywords = " ".join(f"+{term}" for term in tokenize(query))
+
+    def matcher(columns):
+        relevance = match(*columns, against=keywords).in_boolean_mode()
+        return relevance, relevance
+
+    return matcher
+
+
+def substring_matcher(query: str):
+    terms = tokenize(query)
+
+    def matcher(columns):
+        condition = and_(*(or_(*(column.ilike(f"%{term}%") for column in columns)) for term in terms))
+        return condition, literal(1.0)
+
+    return matcher
+
+
+# Dialect name to the builder of its (match condition, score) expressions; other databases fall back to an
+# unindexed substring scan, which is only good enough for development
+MATCHERS = {
+    "postgresql": postgresql_matcher,
+    "mysql": mysql_matcher,
+}
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """
+    Full-text search run by the database, backed by an index on each searched table: expression GIN
+    indexes on PostgreSQL (migration 0007) and FULLTEXT indexes on MySQL (migration 0012).
+
+    The index is maintained by the database in the same transaction as the write, so every worker sees
+    every change at once and there is nothing to update or rebuild from the application. On PostgreSQL
+    keywords are stemmed and combined with websearch syntax ("quoted phrases", -excluded, or); on MySQL
+    records must contain every keyword and are ranked by InnoDB's relevance.
+    """
+
+    async def search(self, db, query, kinds=None, project_id=None, offset=0, limit=20):
+        if not tokenize(query):
+            return []
+        matcher = MATCHERS.get(db.bind.dialect.name, substring_matcher)(query)
+        joins = {"reply": (Comment, Comment.id == CommentReply.comment_id)}
+        keys = {
+            "project": (Project.id, Project.id),
+            "comment": (Comment.id, Comment.project_id),
+            "reply": (CommentReply.id, Comment.project_id),
+            "contract": (Contract.id, Contract.project_id),
+        }
+        selects = []
+        for kind, columns in SEARCH_COLUMNS.items():
+            if kinds is not None and kind not in kinds:
+                continue
+            doc_id, doc_project_id = keys[kind]
+            condition, score = matcher(columns)
+            stmt = select(literal(kind).label("kind"), doc_id.label("id"), doc_project_id.label("project_id"),
+                          score.label("score"))
+            if kind in joins:
+                stmt = stmt.join(*joins[kind])
+            stmt = stmt.filter(condition)
+            if project_id is not None:
+                stmt = stmt.filter(doc_project_id == project_id)
+            selects.append(stmt)
+        if not selects:
+            return []
+
+        matches = union_all(*selects).subquery()
+        result = await db.execute(
+            select(matches).
+            order_by(matches.c.score.desc(), matches.c.kind, matches.c.id).
+            offset(offset).
+            limit(limit)
+        )
+        return [SearchHit(row.kind, row.id, row.project_id, round(row.score, 4)) for row in result]
@@ -0,0 +1,210 @@
+# app/search_index/memory.py
+# Search backend keeping an inverted index in process memory, ranked with BM25
+import bisect
+import heapq
+import math
+import re
+
+from sqlalchemy import select
+
+from app.api.database.models import Comment, CommentReply, Contract, Project
+from app.api.search_index.base import SEARCH_FIELDS, SearchBackend, SearchHit
+
+TOKEN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this to was were will with".split()
+)
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Document length BM25 normalizes against until the index is first built
+DEFAULT_AVERAGE_LENGTH = 10.0
+# Queries whose rarest keyword is in fewer documents than this score every match; the others walk the
+# keywords' documents in order of impact and stop once no unseen document can make the page
+EXHAUSTIVE_SEARCH_LIMIT = 1000
+# Rows fetched per round-trip while rebuilding
+REBUILD_BATCH_SIZE = 5000
+
+
+def tokenize(text: str):
+    return [token for token in TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+class MemorySearchBackend(SearchBackend):
+    """
+    Inverted index from each term to the documents containing it, ranked with BM25.
+
+    A query intersects the posting lists of its keywords starting from the rarest. When that keyword is rare
+    every match is scored. For common keywords each term also keeps its documents sorted by impact (the
+    BM25 weight of the term in the document), built at startup or on first use and then maintained on every
+    update; the query reads the sorted lists in step and stops as soon as the page is full and no document
+    further down could score higher (the threshold algorithm). Either way a query costs a fraction of the matches, not of
+    the index.
+
+    Document lengths are normalized against the average length at the last rebuild, so impacts stay valid
+    as documents come and go.
+
+    Every worker process holds its own index, built from the database in the background at startup; writes
+    served by another worker reach it on the next restart. Only suited to a single worker, such as a
+    development server; deployments use the database backend.
+    """
+
+    keeps_index = True
+
+    def __init__(self):
+        self._clear()
+        self._average_length = DEFAULT_AVERAGE_LENGTH
+
+    def _clear(self):
+        # Documents are numbered internally; _docs maps a number to (kind, id, project_id, length)
+        self._next_doc = 0
+        self._docs = {}
+        self._keys = {}
+        self._terms = {}
+        # term -> {doc: weighted term frequency}
+        self._postings = {}
+        # term -> [(-impact, doc)] sorted, for the terms a query has needed them for
+        self._ranked = {}
+        self._by_project = {}
+
+    def _impact(self, frequency: float, length: float):
+        return frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / self._average_length))
+
+    def _ranked_postings(self, term: str):
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            ranked = sorted((-self._impact(frequency, self._docs[doc][3]), doc)
+                            for doc, frequency in self._postings[term].items())
+            self._ranked[term] = ranked
+        return ranked
+
+    def index(self, kind, doc_id, project_id, fields):
+        self.remove(kind, doc_id)
+        frequencies = {}
+        for field, weight in SEARCH_FIELDS[kind].items():
+            for token in tokenize(fields.get(field) or ""):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        if not frequencies:
+            return
+        doc = self._next_doc
+        self._next_doc += 1
+        length = sum(frequencies.values())
+        self._docs[doc] = (kind, doc_id, project_id, length)
+        self._keys[(kind, doc_id)] = doc
+        self._terms[doc] = tuple(frequencies)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc] = frequency
+            ranked = self._ranked.get(term)
+            if ranked is not None:
+                bisect.insort(ranked, (-self._impact(frequency, length), doc))
+        if project_id is not None:
+            self._by_project.setdefault(project_id, set()).add(doc)
+
+    def remove(self, kind, doc_id):
+        doc = self._keys.pop((kind, doc_id), None)
+        if doc is None:
+            return
+        _, _, project_id, length = self._docs[doc]
+        for term in self._terms.pop(doc):
+            postings = self._postings[term]
+            frequency = postings.pop(doc)
+            ranked = self._ranked.get(term)
+            if not postings:
+                del self._postings[term]
+                self._ranked.pop(term, None)
+            elif ranked is not None:
+                del ranked[bisect.bisect_left(ranked, (-self._impact(frequency, length), doc))]
+        del self._docs[doc]
+        documents = self._by_project.get(project_id)
+        if documents is not None:
+            documents.discard(doc)
+            if not documents:
+                del self._by_project[project_id]
+
+    def remove_project(self, project_id):
+        for doc in list(self._by_project.get(project_id, ())):
+            kind, doc_id, _, _ = self._docs[doc]
+            self.remove(kind, doc_id)
+        self.remove("project", project_id)
+
+    async def search(self, db, query, kinds=None, project_id=None, offset=0, limit=20):
+        terms = sorted(set(tokenize(query)), key=lambda term: len(self._postings.get(term, ())))
+        if not terms or terms[0] not in self._postings:
+            return []
+        postings = [self._postings[term] for term in terms]
+        count = len(self._docs)
+        weights = [math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+        kinds = set(kinds) if kinds is not None else None
+
+        def accept(doc):
+            kind, _, doc_project_id, _ = self._docs[doc]
+            return (kinds is None or kind in kinds) and (project_id is None or doc_project_id == project_id)
+
+        def score(doc):
+            length = self._docs[doc][3]
+            return sum(weight * self._impact(p[doc], length) for weight, p in zip(weights, postings))
+
+        wanted = offset + limit
+        scope = self._by_project.get(project_id, ()) if project_id is not None else None
+        if len(postings[0]) < EXHAUSTIVE_SEARCH_LIMIT or (scope is not None and len(scope) < len(postings[0])):
+            candidates = scope if scope is not None and len(scope) < len(postings[0]) else postings[0]
+            matches = (doc for doc in candidates if all(doc in p for p in postings) and accept(doc))
+            ranked = heapq.nlargest(wanted, ((score(doc), -doc) for doc in matches))
+        else:
+            ranked = self._top_by_impact(terms, weights, postings, accept, score, wanted)
+
+        hits = []
+        for value, doc in ranked[offset:]:
+            kind, doc_id, doc_project_id, _ = self._docs[-doc]
+            hits.append(SearchHit(kind, doc_id, doc_project_id, round(value, 4)))
+        return hits
+
+    def _top_by_impact(self, terms, weights, postings, accept, score, wanted):
+        """
+        Threshold algorithm: read every term's impact-sorted documents in step, score each new document fully,
+        and stop once the best `wanted` scores are at least what any document not yet read could reach.
+        """
+        lists = [self._ranked_postings(term) for term in terms]
+        heap = []
+        seen = set()
+        depth = 0
+        while all(depth < len(ranked) for ranked in lists):
+            threshold = 0.0
+            for weight, ranked in zip(weights, lists):
+                negative_impact, doc = ranked[depth]
+                threshold -= weight * negative_impact
+                if doc in seen:
+                    continue
+                seen.add(doc)
+                if all(doc in p for p in postings) and accept(doc):
+                    entry = (score(doc), -doc)
+                    if len(heap) < wanted:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+            if len(heap) == wanted and heap[0][0] >= threshold:
+                break
+            depth += 1
+        return sorted(heap, reverse=True)
+
+    async def rebuild(self, db):
+        self._clear()
+        sources = [
+            ("project", select(Project.id, Project.id, Project.name, Project.status, Project.description)),
+            ("comment", select(Comment.id, Comment.project_id, Comment.text)),
+            ("reply", select(CommentReply.id, Comment.project_id, CommentReply.text).
+             join(Comment, Comment.id == CommentReply.comment_id)),
+            ("contract", select(Contract.id, Contract.project_id, Contract.name, Contract.details)),
+        ]
+        for kind, stmt in sources:
+            result = await db.stream(stmt.execution_options(yield_per=REBUILD_BATCH_SIZE))
+            async for partition in result.partitions():
+                for doc_id, project_id, *values in partition:
+                    self.index(kind, doc_id, project_id, dict(zip(SEARCH_FIELDS[kind], values)))
+        if self._docs:
+            self._average_length = sum(doc[3] for doc in self._docs.values()) / len(self._docs)
+        # Sort the common terms now rather than in the first request that needs them
+        self._ranked.clear()
+        for term, postings in self._postings.items():
+            if len(postings) >= EXHAUSTIVE_SEARCH_LIMIT:
+                self._ranked_postings(term)
@@ -5,24 +5,34 @@ import dotenv
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from jwt import decode, ExpiredSignatureError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import Depends, HTTPException
 
 from app.api.database.dependency.db_instance import get_db
 from app.api.database.models import User
+from app.api.security.token_cache import token_cache, UserPrincipal
 # load the .env file
 dotenv.load_dotenv()
 SECRET_KEY = os.getenv("SECRETE_KEY")
+# bcrypt cost factor; every +1 doubles the CPU time of a hash
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 # Password hashing
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 
+# These are CPU bound; async callers should use app.api.security.hashing instead
 def verify_password(plain_password, hashed_password):
-    return password_context.verify(plain_password, hashed_password)
+    try:
+        return password_context.verify(plain_password, hashed_password)
+    except ValueError:
+        # Stored value is not a valid bcrypt hash
+        return False
 
 
 def get_password_hash(password):
-    return password_context.hash(password)[:6]
+    return password_context.hash(password)
 
 
 # Define a function to generate JWT tokens for users
@@ -43,23 +53,36 @@ def create_access_token(data: dict, secret_key: str, algorithm: str = "HS256"):
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-# Define a function to get the current user based on the JWT token
-def get_current_user(token: str = Depends(oauth2_scheme), db_session: Session = Depends(get_db)):
+def check_active(principal: UserPrincipal):
+    if not principal.active:
+        raise HTTPException(status_code=401, detail="User is inactive")
+    return principal
+
+
+# Define a function to get the current user based on the JWT token.
+# Verified tokens are cached, so the common case costs neither a signature check nor a query.
+async def get_current_user(token: str = Depends(oauth2_scheme), db_session: AsyncSession = Depends(get_db)):
+    principal = token_cache.get(token)
+    if principal is not None:
+        return check_active(principal)
     try:
         payload = decode(token, SECRET_KEY, algorithms=["HS256"])
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=401, detail="Could not validate credentials")
-        user = db_session.query(User).filter(User.username == username).first()
+        result = await db_session.execute(
+            select(User).filter(User.email == username).options(selectinload(User.roles))
+        )
+        user = result.scalars().first()
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
+        principal = UserPrincipal(
+            id=user.id,
+            email=user.email,
+            role_ids=tuple(role.id for role in user.roles),
+            active=bool(user.active),
+        )
+        token_cache.set(token, principal, payload.get("exp"))
+        return check_active(principal)
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-
-
-# Define a function to get the current admin user based on the JWT token
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
-    if not current_user.is_admin:
-        raise HTTPException(status_code=403, detail="User is not authorized to perform this action")
-    return current_user
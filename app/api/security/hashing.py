@@ -0,0 +1,75 @@
+# app/security/hashing.py
+# Runs bcrypt hashing and verification on a bounded worker pool so the event loop never blocks on it
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import dotenv
+from fastapi import HTTPException
+
+from app.api.security.auth import get_password_hash, verify_password
+
+# load the .env file
+dotenv.load_dotenv()
+# bcrypt releases the GIL while hashing, so a thread per core gives real parallelism
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Number of hash jobs allowed to wait for a free worker before new ones are rejected with a 429
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", str(PASSWORD_HASH_WORKERS * 4)))
+
+
+class HashingPool:
+    """
+    Bounded executor for password hashing with back-pressure.
+
+    At most `workers` jobs run at once and at most `queue_depth` more wait for a slot; any job beyond that
+    is rejected immediately instead of growing an unbounded backlog of CPU work.
+    """
+
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def run(self, func, *args):
+        if self.in_flight >= self.workers + self.queue_depth:
+            raise HTTPException(status_code=429, detail="Too many authentication requests, retry shortly",
+                                headers={"Retry-After": "1"})
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_DEPTH)
+
+
+async def get_password_hash_async(password: str):
+    """
+    Hash a password on the hashing pool.
+
+    Args:
+        - password (str): Plain text password.
+
+    Returns:
+        - str: bcrypt hash of the password.
+    """
+    return await hashing_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    """
+    Verify a password against its hash on the hashing pool.
+
+    Args:
+        - plain_password (str): Password supplied by the user.
+        - hashed_password (str): Stored bcrypt hash.
+
+    Returns:
+        - bool: True if the password matches.
+    """
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
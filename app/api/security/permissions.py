@@ -0,0 +1,157 @@
+# app/security/permissions.py
+# In-process role and permission resolution backed by the roles / user_roles tables
+import asyncio
+import os
+import time
+from enum import IntFlag
+
+import dotenv
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.dependency.db_instance import get_db
+from app.api.database.models import Role
+from app.api.security.auth import get_current_user
+from app.api.security.token_cache import UserPrincipal
+
+# load the .env file
+dotenv.load_dotenv()
+# Seconds the roles table is served from memory before it is reloaded, so roles changed through another worker
+# reach this one
+PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", "60"))
+
+
+class Permission(IntFlag):
+    NONE = 0
+    READ = 1
+    COMMENT = 2
+    UPLOAD_IMAGES = 4
+    CREATE_PROJECTS = 8
+    MANAGE_PROJECTS = 16
+    MANAGE_CONTRACTS = 32
+    MANAGE_USERS = 64
+    MANAGE_ROLES = 128
+    ALL = 255
+
+
+# Permission bitmask granted by each role name; roles not listed here grant nothing beyond their name
+ROLE_PERMISSIONS = {
+    "admin": Permission.ALL,
+    "ministry_contact_officer": Permission.READ | Permission.COMMENT | Permission.CREATE_PROJECTS
+    | Permission.MANAGE_CONTRACTS,
+    "contractor": Permission.READ | Permission.COMMENT | Permission.UPLOAD_IMAGES,
+    "community_member": Permission.READ | Permission.COMMENT | Permission.UPLOAD_IMAGES,
+}
+
+
+class PermissionCache:
+    """
+    Precomputed role names and permission bitmasks.
+
+    The roles table is small and changes rarely, so it is held in memory together with the bitmask of every
+    role. Each user's resolved role set is memoized against the cache version; any change to the roles table
+    bumps the version, which invalidates every memoized entry at once and reloads the table on next use.
+    The version only covers changes made by this worker, so the table is also reloaded once it is `ttl`
+    seconds old.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self._loaded_version = None
+        self._expires_at = 0.0
+        self._roles = {}
+        self._users = {}
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.version += 1
+
+    def _is_current(self):
+        return self._loaded_version == self.version and time.monotonic() < self._expires_at
+
+    async def _ensure_loaded(self, db: AsyncSession):
+        if self._is_current():
+            return
+        async with self._lock:
+            if self._is_current():
+                return
+            version = self.version
+            result = await db.execute(select(Role.id, Role.name))
+            self._roles = {
+                role_id: (name, ROLE_PERMISSIONS.get(name, Permission.NONE)) for role_id, name in result.all()
+            }
+            self._users = {}
+            self._loaded_version = version
+            self._expires_at = time.monotonic() + self.ttl
+
+    async def resolve(self, db: AsyncSession, principal: UserPrincipal):
+        """
+        Resolve a principal's role names and combined permission bitmask.
+
+        Args:
+            - db (AsyncSession): Database session, only used when the roles table has to be (re)loaded.
+            - principal (UserPrincipal): Authenticated user.
+
+        Returns:
+            - tuple: (frozenset of role names, Permission bitmask).
+        """
+        await self._ensure_loaded(db)
+        entry = self._users.get(principal.id)
+        if entry is not None and entry[0] == principal.role_ids:
+            return entry[1], entry[2]
+        names = set()
+        mask = Permission.NONE
+        for role_id in principal.role_ids:
+            role = self._roles.get(role_id)
+            if role is not None:
+                names.add(role[0])
+                mask |= role[1]
+        entry = (principal.role_ids, frozenset(names), mask)
+        self._users[principal.id] = entry
+        return entry[1], entry[2]
+
+
+permission_cache = PermissionCache(PERMISSION_CACHE_TTL)
+
+
+def require_role(*role_names: str):
+    """
+    Build a dependency that only lets users holding one of the given roles through.
+
+    Args:
+        - role_names (str): Accepted role names.
+
+    Returns:
+        - Callable: FastAPI dependency returning the current UserPrincipal.
+    """
+    accepted = frozenset(role_names)
+
+    async def dependency(current_user: UserPrincipal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+        names, _ = await permission_cache.resolve(db, current_user)
+        if names.isdisjoint(accepted):
+            raise HTTPException(status_code=403, detail="User is not authorized to perform this action")
+        return current_user
+
+    return dependency
+
+
+def require_permission(permission: Permission):
+    """
+    Build a dependency that checks the current user's permission bitmask.
+
+    Args:
+        - permission (Permission): Permission bits that must all be granted.
+
+    Returns:
+        - Callable: FastAPI dependency returning the current UserPrincipal.
+    """
+
+    async def dependency(current_user: UserPrincipal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+        _, mask = await permission_cache.resolve(db, current_user)
+        if mask & permission != permission:
+            raise HTTPException(status_code=403, detail="User is not authorized to perform this action")
+        return current_user
+
+    return dependency
@@ -0,0 +1,87 @@
+# app/security/token_cache.py
+# Bounded TTL/LRU cache of verified JWTs, so authenticated requests do not hit the users table
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+import dotenv
+
+# load the .env file
+dotenv.load_dotenv()
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Seconds a verified principal is reused, however long the token stays valid; a role or active flag changed
+# through another worker reaches this one after at most this long
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))
+
+
+class UserPrincipal(NamedTuple):
+    """
+    Compact, immutable view of the authenticated user resolved from a token.
+    """
+    id: int
+    email: str
+    role_ids: Tuple[int, ...]
+    active: bool
+
+
+class TokenCache:
+    """
+    LRU cache mapping a verified token to its principal.
+
+    Entries expire after `ttl` seconds or when the token itself expires, whichever comes first, and all
+    entries belonging to a user can be dropped at once when that user changes.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tokens_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(self, token: str, principal: UserPrincipal, token_expires_at: float = None):
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (principal, expires_at)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str):
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
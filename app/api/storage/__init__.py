@@ -0,0 +1,38 @@
+# app/storage/__init__.py
+# Storage for uploaded image bytes; the backend is chosen with STORAGE_BACKEND
+import os
+
+import dotenv
+
+from app.api.storage.base import Storage, StoredObject, StorageError, UploadBusy, UploadOffsetMismatch, \
+    UploadTooLarge
+from app.api.storage.local import LocalFileStorage
+
+# load the .env file
+dotenv.load_dotenv()
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_ROOT = os.getenv("STORAGE_ROOT", "storage")
+MAX_IMAGE_UPLOAD_BYTES = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+# Resumable uploads are meant for large site media sent over unreliable connections
+MAX_RESUMABLE_UPLOAD_BYTES = int(os.getenv("MAX_RESUMABLE_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# Unfinished resumable uploads are discarded this many hours after they were started
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
+# Backend name to factory; register other backends (object stores, ...) here
+STORAGE_BACKENDS = {
+    "local": lambda: LocalFileStorage(STORAGE_ROOT),
+}
+
+_storage = None
+
+
+def get_storage() -> Storage:
+    """
+    The configured storage backend, created on first use so importing the app does not touch the disk.
+    """
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND not in STORAGE_BACKENDS:
+            raise StorageError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'")
+        _storage = STORAGE_BACKENDS[STORAGE_BACKEND]()
+    return _storage
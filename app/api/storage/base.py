@@ -0,0 +1,121 @@
+# app/storage/base.py
+# Interface every storage backend for uploaded files implements
+from typing import AsyncIterator, NamedTuple, Optional, Tuple
+
+
+class StorageError(Exception):
+    """
+    Raised when a backend cannot store or read an object.
+    """
+
+
+class UploadTooLarge(StorageError):
+    """
+    Raised while saving a stream that grows beyond the allowed size; nothing is kept.
+    """
+
+
+class UploadOffsetMismatch(StorageError):
+    """
+    Raised when a chunk of a resumable upload does not start where the received bytes end.
+    """
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload continues at byte {offset}")
+        self.offset = offset
+
+
+class UploadBusy(StorageError):
+    """
+    Raised when another request is already writing to the same resumable upload.
+    """
+
+
+class StoredObject(NamedTuple):
+    """
+    A stored file, addressed by the SHA-256 of its content.
+    """
+    digest: str
+    size: int
+    # False when an identical file was already stored and the upload was discarded
+    created: bool
+
+
+class Storage:
+    """
+    Content-addressed storage: files are written once per distinct content and looked up by their SHA-256.
+    """
+
+    async def save(self, chunks: AsyncIterator[bytes], max_size: int = None) -> StoredObject:
+        """
+        Store a stream chunk by chunk, hashing it on the way.
+
+        Args:
+            - chunks (AsyncIterator[bytes]): File content.
+            - max_size (int): Abort with UploadTooLarge once more bytes than this have been received.
+
+        Returns:
+            - StoredObject: Digest and size of the content; identical content is stored only once.
+        """
+        raise NotImplementedError
+
+    def local_path(self, digest: str) -> Optional[str]:
+        """
+        Filesystem path of an object, for backends that keep files on local disk so they can be served with
+        a zero-copy file response; None otherwise.
+        """
+        return None
+
+    async def open(self, digest: str) -> AsyncIterator[bytes]:
+        """
+        Stream an object's content.
+        """
+        raise NotImplementedError
+
+    async def append_part(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes],
+                          max_size: int = None) -> int:
+        """
+        Append a chunk to the partial file of a resumable upload, streaming it to disk.
+
+        Bytes received before the stream breaks off are kept, so the client can resume from wherever the
+        connection dropped.
+
+        Args:
+            - upload_id (str): Upload session id.
+            - offset (int): Where the chunk starts; raises UploadOffsetMismatch unless it is the current size.
+            - chunks (AsyncIterator[bytes]): Chunk content.
+            - max_size (int): Abort with UploadTooLarge, discarding the chunk, once more bytes than this have
+              been received.
+
+        Returns:
+            - int: Size of the partial file after the append.
+        """
+        raise NotImplementedError
+
+    async def part_size(self, upload_id: str) -> int:
+        """
+        Number of bytes received so far for a resumable upload.
+        """
+        raise NotImplementedError
+
+    async def digest_part(self, upload_id: str) -> Tuple[str, int]:
+        """
+        SHA-256 and size of a completed partial file; raises FileNotFoundError if there is none.
+        """
+        raise NotImplementedError
+
+    async def commit_part(self, upload_id: str, digest: str, size: int) -> StoredObject:
+        """
+        Add a completed partial file, hashed with digest_part, to the content-addressed store as save() would
+        have. The partial file is kept until delete_part, so a failure to record the upload can be retried.
+        """
+        raise NotImplementedError
+
+    async def delete_part(self, upload_id: str):
+        raise NotImplementedError
+
+    async def exists(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, digest: str):
+        raise NotImplementedError
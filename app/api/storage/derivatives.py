@@ -0,0 +1,149 @@
+# app/storage/derivatives.py
+# Background generation of thumbnail and medium-size derivatives for uploaded images
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import dotenv
+
+from app.api.database.base import AsyncSessionLocal
+from app.api.database.queries.images import get_image_by_id, get_image_ids_pending_derivatives, \
+    get_ready_derivatives_for_content, set_image_derivatives
+from app.api.database.queries.leases import claim_task_run, worker_id
+from app.api.storage import get_storage
+from app.api.util.datetime import get_current_datetime
+from app.api.util.imaging import DERIVATIVE_SIZES, render_derivatives
+
+logger = logging.getLogger(__name__)
+
+# load the .env file
+dotenv.load_dotenv()
+# Resizing is CPU bound and holds the GIL, so it runs in worker processes rather than threads
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+# Seconds after one worker resumed the pending images during which other workers starting up leave them alone
+DERIVATIVE_RESUME_SECONDS = float(os.getenv("DERIVATIVE_RESUME_SECONDS", "300"))
+
+DERIVATIVE_COLUMNS = ("width", "height") + tuple(
+    f"{name}_{field}" for name in DERIVATIVE_SIZES for field in ("hash", "width", "height")
+)
+
+
+async def _single_chunk(content: bytes):
+    yield content
+
+
+class DerivativePipeline:
+    """
+    Generates the derivatives of uploaded images off the request path.
+
+    `schedule` only records a task; the job reads the image in a short session, renders the derivatives on a
+    process pool with no session open, stores them content-addressed next to the originals and updates the
+    image row in a second short session. At most `workers` jobs render at once and the rest wait their turn.
+    Images uploaded again with the same content reuse the derivatives already made for it. Rows are marked
+    pending before they are scheduled, so jobs cut short by a restart are picked up again by `resume_pending`.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._semaphore = None
+        self._tasks = set()
+
+    def _get_executor(self):
+        # Created on first use so workers that never see an upload do not start any processes. Spawned rather
+        # than forked, as forking a process that already runs threads and holds connections is unsafe.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def schedule(self, image_id: int):
+        """
+        Generate an image's derivatives in the background. The image must be committed with status pending.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        task = asyncio.get_running_loop().create_task(self._run(image_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume_pending(self):
+        """
+        Schedule every image still waiting for its derivatives, e.g. after a restart.
+
+        The run is claimed through the "resume_derivatives" row of task_leases, so of the workers starting
+        together only one resumes the images instead of each rendering all of them.
+        """
+        async with AsyncSessionLocal() as db:
+            if not await claim_task_run(db, "resume_derivatives", DERIVATIVE_RESUME_SECONDS, get_current_datetime(),
+                                        worker_id()):
+                return
+            image_ids = await get_image_ids_pending_derivatives(db)
+        for image_id in image_ids:
+            self.schedule(image_id)
+        if image_ids:
+            logger.info("Resumed derivative generation for %d images", len(image_ids))
+
+    async def _run(self, image_id: int):
+        async with self._semaphore:
+            try:
+                await self._process(image_id)
+            except Exception:
+                logger.exception("Generating derivatives for image %s failed", image_id)
+
+    async def _process(self, image_id: int):
+        async with AsyncSessionLocal() as db:
+            image = await get_image_by_id(db, image_id)
+            if image is None or image.derivatives_status != "pending":
+                return
+            existing = await get_ready_derivatives_for_content(db, image.content_hash)
+            if existing is not None:
+                derivatives = {column: getattr(existing, column) for column in DERIVATIVE_COLUMNS}
+                await set_image_derivatives(db, image, dict(derivatives, derivatives_status="ready"))
+                return
+            content_hash = image.content_hash
+
+        # No session is open while rendering, so a burst of uploads cannot hold on to the request pool's
+        # connections for the length of the renders
+        try:
+            rendered = await self._render(content_hash)
+        except Exception as exc:
+            logger.warning("Image %s could not be decoded: %s", image_id, exc)
+            derivatives = {"derivatives_status": "failed"}
+        else:
+            derivatives = {"width": rendered["width"], "height": rendered["height"], "derivatives_status": "ready"}
+            storage = get_storage()
+            for name in DERIVATIVE_SIZES:
+                content, width, height = rendered[name]
+                stored = await storage.save(_single_chunk(content))
+                derivatives.update({f"{name}_hash": stored.digest, f"{name}_width": width, f"{name}_height": height})
+
+        async with AsyncSessionLocal() as db:
+            image = await get_image_by_id(db, image_id)
+            # Deleted, or finished by another worker, while it was being rendered
+            if image is None or image.derivatives_status != "pending":
+                return
+            await set_image_derivatives(db, image, derivatives)
+
+    async def _render(self, content_hash: str):
+        storage = get_storage()
+        # Worker processes read local files themselves; other backends' content is passed to them
+        source = storage.local_path(content_hash)
+        if source is None:
+            source = b"".join([chunk async for chunk in storage.open(content_hash)])
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), render_derivatives, source)
+
+    def shutdown(self):
+        """
+        Cancel outstanding jobs and stop the worker processes; their images stay pending for the next start.
+        """
+        for task in self._tasks:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+derivative_pipeline = DerivativePipeline(IMAGE_WORKERS)
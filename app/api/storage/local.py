@@ -0,0 +1,135 @@
+# app/storage/local.py
+# Storage backend keeping files in a directory tree on local disk
+import fcntl
+import hashlib
+import os
+import uuid
+
+import anyio
+
+from app.api.storage.base import Storage, StoredObject, UploadBusy, UploadOffsetMismatch, UploadTooLarge
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class LocalFileStorage(Storage):
+    """
+    Files live under `root` at ab/cd/<sha256>, fanned out by the first two bytes of the digest.
+
+    An upload is streamed into a temporary file in `root`/tmp while it is hashed, then renamed into place,
+    which is atomic on the same filesystem. If a file with the same digest already exists the upload is
+    dropped instead, so each distinct content is stored once.
+
+    Resumable uploads grow a partial file in `root`/parts, one append per chunk, under an exclusive lock so
+    concurrent requests for the same upload cannot interleave. A completed part is hard-linked into place,
+    which needs `root`/parts on the same filesystem as the store.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.tmp = os.path.join(self.root, "tmp")
+        self.parts = os.path.join(self.root, "parts")
+        os.makedirs(self.tmp, exist_ok=True)
+        os.makedirs(self.parts, exist_ok=True)
+
+    def _path(self, digest: str):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def _part_path(self, upload_id: str):
+        return os.path.join(self.parts, upload_id)
+
+    async def _place(self, tmp_path: str, digest: str, size: int):
+        path = self._path(digest)
+        if await anyio.Path(path).exists():
+            await anyio.Path(tmp_path).unlink()
+            return StoredObject(digest, size, False)
+        await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        await anyio.to_thread.run_sync(os.replace, tmp_path, path)
+        return StoredObject(digest, size, True)
+
+    async def save(self, chunks, max_size: int = None):
+        sha256 = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp, uuid.uuid4().hex)
+        try:
+            async with await anyio.open_file(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise UploadTooLarge(f"Upload exceeds {max_size} bytes")
+                    sha256.update(chunk)
+                    await f.write(chunk)
+            return await self._place(tmp_path, sha256.hexdigest(), size)
+        except BaseException:
+            await anyio.Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    async def append_part(self, upload_id: str, offset: int, chunks, max_size: int = None):
+        async with await anyio.open_file(self._part_path(upload_id), "ab") as f:
+            fd = f.wrapped.fileno()
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadBusy(f"Upload {upload_id} is being written by another request")
+            size = os.fstat(fd).st_size
+            if size != offset:
+                raise UploadOffsetMismatch(size)
+            received = 0
+            try:
+                async for chunk in chunks:
+                    received += len(chunk)
+                    if max_size is not None and received > max_size:
+                        raise UploadTooLarge(f"Chunk exceeds {max_size} bytes")
+                    await f.write(chunk)
+            except UploadTooLarge:
+                await f.flush()
+                await anyio.to_thread.run_sync(os.ftruncate, fd, offset)
+                raise
+            return offset + received
+
+    async def part_size(self, upload_id: str):
+        try:
+            return (await anyio.Path(self._part_path(upload_id)).stat()).st_size
+        except FileNotFoundError:
+            return 0
+
+    async def digest_part(self, upload_id: str):
+        part_path = self._part_path(upload_id)
+
+        def digest_file():
+            sha256 = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                while chunk := f.read(READ_CHUNK_SIZE):
+                    sha256.update(chunk)
+            return sha256.hexdigest(), os.path.getsize(part_path)
+
+        return await anyio.to_thread.run_sync(digest_file)
+
+    async def commit_part(self, upload_id: str, digest: str, size: int):
+        path = self._path(digest)
+        if await anyio.Path(path).exists():
+            return StoredObject(digest, size, False)
+        await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # A hard link rather than a rename, so the part survives until the upload is recorded
+            await anyio.to_thread.run_sync(os.link, self._part_path(upload_id), path)
+        except FileExistsError:
+            return StoredObject(digest, size, False)
+        return StoredObject(digest, size, True)
+
+    async def delete_part(self, upload_id: str):
+        await anyio.Path(self._part_path(upload_id)).unlink(missing_ok=True)
+
+    def local_path(self, digest: str):
+        return self._path(digest)
+
+    async def open(self, digest: str):
+        async with await anyio.open_file(self._path(digest), "rb") as f:
+            while chunk := await f.read(READ_CHUNK_SIZE):
+                yield chunk
+
+    async def exists(self, digest: str):
+        return await anyio.Path(self._path(digest)).exists()
+
+    async def delete(self, digest: str):
+        await anyio.Path(self._path(digest)).unlink(missing_ok=True)
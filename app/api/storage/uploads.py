@@ -0,0 +1,23 @@
+# app/storage/uploads.py
+# Housekeeping for resumable uploads that were abandoned before completion
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.database.queries.uploads import delete_expired_upload_sessions
+from app.api.storage import get_storage
+from app.api.util.datetime import get_current_datetime
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_uploads(db: AsyncSession):
+    """
+    Delete expired upload sessions and the partial files they left behind.
+    """
+    upload_ids = await delete_expired_upload_sessions(db, get_current_datetime())
+    storage = get_storage()
+    for upload_id in upload_ids:
+        await storage.delete_part(upload_id)
+    if upload_ids:
+        logger.info("Purged %d expired upload sessions", len(upload_ids))
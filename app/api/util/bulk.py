@@ -0,0 +1,67 @@
+# app/util/bulk.py
+# Per-item validation and result bookkeeping for the bulk create endpoints
+import os
+
+import dotenv
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api.schemas.bulk import BulkItemResult, BulkResult
+
+# load the .env file
+dotenv.load_dotenv()
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "500"))
+
+
+class BulkBatch:
+    """
+    A submitted array of items, validated one item at a time so a bad item is reported instead of failing
+    the whole request.
+
+    Args:
+        - schema (Type[BaseModel]): Schema every item must satisfy.
+        - items (list): Raw items from the request body.
+    """
+
+    def __init__(self, schema, items: list):
+        if len(items) > MAX_BULK_ITEMS:
+            raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+        self.results = [None] * len(items)
+        self._valid = {}
+        for index, item in enumerate(items):
+            try:
+                self._valid[index] = schema.model_validate(item)
+            except ValidationError as e:
+                self.reject(index, *(f"{'.'.join(map(str, error['loc'])) or 'item'}: {error['msg']}"
+                                     for error in e.errors()))
+
+    @property
+    def valid(self):
+        """
+        (index, validated item) pairs still eligible for insertion, in submission order.
+        """
+        return list(self._valid.items())
+
+    @property
+    def failed(self):
+        return sum(result is not None and result.status == "invalid" for result in self.results)
+
+    def reject(self, index: int, *errors: str):
+        self._valid.pop(index, None)
+        self.results[index] = BulkItemResult(index=index, status="invalid", errors=list(errors))
+
+    def created(self, ids):
+        """
+        Record the ids of the inserted rows, aligned with `valid`.
+        """
+        for (index, _), record_id in zip(self.valid, ids):
+            self.results[index] = BulkItemResult(index=index, status="created", id=record_id)
+
+    def report(self):
+        """
+        Build the response; valid items that were not inserted (an all-or-nothing batch with failures) are
+        reported as skipped.
+        """
+        results = [result or BulkItemResult(index=index, status="skipped") for index, result in enumerate(self.results)]
+        return BulkResult(created=sum(result.status == "created" for result in results), failed=self.failed,
+                          results=results)
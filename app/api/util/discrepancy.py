@@ -0,0 +1,126 @@
+# app/util/discrepancy.py
+# Vectorized discrepancy checks over columnar project, agreement and payment data
+import numpy as np
+
+# Integer stand-in for a missing end date, i.e. an open-ended agreement
+OPEN_END = np.iinfo(np.int64).max
+
+
+def _group_index(project_ids, keys):
+    """
+    Map foreign keys to positions in `project_ids`; keys without a matching project are marked invalid.
+    """
+    if len(project_ids) == 0:
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    order = np.argsort(project_ids, kind="stable")
+    sorted_ids = project_ids[order]
+    position = np.minimum(np.searchsorted(sorted_ids, keys), len(sorted_ids) - 1)
+    return order[position], sorted_ids[position] == keys
+
+
+def _as_seconds(dates, missing):
+    seconds = dates.astype("datetime64[s]").astype(np.int64)
+    return np.where(np.isnat(dates), missing, seconds)
+
+
+def payments_outside_agreements(agreement_group, agreement_start, agreement_end, payment_group, payment_date):
+    """
+    Flag payments that no agreement of the same project covers.
+
+    Agreements are sorted by (project, start). A running maximum of the end date within each project gives,
+    for every agreement, the latest end among the agreements starting on or before it; a payment is covered
+    if the last agreement starting on or before its date reaches past it. Overlapping windows are handled,
+    and everything runs as a handful of sorts and binary searches.
+
+    Args:
+        - agreement_group (ndarray[int]): Project position of each agreement.
+        - agreement_start (ndarray[datetime64]): Agreement start dates, NaT for open starts.
+        - agreement_end (ndarray[datetime64]): Agreement end dates, NaT for open ends.
+        - payment_group (ndarray[int]): Project position of each payment.
+        - payment_date (ndarray[datetime64]): Payment dates; undated payments are never flagged.
+
+    Returns:
+        - ndarray[bool]: True for each payment outside every agreement window of its project.
+    """
+    dated = ~np.isnat(payment_date)
+    if len(agreement_group) == 0:
+        return dated
+
+    start = _as_seconds(agreement_start, np.iinfo(np.int64).min)
+    end = _as_seconds(agreement_end, OPEN_END)
+    date = _as_seconds(payment_date, np.iinfo(np.int64).min)
+
+    # Dense ranks keep the composite (project, value) keys inside int64
+    _, rank = np.unique(np.concatenate([start, date]), return_inverse=True)
+    width = rank.max() + 1
+    start_key = agreement_group * width + rank[:len(start)]
+    payment_key = payment_group * width + rank[len(start):]
+
+    order = np.argsort(start_key, kind="stable")
+    start_key = start_key[order]
+    sorted_group = agreement_group[order]
+    end_values, end_rank = np.unique(end[order], return_inverse=True)
+    end_width = len(end_values)
+    running = np.maximum.accumulate(sorted_group * end_width + end_rank) - sorted_group * end_width
+    latest_end = end_values[running]
+
+    position = np.searchsorted(start_key, payment_key, side="right") - 1
+    clipped = np.maximum(position, 0)
+    covered = (position >= 0) & (sorted_group[clipped] == payment_group) & (latest_end[clipped] >= date)
+    return dated & ~covered
+
+
+def detect_discrepancies(projects, agreements, payments):
+    """
+    Compute per-project financial totals and discrepancy flags.
+
+    Args:
+        - projects (dict): "id" and "budget" arrays.
+        - agreements (dict): "project_id", "start_date", "end_date" and "amount" arrays.
+        - payments (dict): "project_id", "payment_date" and "amount" arrays.
+
+    Returns:
+        - dict: Arrays aligned with projects["id"]: totals, counts, overspend amount and the
+          overspent / agreements_over_budget / payments_outside_agreements / flagged indicators.
+    """
+    project_ids = projects["id"]
+    budget = projects["budget"]
+    count = len(project_ids)
+
+    agreement_group, agreement_valid = _group_index(project_ids, agreements["project_id"])
+    agreement_group = agreement_group[agreement_valid]
+    total_agreed = np.bincount(agreement_group, weights=np.nan_to_num(agreements["amount"][agreement_valid]),
+                               minlength=count)
+    agreement_count = np.bincount(agreement_group, minlength=count)
+
+    payment_group, payment_valid = _group_index(project_ids, payments["project_id"])
+    payment_group = payment_group[payment_valid]
+    total_paid = np.bincount(payment_group, weights=np.nan_to_num(payments["amount"][payment_valid]),
+                             minlength=count)
+    payment_count = np.bincount(payment_group, minlength=count)
+
+    outside = payments_outside_agreements(
+        agreement_group,
+        agreements["start_date"][agreement_valid],
+        agreements["end_date"][agreement_valid],
+        payment_group,
+        payments["payment_date"][payment_valid],
+    )
+    outside_count = np.bincount(payment_group[outside], minlength=count)
+
+    has_budget = ~np.isnan(budget)
+    overspent = has_budget & (total_paid > budget)
+    agreements_over_budget = has_budget & (total_agreed > budget)
+    return {
+        "project_id": project_ids,
+        "budget": budget,
+        "total_agreed": total_agreed,
+        "total_paid": total_paid,
+        "agreement_count": agreement_count,
+        "payment_count": payment_count,
+        "overspend_amount": np.where(overspent, total_paid - np.nan_to_num(budget), 0.0),
+        "overspent": overspent,
+        "agreements_over_budget": agreements_over_budget,
+        "payments_outside_agreements": outside_count,
+        "flagged": overspent | agreements_over_budget | (outside_count > 0),
+    }
@@ -0,0 +1,213 @@
+# app/util/events.py
+# Live project activity (new comments, replies and images) pushed to Server-Sent Events subscribers
+import asyncio
+import logging
+import os
+
+import dotenv
+
+from app.api.schemas.community import Comment, Image, Reply
+
+logger = logging.getLogger(__name__)
+
+# load the .env file
+dotenv.load_dotenv()
+# memory:// (delivered within this worker only, the default) or redis://host:port/db (shared by all workers)
+EVENTS_URL = os.getenv("EVENTS_URL", "memory://")
+# Events buffered per subscriber; a client that falls further behind is disconnected and has to reconnect
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+# Idle seconds before a keep-alive comment is sent, so proxies and load balancers do not drop the stream
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+# Milliseconds a disconnected EventSource waits before reconnecting
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+
+# Redis channel of a project's events is CHANNEL_PREFIX + project id
+CHANNEL_PREFIX = "events:project:"
+
+
+def format_event(kind: str, event_id, data: str):
+    """
+    Frame one event in the text/event-stream format.
+    """
+    return f"id: {kind}:{event_id}\nevent: {kind}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """
+    Events of one project waiting to be written to one client.
+    """
+
+    def __init__(self, project_id: int, maxsize: int):
+        self.project_id = project_id
+        self.closed = False
+        self._queue = asyncio.Queue(maxsize)
+
+    def put(self, frame: str):
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Dropping events silently would leave the client with gaps it cannot see; end the stream instead
+            self.close()
+
+    def close(self):
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def next(self, timeout: float):
+        """
+        Wait for the next event.
+
+        Returns:
+            - str: Framed event, "" if nothing arrived within `timeout`, or None once the subscription is closed.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None if self.closed else ""
+
+
+class MemoryEventBackend:
+    """
+    Hands published events straight back to this worker's subscribers.
+    """
+
+    async def publish(self, project_id: int, frame: str, deliver):
+        deliver(project_id, frame)
+
+    async def listen(self, deliver):
+        pass
+
+
+class RedisEventBackend:
+    """
+    Relays events between workers through Redis pub/sub; a local `redis-server` stands in for the managed
+    instance.
+
+    Every worker subscribes once to the channels of all projects and fans each message out to its own
+    subscribers, so a worker holds one Redis connection however many clients are listening. Redis errors are
+    logged and the subscription is retried; publishing never fails the write that triggered it.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("EVENTS_URL points at Redis but the 'redis' package is not installed")
+        self._errors = (redis.RedisError, OSError)
+        self._client = redis.Redis.from_url(url)
+
+    async def publish(self, project_id: int, frame: str, deliver):
+        try:
+            await self._client.publish(f"{CHANNEL_PREFIX}{project_id}", frame)
+        except self._errors as e:
+            logger.warning("Could not publish event for project %s: %s", project_id, e)
+
+    async def listen(self, deliver):
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        project_id = int(message["channel"].decode().removeprefix(CHANNEL_PREFIX))
+                        deliver(project_id, message["data"].decode())
+            except self._errors as e:
+                logger.warning("Event subscription lost, retrying: %s", e)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+class EventHub:
+    """
+    In-process pub/sub of project events.
+
+    Writers publish after their transaction has committed. The event is serialized and framed once by the
+    writer, and the backend carries the frame to every worker, which queues it to each of its subscribers to
+    the project.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscriptions = {}
+        self._listener = None
+
+    def start(self):
+        """
+        Start receiving events published by other workers.
+        """
+        if self._listener is None:
+            self._listener = asyncio.get_running_loop().create_task(self.backend.listen(self.deliver))
+
+    async def stop(self):
+        """
+        Stop receiving events and end every open stream.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions.clear()
+
+    def subscribe(self, project_id: int):
+        subscription = Subscription(project_id, EVENTS_QUEUE_SIZE)
+        self._subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.project_id]
+
+    def deliver(self, project_id: int, frame: str):
+        for subscription in list(self._subscriptions.get(project_id, ())):
+            subscription.put(frame)
+
+    async def publish(self, project_id: int, kind: str, event_id, data: str):
+        """
+        Publish an event to the subscribers of a project. Call after the write has been committed.
+
+        Args:
+            - project_id (int): Project the event belongs to.
+            - kind (str): Event type, e.g. "comment", "reply" or "image".
+            - event_id: Identifier of the created entity.
+            - data (str): JSON payload.
+        """
+        if project_id is not None:
+            await self.backend.publish(project_id, format_event(kind, event_id, data), self.deliver)
+
+
+def get_event_backend(url: str):
+    if url.startswith("memory://"):
+        return MemoryEventBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisEventBackend(url)
+    raise ValueError(f"Unsupported EVENTS_URL '{url}'")
+
+
+project_events = EventHub(get_event_backend(EVENTS_URL))
+
+
+async def publish_comment(comment):
+    await project_events.publish(comment.project_id, "comment", comment.id,
+                                 Comment.model_validate(comment).model_dump_json())
+
+
+async def publish_reply(reply, project_id: int):
+    await project_events.publish(project_id, "reply", reply.id, Reply.model_validate(reply).model_dump_json())
+
+
+async def publish_image(image):
+    await project_events.publish(image.project_id, "image", image.id, Image.model_validate(image).model_dump_json())
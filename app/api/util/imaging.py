@@ -0,0 +1,42 @@
+# app/util/imaging.py
+# Image resizing run in the derivative worker processes; kept free of app state so it pickles cheaply
+import io
+
+# Derivative name to the longest edge it is scaled down to
+DERIVATIVE_SIZES = {
+    "thumbnail": 256,
+    "medium": 1024,
+}
+DERIVATIVE_CONTENT_TYPE = "image/jpeg"
+DERIVATIVE_QUALITY = 82
+
+
+def render_derivatives(source, sizes: dict = None):
+    """
+    Decode an image and render a JPEG of it for each size, never enlarging it.
+
+    Args:
+        - source (str | bytes): Path of the original on local disk, or its content.
+        - sizes (dict): Derivative name to longest edge; DERIVATIVE_SIZES by default.
+
+    Returns:
+        - dict: "width" and "height" of the original, and per derivative name a (content, width, height)
+          tuple.
+    """
+    # Imported here so only the worker processes pay for loading Pillow
+    from PIL import Image, ImageOps
+
+    sizes = sizes or DERIVATIVE_SIZES
+    with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as original:
+        # Camera photos are often stored sideways with an EXIF orientation tag
+        image = ImageOps.exif_transpose(original)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        rendered = {"width": image.width, "height": image.height}
+        for name, edge in sizes.items():
+            derivative = image.copy()
+            derivative.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            derivative.save(buffer, "JPEG", quality=DERIVATIVE_QUALITY, optimize=True, progressive=True)
+            rendered[name] = (buffer.getvalue(), derivative.width, derivative.height)
+    return rendered
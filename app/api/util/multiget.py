@@ -0,0 +1,49 @@
+# app/util/multiget.py
+# `?ids=1,2,3` parsing and ordering for the multi-get endpoints
+import os
+
+import dotenv
+from fastapi import HTTPException, Query
+
+# load the .env file
+dotenv.load_dotenv()
+MAX_IDS_PER_REQUEST = int(os.getenv("MAX_IDS_PER_REQUEST", "100"))
+
+IDS_DESCRIPTION = f"Comma separated ids, at most {MAX_IDS_PER_REQUEST}; results keep this order"
+
+
+def parse_id_list(value: str):
+    """
+    Parse a comma separated id list, dropping repeated ids but keeping first-seen order.
+
+    Args:
+        - value (str): Raw query parameter, e.g. "3,1,3".
+
+    Returns:
+        - List[int]: Unique ids, e.g. [3, 1].
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of integers")
+    if not ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(ids) > MAX_IDS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_IDS_PER_REQUEST} ids per request")
+    return ids
+
+
+def required_ids(ids: str = Query(..., description=IDS_DESCRIPTION)):
+    return parse_id_list(ids)
+
+
+def optional_ids(ids: str = Query(None, description=IDS_DESCRIPTION)):
+    return parse_id_list(ids) if ids is not None else None
+
+
+def in_request_order(rows, ids):
+    """
+    Arrange rows fetched with an IN query in the order their ids were requested; ids with no row are skipped.
+    """
+    by_id = {row.id: row for row in rows}
+    return [by_id[row_id] for row_id in ids if row_id in by_id]
@@ -0,0 +1,118 @@
+# app/util/pagination.py
+# Keyset (cursor) pagination helpers shared by the list queries
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        - values (tuple): Values of the key columns, in key order.
+
+    Returns:
+        - str: URL-safe cursor token.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns):
+    """
+    Decode a cursor produced by encode_cursor back into typed key values.
+
+    Args:
+        - cursor (str): Cursor token from a previous page.
+        - key_columns (list): Columns the cursor was built from.
+
+    Returns:
+        - list: Key values, converted to the column types.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime and value is not None else value
+            for column, value in zip(key_columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_offset_cursor(offset: int):
+    """
+    Cursor for result sets that are paged by position, such as ranked search results.
+    """
+    return encode_cursor([offset])
+
+
+def decode_offset_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_offset_cursor; the first page when cursor is None.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset, = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        return offset
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(key_columns, values, descending: bool):
+    """
+    Build the "rows after this key" condition for a composite sort key.
+
+    The condition is expanded into (a < x) OR (a = x AND b < y) rather than a row-value comparison so MySQL
+    can turn it into an index range scan.
+    """
+    clauses = []
+    for position, column in enumerate(key_columns):
+        equal_prefix = [key_columns[i] == values[i] for i in range(position)]
+        beyond = column < values[position] if descending else column > values[position]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+async def paginate(db, stmt, key_columns, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                   descending: bool = True):
+    """
+    Run a select() one keyset page at a time.
+
+    Args:
+        - db (AsyncSession): Database session.
+        - stmt (Select): Statement selecting a single ORM entity, without ORDER BY or LIMIT.
+        - key_columns (list): Unique sort key, most significant column first (the primary key last).
+        - cursor (str): Cursor from the previous page, or None for the first page.
+        - limit (int): Page size, capped at MAX_PAGE_SIZE.
+        - descending (bool): Sort direction.
+
+    Returns:
+        - tuple: (list of rows, next cursor or None when this is the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        stmt = stmt.filter(keyset_filter(key_columns, decode_cursor(cursor, key_columns), descending))
+    order = [column.desc() if descending else column.asc() for column in key_columns]
+    result = await db.execute(stmt.order_by(*order).limit(limit + 1))
+    items = result.scalars().all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in key_columns])
+    return items, next_cursor
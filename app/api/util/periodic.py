@@ -0,0 +1,49 @@
+# app/util/periodic.py
+# Maintenance jobs run in the background at a fixed interval, by one worker of the deployment per run
+import asyncio
+import logging
+import random
+
+from app.api.database.base import AsyncSessionLocal
+from app.api.database.queries.leases import claim_task_run, worker_id
+from app.api.util.datetime import get_current_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs `job(db)` with a fresh session every `interval` seconds until stopped.
+
+    Every worker starts the task, but each run is claimed through the job's row in task_leases first, so the
+    job runs once per interval across the deployment rather than once per worker. The first check waits a
+    random part of the interval so the workers, which all start together, do not race for the first run.
+    Failures are logged and the job is retried when it is next due.
+    """
+
+    def __init__(self, name: str, interval: float, job):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self.worker = worker_id()
+        self._task = None
+
+    def start(self):
+        if self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    if await claim_task_run(db, self.name, self.interval, get_current_datetime(), self.worker):
+                        await self.job(db)
+            except Exception:
+                logger.exception("Periodic task %s failed", self.name)
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
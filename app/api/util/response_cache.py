@@ -0,0 +1,234 @@
+# app/util/response_cache.py
+# Cache of serialized JSON responses for read-heavy endpoints, invalidated by the write queries
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import dotenv
+from fastapi import Request, Response
+
+# load the .env file
+dotenv.load_dotenv()
+# memory:// (in-process LRU, the default), redis://host:port/db (shared by all workers) or none
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "memory://")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+# Generation counters kept by the in-process backend; larger than the cache so an entry rarely outlives its counter
+RESPONSE_CACHE_GENERATIONS = int(os.getenv("RESPONSE_CACHE_GENERATIONS", str(4 * RESPONSE_CACHE_SIZE)))
+# Upper bound on staleness for data embedded in a response but written elsewhere, e.g. a user's roles in a
+# project's `include=owner`, and for other workers' writes when the in-process backend is used
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+
+class MemoryCacheBackend:
+    """
+    Per-process LRU of response bodies with a TTL.
+
+    Generation counters are kept in a second, larger LRU. A counter is created in the current epoch and
+    the epoch is bumped whenever one is evicted, so the generation of an entity that has no counter,
+    "<epoch>.0", differs from every value its evicted counter ever had. Entries stored under an evicted
+    counter are never read again.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, max_generations: int = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_generations = max_generations or 4 * maxsize
+        self._entries = OrderedDict()
+        self._generations = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            body, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    async def set(self, key: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (body, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def get_generation(self, key: str):
+        with self._lock:
+            epoch, counter = self._generations.get(key, (self._epoch, 0))
+            if counter:
+                self._generations.move_to_end(key)
+            return f"{epoch}.{counter}"
+
+    async def incr_generation(self, key: str):
+        with self._lock:
+            epoch, counter = self._generations.get(key, (self._epoch, 0))
+            self._generations[key] = (epoch, counter + 1)
+            self._generations.move_to_end(key)
+            while len(self._generations) > self.max_generations:
+                self._generations.popitem(last=False)
+                self._epoch += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by every worker through Redis; a local `redis-server` stands in for the managed instance.
+
+    Redis errors are treated as cache misses so an unavailable cache never fails a request.
+    """
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL points at Redis but the 'redis' package is not installed")
+        self.ttl = ttl
+        self._errors = (redis.RedisError, OSError)
+        self._client = redis.Redis.from_url(url)
+
+    async def get(self, key: str):
+        try:
+            return await self._client.get(key)
+        except self._errors:
+            return None
+
+    async def set(self, key: str, body: bytes):
+        try:
+            await self._client.set(key, body, ex=self.ttl)
+        except self._errors:
+            pass
+
+    async def get_generation(self, key: str):
+        try:
+            return int(await self._client.get(key) or 0)
+        except self._errors:
+            return None
+
+    async def incr_generation(self, key: str):
+        try:
+            await self._client.incr(key)
+        except self._errors:
+            pass
+
+
+class ResponseCache:
+    """
+    Serialized responses keyed by entity, entity id, the entity's generation and a request variant
+    (include list, cursor, page size, ...).
+
+    Invalidating an entity bumps its generation, which retires every cached variant at once; the old entries
+    are never read again and age out of the backend. Because a reader fetches the generation before it loads
+    from the database, a write that commits in between can only leave a fresh body under an old generation,
+    never a stale body under the current one.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def lookup(self, entity: str, entity_id, variant: str = ""):
+        """
+        Look up a cached response.
+
+        Args:
+            - entity (str): Cached resource, e.g. "project" or "project_comments".
+            - entity_id: Identifier of the entity the resource belongs to.
+            - variant (str): Distinguishes responses for the same entity.
+
+        Returns:
+            - tuple: (key to store a freshly built body under, or None if caching is unavailable; cached body
+              or None).
+        """
+        if self.backend is None:
+            return None, None
+        generation = await self.backend.get_generation(f"gen:{entity}:{entity_id}")
+        if generation is None:
+            return None, None
+        key = f"resp:{entity}:{entity_id}:{generation}:{variant}"
+        return key, await self.backend.get(key)
+
+    async def store(self, key: str, body: bytes):
+        if key is not None:
+            await self.backend.set(key, body)
+
+    async def invalidate(self, entity: str, entity_id):
+        """
+        Retire every cached response of an entity. Call after the write has been committed.
+        """
+        if self.backend is not None and entity_id is not None:
+            await self.backend.incr_generation(f"gen:{entity}:{entity_id}")
+
+
+def get_cache_backend(url: str):
+    if url == "none":
+        return None
+    if url.startswith("memory://"):
+        return MemoryCacheBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_GENERATIONS)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend(url, RESPONSE_CACHE_TTL)
+    raise ValueError(f"Unsupported RESPONSE_CACHE_URL '{url}'")
+
+
+response_cache = ResponseCache(get_cache_backend(RESPONSE_CACHE_URL))
+
+
+def compute_etag(body: bytes):
+    """
+    Strong ETag of a response body.
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str):
+    """
+    Whether an If-None-Match header value matches the current ETag (weak comparison, as RFC 9110 requires for
+    If-None-Match).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+async def cached_json_response(request: Request, entity: str, entity_id, variant: str, load, **dump_options):
+    """
+    Serve a response from the cache, or build, serialize and cache it, honouring If-None-Match.
+
+    The body is cached together with its ETag, so a client revalidating an unchanged resource gets its
+    304 Not Modified from the generation lookup and one cache read, without the database or Pydantic.
+
+    Args:
+        - request (Request): Incoming request, read for If-None-Match.
+        - entity (str): Cached resource, see ResponseCache.lookup.
+        - entity_id: Identifier of the entity the resource belongs to.
+        - variant (str): Distinguishes responses for the same entity.
+        - load (Callable): Coroutine function returning the Pydantic model to serialize; it raises
+          HTTPException for missing entities, which are not cached.
+        - dump_options: Passed to model_dump_json, e.g. exclude_none=True.
+
+    Returns:
+        - Response: JSON response with an ETag header, or an empty 304 when the client's copy is current.
+    """
+    key, cached = await response_cache.lookup(entity, entity_id, variant)
+    if cached is not None:
+        etag, body = cached.split(b"\n", 1)
+        etag = etag.decode()
+    else:
+        body = (await load()).model_dump_json(**dump_options).encode()
+        etag = compute_etag(body)
+        await response_cache.store(key, etag.encode() + b"\n" + body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
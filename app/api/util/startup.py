@@ -0,0 +1,54 @@
+# app/util/startup.py
+# Per-worker record of how long each boot phase took, reported at /internal/startup
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Wall-clock timings of the phases a worker goes through before it serves its first request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.ready_ms = None
+
+    def record(self, name: str, started: float):
+        """
+        Record a phase that began at `started` (a time.perf_counter() value) and ends now.
+
+        Phases that began before this module was imported, such as importing the routers, move the start of
+        the report back accordingly.
+        """
+        self.started = min(self.started, started)
+        self.phases[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time the enclosed block and record it under `name`.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def ready(self):
+        """
+        Mark the worker as ready and log the report.
+        """
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 2)
+        logger.info("Worker %s ready in %.1f ms (%s)", os.getpid(), self.ready_ms,
+                    ", ".join(f"{name}={elapsed:.1f}ms" for name, elapsed in self.phases.items()))
+
+    def as_dict(self):
+        return {"pid": os.getpid(), "ready_ms": self.ready_ms, "phases": dict(self.phases)}
+
+
+startup_report = StartupReport()
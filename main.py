@@ -1,14 +1,69 @@
+import time
+from contextlib import asynccontextmanager
+
+import_started = time.perf_counter()
+
 from fastapi import FastAPI
-from app.api import router as api_router
 import os
 import dotenv
 
 dotenv.load_dotenv()
-app = FastAPI(
-    title="Project and contracts management API",
-    description="This is an API that provides resource for the management of apps dealing with government projects "
-                "management",
-    version="1.0.0",
-)
-
-app.include_router(api_router)
+
+from app.api import router as api_router
+from app.api.database.base import engine, async_engine, create_schema
+from app.api.database.queries.ministry import rebuild_ministry_summaries
+from app.api.search_index import start_search_index_build, stop_search_index_build
+from app.api.security.hashing import hashing_pool
+from app.api.storage.derivatives import derivative_pipeline
+from app.api.storage.uploads import purge_expired_uploads
+from app.api.util.events import project_events
+from app.api.util.periodic import PeriodicTask
+from app.api.util.startup import startup_report
+
+startup_report.record("import_routers", import_started)
+
+# Tables are created by the Alembic migrations, run once per release (see Procfile). Set DB_CREATE_SCHEMA=true
+# to have each worker create missing tables at startup instead, e.g. on a throwaway development database.
+DB_CREATE_SCHEMA = os.getenv("DB_CREATE_SCHEMA", "false").lower() in ("1", "true", "yes")
+# Full recomputation of the ministry dashboard totals, which writes keep up to date in between; 0 disables it
+MINISTRY_SUMMARY_REFRESH_SECONDS = float(os.getenv("MINISTRY_SUMMARY_REFRESH_SECONDS", "3600"))
+# How often expired resumable uploads and their partial files are purged; 0 disables it
+UPLOAD_PURGE_SECONDS = float(os.getenv("UPLOAD_PURGE_SECONDS", "3600"))
+
+ministry_summary_refresh = PeriodicTask("ministry_summaries", MINISTRY_SUMMARY_REFRESH_SECONDS,
+                                        rebuild_ministry_summaries)
+upload_purge = PeriodicTask("purge_expired_uploads", UPLOAD_PURGE_SECONDS, purge_expired_uploads)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_SCHEMA:
+        with startup_report.phase("create_schema"):
+            await create_schema()
+    start_search_index_build()
+    await derivative_pipeline.resume_pending()
+    ministry_summary_refresh.start()
+    upload_purge.start()
+    project_events.start()
+    startup_report.ready()
+    yield
+    await stop_search_index_build()
+    await project_events.stop()
+    ministry_summary_refresh.stop()
+    upload_purge.stop()
+    derivative_pipeline.shutdown()
+    hashing_pool.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
+
+
+with startup_report.phase("build_app"):
+    app = FastAPI(
+        title="Project and contracts management API",
+        description="This is an API that provides resource for the management of apps dealing with government "
+                    "projects management",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    app.include_router(api_router)
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# Importing app.api loads every router and with them the database engines, which need a DATABASE_URL
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+os.environ.setdefault("SECRETE_KEY", "test")
+os.environ.setdefault("RESPONSE_CACHE_URL", "memory://")
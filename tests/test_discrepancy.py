@@ -0,0 +1,127 @@
+# tests/test_discrepancy.py
+import numpy as np
+
+from app.api.util.discrepancy import detect_discrepancies, payments_outside_agreements
+
+NAT = np.datetime64("NaT")
+
+
+def dates(*values):
+    return np.array([NAT if value is None else np.datetime64(value) for value in values], dtype="datetime64[s]")
+
+
+def projects(ids, budgets):
+    return {"id": np.array(ids, dtype=np.int64), "budget": np.array(budgets, dtype=np.float64)}
+
+
+def agreements(rows):
+    project_id, start, end, amount = zip(*rows) if rows else ((), (), (), ())
+    return {"project_id": np.array(project_id, dtype=np.int64), "start_date": dates(*start),
+            "end_date": dates(*end), "amount": np.array(amount, dtype=np.float64)}
+
+
+def payments(rows):
+    project_id, date, amount = zip(*rows) if rows else ((), (), ())
+    return {"project_id": np.array(project_id, dtype=np.int64), "payment_date": dates(*date),
+            "amount": np.array(amount, dtype=np.float64)}
+
+
+def test_totals_flags_and_counts_per_project():
+    result = detect_discrepancies(
+        # Unsorted ids, and a project without a budget
+        projects([30, 10, 20], [100.0, 50.0, np.nan]),
+        agreements([
+            (10, "2024-01-01", "2024-01-31", 40.0),
+            (10, "2024-03-01", None, 20.0),
+            (30, None, "2024-06-30", 80.0),
+            (99, "2024-01-01", "2024-12-31", 1000.0),  # unknown project, ignored
+        ]),
+        payments([
+            (10, "2024-01-15", 30.0),  # inside the January agreement
+            (10, "2024-02-15", 30.0),  # between the two windows
+            (10, "2025-05-01", 5.0),  # inside the open-ended window
+            (30, "2024-07-01", 10.0),  # after the only window ends
+            (30, None, 10.0),  # undated, never outside
+            (20, "2024-01-01", 500.0),  # no agreements and no budget
+            (99, "2024-01-01", 1000.0),
+        ]),
+    )
+    by_project = {project_id: index for index, project_id in enumerate(result["project_id"].tolist())}
+    assert set(by_project) == {10, 20, 30}
+
+    def row(project_id):
+        return {name: values[by_project[project_id]].item() for name, values in result.items()
+                if name not in ("project_id", "budget")}
+
+    assert row(10) == dict(total_agreed=60.0, total_paid=65.0, agreement_count=2, payment_count=3,
+                           overspend_amount=15.0, overspent=True, agreements_over_budget=True,
+                           payments_outside_agreements=1, flagged=True)
+    assert row(20) == dict(total_agreed=0.0, total_paid=500.0, agreement_count=0, payment_count=1,
+                           overspend_amount=0.0, overspent=False, agreements_over_budget=False,
+                           payments_outside_agreements=1, flagged=True)
+    assert row(30) == dict(total_agreed=80.0, total_paid=20.0, agreement_count=1, payment_count=2,
+                           overspend_amount=0.0, overspent=False, agreements_over_budget=False,
+                           payments_outside_agreements=1, flagged=True)
+
+
+def test_project_within_budget_and_windows_is_not_flagged():
+    result = detect_discrepancies(
+        projects([1], [100.0]),
+        agreements([(1, "2024-01-01", "2024-12-31", 100.0)]),
+        payments([(1, "2024-01-01", 50.0), (1, "2024-12-31", 50.0)]),
+    )
+    assert not result["flagged"][0]
+    assert result["payments_outside_agreements"][0] == 0
+
+
+def test_empty_inputs():
+    result = detect_discrepancies(projects([], []), agreements([]), payments([]))
+    assert all(len(values) == 0 for values in result.values())
+    result = detect_discrepancies(projects([1], [10.0]), agreements([]), payments([(2, "2024-01-01", 5.0)]))
+    assert result["payment_count"].tolist() == [0]
+    assert not result["flagged"][0]
+
+
+def test_overlapping_windows_cover_the_gap_between_them():
+    # The long first window still covers payments after the short second one, which starts later, has ended
+    outside = payments_outside_agreements(
+        np.array([0, 0]), dates("2024-01-01", "2024-02-01"), dates("2024-12-31", "2024-02-10"),
+        np.array([0, 0, 0]), dates("2024-03-01", "2025-01-01", "2023-12-31"),
+    )
+    assert outside.tolist() == [False, True, True]
+
+
+def test_windows_do_not_cover_other_projects():
+    outside = payments_outside_agreements(
+        np.array([0]), dates("2024-01-01"), dates(None),
+        np.array([0, 1]), dates("2024-06-01", "2024-06-01"),
+    )
+    assert outside.tolist() == [False, True]
+
+
+def test_outside_flags_match_a_direct_check_on_random_data():
+    rng = np.random.default_rng(7)
+    day = np.timedelta64(1, "D")
+    base = np.datetime64("2024-01-01", "s")
+    project_count, agreement_count, payment_count = 25, 120, 400
+
+    agreement_group = rng.integers(0, project_count, agreement_count)
+    start = base + rng.integers(0, 300, agreement_count) * day
+    end = start + rng.integers(0, 60, agreement_count) * day
+    start[rng.random(agreement_count) < 0.1] = NAT
+    end[rng.random(agreement_count) < 0.1] = NAT
+    payment_group = rng.integers(0, project_count, payment_count)
+    payment_date = base + rng.integers(-30, 400, payment_count) * day
+    payment_date[rng.random(payment_count) < 0.1] = NAT
+
+    def covered(group, date):
+        return any(
+            agreement_group[index] == group
+            and (np.isnat(start[index]) or start[index] <= date)
+            and (np.isnat(end[index]) or end[index] >= date)
+            for index in range(agreement_count)
+        )
+
+    expected = [not np.isnat(date) and not covered(group, date) for group, date in zip(payment_group, payment_date)]
+    outside = payments_outside_agreements(agreement_group, start, end, payment_group, payment_date)
+    assert outside.tolist() == expected
@@ -0,0 +1,94 @@
+# tests/test_pagination.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.database.base import Base
+from app.api.database.models import Comment
+from app.api.util.pagination import decode_cursor, decode_offset_cursor, encode_cursor, encode_offset_cursor, \
+    paginate, MAX_PAGE_SIZE
+
+KEY = [Comment.timestamp, Comment.id]
+START = datetime(2024, 1, 1)
+
+
+def test_cursor_round_trips_datetimes_and_ids():
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor([timestamp, 42]), KEY) == [timestamp, 42]
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor([datetime(2024, 1, 1), 1])
+    assert not set(cursor) & set("=+/")
+
+
+@pytest.mark.parametrize("cursor", ["zz", "!!!", encode_cursor([1]), encode_cursor([1, 2, 3])])
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, KEY)
+    assert error.value.status_code == 400
+
+
+def test_offset_cursor():
+    assert decode_offset_cursor(None) == 0
+    assert decode_offset_cursor(encode_offset_cursor(40)) == 40
+    for cursor in (encode_cursor([-1]), encode_cursor(["3"]), "zz"):
+        with pytest.raises(HTTPException):
+            decode_offset_cursor(cursor)
+
+
+async def _paginate_all(timestamps, limit: int, descending: bool):
+    """
+    Store one comment per timestamp for project 1, plus one for project 2, and page through project 1.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all, tables=[Comment.__table__])
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            db.add_all([Comment(id=index + 1, project_id=1, text=str(index), timestamp=timestamp)
+                        for index, timestamp in enumerate(timestamps)])
+            db.add(Comment(id=len(timestamps) + 1, project_id=2, text="other", timestamp=START))
+            await db.commit()
+
+            pages = []
+            cursor = None
+            # A cursor that fails to advance would otherwise page forever
+            while len(pages) <= len(timestamps):
+                items, cursor = await paginate(db, select(Comment).filter(Comment.project_id == 1), KEY, cursor,
+                                               limit, descending)
+                pages.append([(item.timestamp, item.id) for item in items])
+                if cursor is None:
+                    return pages
+            raise AssertionError("pagination did not terminate")
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [1, 3, 7, 50])
+def test_pages_cover_every_row_once_in_key_order(descending, limit):
+    # Repeated timestamps make the id the tie-breaker within a page and across page boundaries; ids are not in
+    # timestamp order, so a cursor comparing the columns independently would skip or repeat rows
+    timestamps = [START + timedelta(hours=(index * 7) % 20 // 3) for index in range(20)]
+    pages = asyncio.run(_paginate_all(timestamps, limit, descending))
+
+    rows = [row for page in pages for row in page]
+    expected = sorted(((timestamp, index + 1) for index, timestamp in enumerate(timestamps)), reverse=descending)
+    assert rows == expected
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_page_size_is_capped():
+    timestamps = [START + timedelta(minutes=index) for index in range(MAX_PAGE_SIZE + 5)]
+    pages = asyncio.run(_paginate_all(timestamps, MAX_PAGE_SIZE * 10, True))
+    assert [len(page) for page in pages] == [MAX_PAGE_SIZE, 5]
+
+
+def test_empty_result_has_no_next_cursor():
+    assert asyncio.run(_paginate_all([], 5, True)) == [[]]
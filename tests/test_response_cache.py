@@ -0,0 +1,160 @@
+# tests/test_response_cache.py
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.api.util import response_cache as cache_module
+from app.api.util.response_cache import MemoryCacheBackend, ResponseCache, cached_json_response, compute_etag, \
+    etag_matches
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def make_request(if_none_match: str = None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache(MemoryCacheBackend(maxsize=16, ttl=60))
+    monkeypatch.setattr(cache_module, "response_cache", cache)
+    return cache
+
+
+class Loader:
+    """
+    Stands in for the database load of an endpoint, counting how often it runs.
+    """
+
+    def __init__(self, name: str = "first"):
+        self.name = name
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return Item(id=1, name=self.name)
+
+
+def serve(loader, if_none_match: str = None, variant: str = ""):
+    return asyncio.run(cached_json_response(make_request(if_none_match), "item", 1, variant, loader))
+
+
+def test_second_request_is_served_from_the_cache(cache):
+    loader = Loader()
+    first = serve(loader)
+    second = serve(loader)
+    assert loader.calls == 1
+    assert first.body == second.body == b'{"id":1,"name":"first"}'
+    assert first.headers["etag"] == second.headers["etag"] == compute_etag(first.body)
+
+
+def test_matching_if_none_match_returns_not_modified(cache):
+    loader = Loader()
+    etag = serve(loader).headers["etag"]
+    response = serve(loader, if_none_match=f'"other", W/{etag}')
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.body == b""
+    assert serve(loader, if_none_match='"other"').status_code == 200
+    assert loader.calls == 1
+
+
+def test_invalidation_retires_every_variant(cache):
+    loader = Loader()
+    old_etag = serve(loader).headers["etag"]
+    serve(loader, variant="include=owner")
+    loader.name = "second"
+    asyncio.run(cache.invalidate("item", 1))
+
+    response = serve(loader, if_none_match=old_etag)
+    assert response.status_code == 200
+    assert response.body == b'{"id":1,"name":"second"}'
+    assert response.headers["etag"] != old_etag
+    serve(loader, variant="include=owner")
+    assert loader.calls == 4
+
+
+def test_invalidating_another_entity_keeps_the_entry(cache):
+    loader = Loader()
+    serve(loader)
+    asyncio.run(cache.invalidate("item", 2))
+    asyncio.run(cache.invalidate("other", 1))
+    serve(loader)
+    assert loader.calls == 1
+
+
+def test_disabled_cache_always_loads(monkeypatch):
+    monkeypatch.setattr(cache_module, "response_cache", ResponseCache(None))
+    loader = Loader()
+    etag = serve(loader).headers["etag"]
+    assert serve(loader, if_none_match=etag).status_code == 304
+    assert loader.calls == 2
+
+
+def test_etag_matches():
+    etag = compute_etag(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches(f'"a", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"a"', etag)
+
+
+def test_memory_backend_evicts_least_recently_used_entries():
+    backend = MemoryCacheBackend(maxsize=2, ttl=60)
+
+    async def scenario():
+        await backend.set("a", b"1")
+        await backend.set("b", b"2")
+        await backend.get("a")
+        await backend.set("c", b"3")
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [b"1", None, b"3"]
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend(maxsize=2, ttl=0)
+
+    async def scenario():
+        await backend.set("a", b"1")
+        return await backend.get("a")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_evicted_generation_counter_never_repeats_a_value():
+    backend = MemoryCacheBackend(maxsize=2, ttl=60, max_generations=2)
+
+    async def scenario():
+        seen = {await backend.get_generation("a")}
+        for _ in range(3):
+            await backend.incr_generation("a")
+            seen.add(await backend.get_generation("a"))
+        # Two other counters push "a" out of the LRU
+        await backend.incr_generation("b")
+        await backend.incr_generation("c")
+        return seen, await backend.get_generation("a")
+
+    seen, after_eviction = asyncio.run(scenario())
+    assert len(seen) == 4
+    assert after_eviction not in seen
+
+
+def test_clear_changes_every_generation():
+    backend = MemoryCacheBackend(maxsize=2, ttl=60)
+
+    async def scenario():
+        before = await backend.get_generation("a")
+        backend.clear()
+        return before, await backend.get_generation("a")
+
+    before, after = asyncio.run(scenario())
+    assert before != after